@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fetch -> score -> render pipeline offline
+
+Runs every stage against benchmarks/stub_server.py (recorded payloads +
+synthetic multi-year chart series) inside a scratch directory, so the
+repository's data/ and README.md are never touched and no network is
+used. Reports per-stage latency (median of --repeat runs), throughput
+(chart points parsed/s, snapshots scored/s) and peak RSS, then compares
+against benchmarks/baseline.json. Each sample of a fast stage loops it
+for at least MIN_SAMPLE_SECONDS, so millisecond stages are not at the
+mercy of one scheduler hiccup.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --years 8 --repeat 7 --json out.json
+    python benchmarks/bench_pipeline.py --update-baseline   # median of --baseline-runs runs
+
+Exit status is 1 when a metric regresses past --tolerance (default 25%)
+and, for latencies, by more than --floor-ms. A baseline recorded on a
+different machine, Python or --years is only reported, never enforced.
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+SCRIPTS_DIR = os.path.join(REPO_DIR, "scripts")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, BENCH_DIR)
+import stub_server  # noqa: E402
+
+DAY = 86400
+CHARTS = ("trade-volume", "n-transactions", "market-cap", "hash-rate", "market-price",
+          "miners-revenue", "difficulty", "mempool-size", "estimated-transaction-volume-usd")
+
+# Minimum wall time of one timing sample; faster stages are called in a loop
+MIN_SAMPLE_SECONDS = 0.05
+
+# metric -> True if higher is better
+DIRECTIONS = {
+    "parse_points_per_s": True,
+    "score_snapshots_per_s": True,
+    "backtest_snapshots_per_s": True,
+}
+
+# Throughput metric -> the latency of the stage it is measured on (floor check)
+STAGE_LATENCY = {
+    "parse_points_per_s": "parse_ms",
+    "score_snapshots_per_s": "score_ms",
+    "backtest_snapshots_per_s": "backtest_ms",
+}
+
+
+def peak_rss_mb():
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def timed(fn, repeat, min_seconds=MIN_SAMPLE_SECONDS):
+    """
+    Median seconds per call over `repeat` samples and the last result.
+    A sample repeats fn until it has run for min_seconds (0 = one call,
+    for stages that must not run twice back to back).
+    """
+    samples, result = [], None
+    for _ in range(repeat):
+        calls, start = 0, time.perf_counter()
+        while True:
+            result = fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                break
+        samples.append(elapsed / calls)
+    return statistics.median(samples), result
+
+
+def quiet(fn):
+    """Call fn with the pipeline's progress prints suppressed"""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return wrapper
+
+
+def write_spx_csv(path, years):
+    """Synthetic SPX closes for the CSV source (weekdays only)"""
+    today = int(time.time()) // DAY * DAY
+    with open(path, "w") as f:
+        f.write("date,close\n")
+        for i in range(years * 365, -1, -1):
+            ts = today - i * DAY
+            if time.gmtime(ts).tm_wday < 5:
+                f.write(f"{time.strftime('%Y-%m-%d', time.gmtime(ts))},{4000 + (years * 365 - i) * 0.8:.2f}\n")
+
+
+def run_benchmarks(years, repeat, latency):
+    results = {}
+    server, base_url = stub_server.start(latency=latency)
+    scratch = tempfile.mkdtemp(prefix="btc-bench-")
+    cwd = os.getcwd()
+    try:
+        os.makedirs(os.path.join(scratch, "data"))
+        shutil.copy(os.path.join(REPO_DIR, "README.md"), scratch)
+        write_spx_csv(os.path.join(scratch, "spx.csv"), 2)
+        os.chdir(scratch)
+        os.environ.update({
+            "COINGECKO_API_URL": f"{base_url}/api/v3",
+            "BLOCKCHAIN_API_URL": base_url,
+            "SPX_SOURCE": f"csv:{os.path.join(scratch, 'spx.csv')}",
+            "HTTP_CACHE": "0",
+            "METRICS_PATH": "",
+        })
+
+        # Imported after the environment points at the stub
+        import numpy as np
+        import backtest
+        import calculate_score
+        import chart_stream
+        import fetch_data
+        import signal_engine
+        import update_readme
+
+        # 1. Streaming chart parse of a multi-year payload
+        payload = json.dumps(stub_server.synthetic_chart("trade-volume", years * 365)).encode()
+        seconds, (timestamps, _) = timed(lambda: chart_stream.parse_chart_bytes(payload), repeat)
+        results["parse_ms"] = seconds * 1000
+        results["parse_points_per_s"] = len(timestamps) / seconds
+        results["parse_payload_kb"] = len(payload) / 1024
+
+        # 2. Full fetch against the stub: cold (bootstraps the store), then incremental
+        seconds, data = timed(quiet(fetch_data.main), 1, min_seconds=0)
+        results["fetch_cold_ms"] = seconds * 1000
+        seconds, data = timed(quiet(fetch_data.main), repeat, min_seconds=0)
+        results["fetch_warm_ms"] = seconds * 1000
+
+        # 3. Rolling statistics over multi-year history for every chart
+        series = {chart: list(chart_stream.parse_chart_bytes(json.dumps(
+            stub_server.synthetic_chart(chart, years * 365)).encode())[1]) for chart in CHARTS}
+        seconds, _ = timed(lambda: signal_engine.compute_history(
+            {chart: series[chart] for chart in fetch_data.CORE_CHARTS}), repeat)
+        results["signal_engine_ms"] = seconds * 1000
+
+        # 4. Snapshot scoring throughput (one latest_data.json per call)
+        snapshots = 500
+        calculate_score.get_registry()
+        seconds, result = timed(lambda: [calculate_score.score_snapshot(data) for _ in range(snapshots)], repeat)
+        results["score_ms"] = seconds * 1000 / snapshots
+        results["score_snapshots_per_s"] = snapshots / seconds
+        result = result[-1]
+
+        # 5. Vectorized backtest: every day of the synthetic history at once
+        #    (core and on-chain signals)
+        history = {chart: np.asarray(values) for chart, values in series.items()}
+        seconds, _ = timed(lambda: backtest.evaluate(history), repeat)
+        results["backtest_ms"] = seconds * 1000
+        results["backtest_snapshots_per_s"] = years * 365 / seconds
+
+        # 6. README render (templates + hash) and a full forced rewrite
+        records = [{"timestamp": time.time() - i * 3600, "composite_score": (i * 7) % 100}
+                   for i in range(24 * 30)]
+        seconds, _ = timed(lambda: update_readme.render_sections(result, records), repeat)
+        results["render_ms"] = seconds * 1000
+
+        scores = itertools.count()
+
+        def rewrite():
+            # A new score every call defeats the unchanged-content skip
+            return update_readme.update_readme(dict(result, composite_score=next(scores) % 100))
+        seconds, _ = timed(quiet(rewrite), repeat)
+        results["readme_write_ms"] = seconds * 1000
+
+        results["peak_rss_mb"] = peak_rss_mb()
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+        shutil.rmtree(scratch, ignore_errors=True)
+    return {name: round(value, 3) for name, value in results.items()}
+
+
+def compare(results, baseline, tolerance, floor_ms=0.0):
+    """
+    Return [(metric, baseline, current, change)] for regressions past
+    tolerance; the stage must also be floor_ms slower in absolute terms
+    (throughputs via STAGE_LATENCY), so a few ms of jitter on a small
+    stage is not a regression.
+    """
+    base_results = baseline.get("results", {})
+    regressions = []
+    for name, base in base_results.items():
+        if name not in results or not base or name == "parse_payload_kb":
+            continue
+        change = (results[name] - base) / base
+        worse = -change if DIRECTIONS.get(name, False) else change
+        stage = STAGE_LATENCY.get(name, name)
+        if (stage.endswith("_ms") and stage in results and base_results.get(stage)
+                and results[stage] - base_results[stage] < floor_ms):
+            continue
+        if worse > tolerance:
+            regressions.append((name, base, results[name], change))
+    return regressions
+
+
+def environment_mismatch(record, baseline):
+    """Keys (machine, python, years) where the baseline was recorded differently"""
+    return [key for key in ("machine", "python", "years")
+            if key in baseline and baseline[key] != record[key]]
+
+
+def extra_run(args):
+    """One more full run in a fresh process (module constants hold the stub URL)"""
+    with tempfile.TemporaryDirectory(prefix="btc-bench-") as tmp:
+        out = os.path.join(tmp, "results.json")
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--years", str(args.years),
+                        "--repeat", str(args.repeat), "--latency", str(args.latency),
+                        "--baseline", os.path.join(tmp, "none.json"), "--json", out],
+                       check=True, stdout=subprocess.DEVNULL)
+        with open(out, "r") as f:
+            return json.load(f)["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmarks")
+    parser.add_argument("--years", type=int, default=8, help="years of synthetic chart history")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per stage (median reported)")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub latency per response (s)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression (fraction)")
+    parser.add_argument("--floor-ms", type=float, default=5.0,
+                        help="latency increases below this many ms never count as regressions")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--baseline-runs", type=int, default=5,
+                        help="full runs whose per-metric median --update-baseline stores")
+    parser.add_argument("--json", metavar="PATH", help="also write results to PATH")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"🏁 PIPELINE BENCHMARK ({args.years} years of history, median of {args.repeat})")
+    print("=" * 70)
+    results = run_benchmarks(args.years, args.repeat, args.latency)
+    if args.update_baseline and args.baseline_runs > 1:
+        # One run can land at either end of the machine's noise; store the middle
+        runs = [results] + [extra_run(args) for _ in range(args.baseline_runs - 1)]
+        results = {name: round(statistics.median(run[name] for run in runs), 3) for name in results}
+
+    try:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+    base = baseline.get("results", {})
+    for name, value in results.items():
+        line = f"   {name:<28} {value:14,.3f}"
+        if base.get(name):
+            line += f"   ({(value - base[name]) / base[name]:+.0%} vs baseline)"
+        print(line)
+
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "years": args.years,
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(record, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(record, f, indent=2)
+        print(f"✅ Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, args.floor_ms)
+    print("=" * 70)
+    if not base:
+        print("⚪ No baseline yet - run with --update-baseline")
+        return 0
+    mismatch = environment_mismatch(record, baseline)
+    if mismatch:
+        print("⚠️ Baseline recorded with a different " + ", ".join(
+            f"{key} ({baseline[key]} vs {record[key]})" for key in mismatch) + " - not enforced")
+    if regressions:
+        for name, old, new, change in regressions:
+            print(f"{'⚠️' if mismatch else '❌'} {name}: {old:,.3f} -> {new:,.3f} ({change:+.0%})")
+        return 0 if mismatch else 1
+    print(f"✅ No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+`python -m scripts` - run the whole pipeline in one process
+"""
+
+import os
+import sys
+
+# The scripts import each other as top-level modules (as when run directly)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pipeline import main
+
+main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Alert dispatcher - notify on alert-level transitions and signal flips
+
+Every scoring result is compared with data/alert_state.json:
+
+- Levels use hysteresis: entering a level needs score >= its cut-off,
+  leaving it downwards needs score < cut-off - ALERT_HYSTERESIS, so a
+  score hovering around 30/50/70 does not flap.
+- Level changes are debounced: the new level must hold for DEBOUNCE_RUNS
+  consecutive results (escalations fire sooner than de-escalations).
+- A signal flip (triggered <-> not triggered) is an event; a signal
+  becoming unavailable is not.
+
+All events of one run are sent as one batch to every configured sink.
+Sinks run concurrently under one asyncio timeout, so a slow webhook
+never holds up the run (blocking calls go to daemon threads that the
+event loop does not join on shutdown).
+
+    ALERT_SINKS=stdout,file,webhook       # default: stdout,file
+    ALERT_WEBHOOK_URL=https://...         # JSON, Discord or Slack webhook
+"""
+
+import asyncio
+import json
+import os
+import threading
+from datetime import datetime
+
+import metrics
+
+STATE_PATH = os.path.join("data", "alert_state.json")
+LOG_PATH = os.path.join("data", "alerts.jsonl")
+
+ALERT_SINKS = os.environ.get("ALERT_SINKS", "stdout,file")
+ALERT_WEBHOOK_URL = os.environ.get("ALERT_WEBHOOK_URL")
+ALERT_HYSTERESIS = float(os.environ.get("ALERT_HYSTERESIS", "5"))
+ALERT_TIMEOUT = float(os.environ.get("ALERT_TIMEOUT", "10"))
+
+# Consecutive results a new level must hold before it is announced
+DEBOUNCE_RUNS = {"up": 1, "down": 2}
+
+
+def _levels():
+    from calculate_score import ALERT_LEVELS
+    return ALERT_LEVELS
+
+
+def severity(level):
+    """0 = SAFE ... 3 = RED ALERT"""
+    names = [entry[1] for entry in reversed(_levels())]
+    return names.index(level) if level in names else 0
+
+
+def level_for(score):
+    for cutoff, level, _, _ in _levels():
+        if score >= cutoff:
+            return level
+    return _levels()[-1][1]
+
+
+def hysteresis_level(score, current, band=ALERT_HYSTERESIS):
+    """Level after applying the hysteresis band around `current`"""
+    raw = level_for(score)
+    if current is None or severity(raw) > severity(current):
+        return raw
+    lowered = level_for(score + band)
+    return lowered if severity(lowered) < severity(current) else current
+
+
+class AlertEngine:
+    """Compares results with the persisted state and yields events"""
+
+    def __init__(self, path=STATE_PATH, hysteresis=ALERT_HYSTERESIS, debounce=None):
+        self.path = path
+        self.hysteresis = hysteresis
+        self.debounce = dict(DEBOUNCE_RUNS, **(debounce or {}))
+        try:
+            with open(path, "r") as f:
+                self.state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.state = {}
+
+    def evaluate(self, result):
+        """Update state from one result; returns the list of events"""
+        score = result["composite_score"]
+        timestamp = result.get("timestamp") or datetime.now().isoformat()
+        current = self.state.get("level")
+        target = hysteresis_level(score, current, self.hysteresis)
+        events = []
+
+        if current is None:
+            # First run: adopt the level silently
+            self.state["level"] = target
+        elif target != current:
+            pending = self.state.get("pending") or {}
+            runs = pending.get("runs", 0) + 1 if pending.get("level") == target else 1
+            direction = "up" if severity(target) > severity(current) else "down"
+            if runs >= self.debounce[direction]:
+                events.append({
+                    "type": "level",
+                    "direction": direction,
+                    "from": current,
+                    "to": target,
+                    "score": score,
+                    "timestamp": timestamp,
+                    "message": f"Alert level {current} -> {target} (score {score:.1f})",
+                })
+                self.state["level"] = target
+                self.state.pop("pending", None)
+            else:
+                self.state["pending"] = {"level": target, "runs": runs, "since": pending.get("since", timestamp)}
+        else:
+            self.state.pop("pending", None)
+
+        previous = self.state.get("signals", {})
+        signals = {}
+        for signal in result.get("signals", []):
+            key = signal.get("key", signal["name"])
+            triggered = signal.get("triggered")
+            signals[key] = triggered
+            before = previous.get(key)
+            if triggered is None or before is None or triggered == before:
+                continue
+            events.append({
+                "type": "signal",
+                "key": key,
+                "name": signal["name"],
+                "triggered": triggered,
+                "value": signal.get("current_value"),
+                "score": score,
+                "timestamp": timestamp,
+                "message": f"{signal['name']} {'TRIGGERED' if triggered else 'cleared'} "
+                           f"({signal.get('current_value')})",
+            })
+        # Keep the last known state of signals that are unavailable this run
+        self.state["signals"] = dict(previous, **{k: v for k, v in signals.items() if v is not None})
+        self.state["score"] = score
+        self.state["updated"] = timestamp
+        return events
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _in_daemon_thread(fn, *args, **kwargs):
+    """
+    Await fn(*args, **kwargs) run on a daemon thread. Unlike
+    asyncio.to_thread, a call still blocked when the timeout cancels the
+    await is abandoned instead of being joined by asyncio.run().
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result, error):
+        if not future.done():
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def work():
+        try:
+            result, error = fn(*args, **kwargs), None
+        except BaseException as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            pass  # loop already closed: the caller gave up on this call
+
+    threading.Thread(target=work, name="alert-sink", daemon=True).start()
+    return future
+
+
+class AlertSink:
+    """Base sink: send() receives every event of one run as a batch"""
+
+    name = "sink"
+
+    async def send(self, events):
+        raise NotImplementedError
+
+
+class StdoutSink(AlertSink):
+    name = "stdout"
+
+    async def send(self, events):
+        for event in events:
+            icon = "🚨" if event.get("direction") == "up" or event.get("triggered") else "🔔"
+            print(f"{icon} {event['message']}")
+
+
+class FileSink(AlertSink):
+    """Appends one JSON line per event"""
+
+    name = "file"
+
+    def __init__(self, path=LOG_PATH):
+        self.path = path
+
+    async def send(self, events):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+
+
+class WebhookSink(AlertSink):
+    """POSTs the batch; Discord and Slack webhooks get their text format"""
+
+    name = "webhook"
+
+    def __init__(self, url, timeout=ALERT_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def payload(self, events):
+        text = "\n".join(event["message"] for event in events)
+        if "discord.com/api/webhooks" in self.url or "discordapp.com/api/webhooks" in self.url:
+            return {"content": text[:2000]}
+        if "hooks.slack.com" in self.url:
+            return {"text": text}
+        return {"events": events}
+
+    async def send(self, events):
+        import requests
+        response = await _in_daemon_thread(
+            requests.post, self.url, json=self.payload(events), timeout=self.timeout)
+        response.raise_for_status()
+
+
+# name -> factory; register_sink() adds new kinds
+SINKS = {
+    "stdout": StdoutSink,
+    "file": FileSink,
+    "webhook": lambda: WebhookSink(ALERT_WEBHOOK_URL) if ALERT_WEBHOOK_URL else None,
+}
+
+
+def register_sink(name, factory):
+    SINKS[name] = factory
+
+
+def configured_sinks(names=None):
+    names = ALERT_SINKS if names is None else names
+    sinks = []
+    for name in filter(None, (part.strip() for part in names.split(","))):
+        if name not in SINKS:
+            print(f"⚠️ Unknown alert sink {name!r}")
+            continue
+        sink = SINKS[name]()
+        if sink is not None:
+            sinks.append(sink)
+    return sinks
+
+
+async def _deliver(sinks, events, timeout):
+    async def one(sink):
+        try:
+            await asyncio.wait_for(sink.send(events), timeout)
+            return None
+        except Exception as e:
+            return f"{sink.name}: {type(e).__name__}: {e}"
+    return [error for error in await asyncio.gather(*(one(sink) for sink in sinks)) if error]
+
+
+def dispatch(events, sinks=None, timeout=ALERT_TIMEOUT):
+    """Send one batch to every sink concurrently; returns the failed sinks' errors"""
+    if not events:
+        return []
+    sinks = configured_sinks() if sinks is None else sinks
+    errors = asyncio.run(_deliver(sinks, events, timeout))
+    for error in errors:
+        print(f"⚠️ Alert sink failed: {error}")
+    return errors
+
+
+def process(result, engine=None, sinks=None):
+    """Evaluate one scoring result, persist the state and dispatch its events"""
+    with metrics.current().stage("alerts"):
+        engine = engine or AlertEngine()
+        events = engine.evaluate(result)
+        engine.save()
+        dispatch(events, sinks)
+    return events
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Read-only HTTP API over the latest scoring result (asyncio, no framework)
+
+    GET /current                  composite score, alert level, completeness
+    GET /signals                  per-signal details
+    GET /history?start=&end=      score history range (unix seconds or ISO)
+    GET /health
+
+Responses come from an in-memory Snapshot that is rebuilt once per
+scoring run and swapped in with a single assignment; requests never touch
+disk. Bodies, their gzip encodings and ETags are precomputed at swap time
+(history ranges on first request), so a poll is a dict lookup plus an
+If-None-Match compare that usually ends in a 304.
+
+Usage:
+    python scripts/api_server.py --port 8080     # watches data/current_signals.json
+    python scripts/daemon.py --serve 8080        # hot-swapped after every rescore
+"""
+
+import argparse
+import asyncio
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import score_history
+
+SIGNALS_PATH = os.path.join("data", "current_signals.json")
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+IDLE_TIMEOUT = 15.0
+MAX_HEADER_BYTES = 16384
+HISTORY_CACHE_SIZE = 64
+GZIP_MIN_BYTES = 512
+
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 503: "Service Unavailable"}
+CURRENT_FIELDS = ("composite_score", "smart_money_score", "alert_level", "alert_color",
+                  "alert_message", "timestamp", "data_completeness", "stale_inputs",
+                  "tracker_version")
+
+
+class Body:
+    """A response body with its precomputed ETag and gzip encoding"""
+
+    __slots__ = ("raw", "gzipped", "etag")
+
+    def __init__(self, payload):
+        self.raw = json.dumps(payload, separators=(",", ":")).encode()
+        self.etag = '"' + hashlib.sha1(self.raw).hexdigest()[:20] + '"'
+        self.gzipped = gzip.compress(self.raw, 6) if len(self.raw) >= GZIP_MIN_BYTES else None
+
+
+class Snapshot:
+    """Immutable view of one scoring result plus the score history"""
+
+    def __init__(self, result, records):
+        self.result = result
+        self.records = records
+        self.timestamps = [record["timestamp"] for record in records]
+        self.bodies = {
+            "/current": Body({field: result.get(field) for field in CURRENT_FIELDS}),
+            "/signals": Body({"timestamp": result.get("timestamp"), "signals": result.get("signals", [])}),
+        }
+        self._history = {}  # (start, end) -> Body, only touched from the event loop
+
+    def history(self, start, end):
+        # Keyed on the parsed bounds, not the record range: the body echoes them
+        body = self._history.get((start, end))
+        if body is None:
+            lo = 0 if start is None else bisect.bisect_left(self.timestamps, start)
+            hi = len(self.timestamps) if end is None else bisect.bisect_right(self.timestamps, end)
+            body = Body({"start": start, "end": end, "count": hi - lo, "records": self.records[lo:hi]})
+            if len(self._history) >= HISTORY_CACHE_SIZE:
+                self._history.clear()
+            self._history[(start, end)] = body
+        return body
+
+
+def load_snapshot(signals_path=SIGNALS_PATH, history_path=score_history.HISTORY_PATH):
+    with open(signals_path, "r") as f:
+        result = json.load(f)
+    return Snapshot(result, score_history.range_query(path=history_path))
+
+
+def _time_param(query, name):
+    values = query.get(name)
+    if not values or not values[0]:
+        return None
+    try:
+        return float(values[0])
+    except ValueError:
+        return datetime.fromisoformat(values[0].replace("Z", "+00:00")).timestamp()
+
+
+class ApiServer:
+    """asyncio HTTP/1.1 server (keep-alive, ETag/304, gzip) over a swappable Snapshot"""
+
+    def __init__(self, host=API_HOST, port=8080, snapshot=None):
+        self.host = host
+        self.port = port
+        self.snapshot = snapshot
+        self.requests = 0
+        self._server = None
+        self._loop = None
+
+    def publish(self, result, records=None):
+        """Build a new snapshot off-loop and swap it in (safe from any thread)"""
+        if records is None:
+            records = score_history.range_query()
+        self.snapshot = Snapshot(result, records)
+
+    def route(self, path, query):
+        """Return (status, Body) for a GET"""
+        snapshot = self.snapshot
+        if path == "/health":
+            return 200, Body({"status": "ok", "ready": snapshot is not None, "requests": self.requests})
+        if snapshot is None:
+            return 503, Body({"error": "no scoring result yet"})
+        if path in snapshot.bodies:
+            return 200, snapshot.bodies[path]
+        if path == "/history":
+            try:
+                start, end = _time_param(query, "start"), _time_param(query, "end")
+            except ValueError:
+                return 400, Body({"error": "start/end must be unix seconds or ISO timestamps"})
+            return 200, snapshot.history(start, end)
+        return 404, Body({"error": f"unknown path {path}"})
+
+    def respond(self, method, target, headers):
+        """Build the raw HTTP response bytes for one request"""
+        url = urlsplit(target)
+        if method not in ("GET", "HEAD"):
+            status, body = 405, Body({"error": "read-only API"})
+        else:
+            status, body = self.route(url.path.rstrip("/") or "/", parse_qs(url.query))
+
+        head = {
+            "Content-Type": "application/json",
+            "Cache-Control": "no-cache",
+            "ETag": body.etag,
+            "Vary": "Accept-Encoding",
+        }
+        payload = body.raw
+        if status == 200 and body.etag in headers.get("if-none-match", ""):
+            status, payload = 304, b""
+        elif body.gzipped is not None and "gzip" in headers.get("accept-encoding", ""):
+            payload = body.gzipped
+            head["Content-Encoding"] = "gzip"
+        if status != 304:
+            head["Content-Length"] = str(len(payload))
+        if method == "HEAD":
+            payload = b""
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+        lines += [f"{name}: {value}" for name, value in head.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode() + payload
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+                    break
+                request_line, *header_lines = raw.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                self.requests += 1
+                writer.write(self.respond(method, target, headers))
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close" or version == "HTTP/1.0":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, ready=None):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self.handle, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"🌐 API listening on http://{self.host}:{self.port} (/current /signals /history)")
+        if ready is not None:
+            ready.set()
+        async with self._server:
+            try:
+                await self._server.serve_forever()
+            except asyncio.CancelledError:
+                pass  # stop() closed the server
+
+    def start_in_thread(self):
+        """Run the server on its own event loop in a daemon thread"""
+        ready = threading.Event()
+        threading.Thread(target=lambda: asyncio.run(self.serve(ready)), daemon=True).start()
+        ready.wait(5)
+        return self
+
+    def stop(self):
+        if self._server is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+
+async def watch(server, signals_path, interval):
+    """Standalone mode: swap in a new snapshot whenever the result file changes"""
+    seen = None
+    while True:
+        try:
+            mtime = os.stat(signals_path).st_mtime_ns
+            if mtime != seen:
+                snapshot = await asyncio.to_thread(load_snapshot, signals_path)
+                server.snapshot, seen = snapshot, mtime
+                print(f"🔄 Snapshot loaded: score {snapshot.result.get('composite_score')}")
+        except (FileNotFoundError, ValueError) as e:
+            print(f"⚠️ No usable {signals_path}: {e}")
+        await asyncio.sleep(interval)
+
+
+async def _serve_and_watch(server, signals_path, interval):
+    await asyncio.gather(server.serve(), watch(server, signals_path, interval))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the latest signals over HTTP")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--signals", default=SIGNALS_PATH, help="scoring result to serve")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between file checks")
+    args = parser.parse_args()
+
+    server = ApiServer(args.host, args.port)
+    try:
+        asyncio.run(_serve_and_watch(server, args.signals, args.interval))
+    except KeyboardInterrupt:
+        print("👋 API stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Running all-time-high tracker - the ATH follows the price history
+
+data/ath_state.json keeps one entry per asset:
+
+    {"bitcoin": {"ath_price": 126280.0, "ath_timestamp": 1759708800, "backfilled": true}}
+
+Every fetched price goes through record(), which keeps the asset's daily
+close in the time-series store ("price-<id>") and folds the price into
+the running high. The first time an asset is seen its ATH is backfilled
+from that stored history (plus the Blockchain.com "market-price" chart
+for BTC, when `backtest.py --backfill` has synced it) and raised to any
+high an API reports (seed(), CoinGecko's /coins/markets ath in
+multi-asset mode); after that each price is an O(1) compare against the
+stored high. The state file is only rewritten when a high actually moves.
+
+Usage:
+    python scripts/ath_tracker.py             # show tracked ATHs
+    python scripts/ath_tracker.py --rebackfill
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import timeseries_store
+
+STATE_PATH = os.path.join("data", "ath_state.json")
+DAY = 86400
+
+# Extra price history used for the one-time backfill, per CoinGecko asset id
+# (every asset also has the "price-<id>" series record() keeps)
+HISTORY_METRICS = {"bitcoin": ("market-price",)}
+
+# Highs printed before the local store existed (Oct 6 2025 BTC ATH), so a
+# short stored history can never pull the ATH below a known level
+SEED_ATHS = {"bitcoin": (126280.0, 1759708800)}
+
+
+def price_metric(asset_id):
+    return f"price-{asset_id}"
+
+
+def history_metrics(asset_id):
+    return HISTORY_METRICS.get(asset_id, ()) + (price_metric(asset_id),)
+
+
+def drawdown_pct(price, ath_price):
+    """Percent below the ATH (0 at a new high)"""
+    if not ath_price or price is None:
+        return None
+    return max(0.0, (ath_price - price) / ath_price * 100)
+
+
+class AthTracker:
+    """Persistent per-asset running maximum"""
+
+    def __init__(self, path=STATE_PATH, store_dir=None):
+        self.path = path
+        self.store_dir = store_dir
+        self.dirty = False
+        try:
+            with open(path, "r") as f:
+                self.state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.state = {}
+
+    def backfill(self, asset_id):
+        """Seed an asset's ATH from its stored price history (one-time)"""
+        ath_price, ath_timestamp = SEED_ATHS.get(asset_id, (0.0, None))
+        for metric in history_metrics(asset_id):
+            timestamps, values = timeseries_store.read_series(metric, self.store_dir)
+            if values:
+                i = max(range(len(values)), key=values.__getitem__)
+                if values[i] > ath_price:
+                    ath_price, ath_timestamp = values[i], timestamps[i]
+        entry = self.state.get(asset_id, {})
+        if entry.get("ath_price", 0) > ath_price:
+            ath_price, ath_timestamp = entry["ath_price"], entry.get("ath_timestamp")
+        self.state[asset_id] = {"ath_price": ath_price, "ath_timestamp": ath_timestamp, "backfilled": True}
+        self.dirty = True
+        return self.state[asset_id]
+
+    def seed(self, asset_id, ath_price, ath_timestamp=None):
+        """Raise an asset's ATH to a high reported by an API (never lowers it)"""
+        entry = self.state.get(asset_id)
+        if entry is None or not entry.get("backfilled"):
+            entry = self.backfill(asset_id)
+        if ath_price > entry["ath_price"]:
+            entry["ath_price"] = float(ath_price)
+            entry["ath_timestamp"] = ath_timestamp
+            self.dirty = True
+        return entry
+
+    def update(self, asset_id, price, timestamp=None):
+        """Fold one price into the running ATH; returns the asset's entry"""
+        entry = self.state.get(asset_id)
+        if entry is None or not entry.get("backfilled"):
+            entry = self.backfill(asset_id)
+        if price is not None and price > entry["ath_price"]:
+            entry["ath_price"] = float(price)
+            entry["ath_timestamp"] = int(time.time() if timestamp is None else timestamp)
+            self.dirty = True
+        return entry
+
+    def record(self, asset_id, price, timestamp=None):
+        """Store the price as the asset's daily close, then return metrics()"""
+        timestamp = time.time() if timestamp is None else timestamp
+        timeseries_store.append_points(price_metric(asset_id), [(int(timestamp) // DAY * DAY, price)],
+                                       self.store_dir)
+        return self.metrics(asset_id, price, timestamp)
+
+    def metrics(self, asset_id, price, timestamp=None):
+        """Snapshot fields: ath_price, ath_date, drawdown_from_ath"""
+        entry = self.update(asset_id, price, timestamp)
+        ath_timestamp = entry.get("ath_timestamp")
+        return {
+            "ath_price": entry["ath_price"],
+            "ath_date": (datetime.fromtimestamp(ath_timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+                         if ath_timestamp else None),
+            "drawdown_from_ath": drawdown_pct(price, entry["ath_price"]),
+        }
+
+    def save(self):
+        if not self.dirty:
+            return False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or rebuild tracked all-time highs")
+    parser.add_argument("--rebackfill", action="store_true",
+                        help="re-seed every tracked asset from stored price history")
+    args = parser.parse_args()
+
+    tracker = AthTracker()
+    if args.rebackfill:
+        for asset_id in list(tracker.state) or list(SEED_ATHS):
+            tracker.backfill(asset_id)
+        tracker.save()
+    for asset_id, entry in sorted(tracker.state.items()):
+        when = (datetime.fromtimestamp(entry["ath_timestamp"], tz=timezone.utc).strftime("%Y-%m-%d")
+                if entry.get("ath_timestamp") else "?")
+        print(f"   {asset_id:<14} ATH ${entry['ath_price']:,.2f} ({when})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Historical backtest - replay the composite score over every stored day
+
+History is turned into the same metric columns calculate_score() reads
+from latest_data.json and scored by the compiled signal registry, so every
+trigger is a NumPy array operation over the full history and re-scoring
+years of data with different weights or thresholds takes well under a
+second. The on-chain set (onchain.py) is derived from the same grid, and
+the SPX rollover from the "spx-close" series spx_provider.py keeps.
+Signals without stored history (dominance, USDT, TOTAL2) are left out
+of the columns and count as unavailable, exactly like a `None` trigger
+in calculate_score().
+
+Usage:
+    python scripts/backtest.py --backfill 8years
+    python scripts/backtest.py --ath-ratio 0.85 --volume-spike 1.4 --output data/backtest.csv
+    python scripts/backtest.py --threshold cap_decline=-8 --weight volume_spike=0.3
+"""
+
+import argparse
+import csv
+from datetime import datetime, timezone
+
+import numpy as np
+
+import calculate_score
+import onchain
+import signal_engine
+import spx_provider
+import timeseries_store
+
+DAY = 86400
+BACKTEST_CHARTS = ("market-price", "trade-volume", "n-transactions", "market-cap",
+                   "hash-rate") + onchain.ONCHAIN_CHARTS
+# SPX closes are stored by spx_provider.py, not backfilled from Blockchain.com
+HISTORY_SERIES = BACKTEST_CHARTS + (spx_provider.SPX_METRIC,)
+SPX_MA_SERIES = "spx-ma200"
+
+# Past cycle tops used to judge how early the model warned
+KNOWN_TOPS = ["2013-12-04", "2017-12-17", "2021-11-10", "2025-10-06"]
+LEAD_WINDOW_DAYS = 180
+
+def backfill(timespan, charts=BACKTEST_CHARTS):
+    """Download long history once and merge it into the local store"""
+    from http_engine import FetchEngine
+    from fetch_data import fetch_chart
+
+    with FetchEngine(deadline=300) as engine:
+        fetched = engine.run({
+            chart: (lambda c=chart: fetch_chart(engine, c, timespan))
+            for chart in charts
+        })
+    for chart, points in fetched.items():
+        if points:
+            total = timeseries_store.merge_points(chart, zip(*points))
+            print(f"   💾 {chart}: {total} stored points")
+
+
+def _forward_fill(values):
+    idx = np.where(np.isnan(values), 0, np.arange(len(values)))
+    np.maximum.accumulate(idx, out=idx)
+    filled = values[idx]
+    # Leading gap stays NaN
+    first = np.argmax(~np.isnan(values)) if np.any(~np.isnan(values)) else len(values)
+    filled[:first] = np.nan
+    return filled
+
+
+def load_history(charts=HISTORY_SERIES, store_dir=None):
+    """
+    Align stored series on one daily grid spanning all stored days.
+    Returns (days, {chart: values}) with days as unix day numbers.
+    """
+    raw = {}
+    for chart in charts:
+        # One point per day (mempool-size is sampled intraday)
+        days, values = onchain.daily(*timeseries_store.read_series(chart, store_dir))
+        if len(days):
+            raw[chart] = (days, values)
+    if spx_provider.SPX_METRIC in raw:
+        # The 200-day MA runs over trading days, so take it before the
+        # closes are spread onto the calendar grid
+        days, closes = raw[spx_provider.SPX_METRIC]
+        raw[SPX_MA_SERIES] = (days, signal_engine.rolling_mean(closes[None, :], spx_provider.MA_WINDOW)[0])
+    if not raw:
+        return np.empty(0, dtype=np.int64), {}
+
+    start = min(days[0] for days, _ in raw.values())
+    end = max(days[-1] for days, _ in raw.values())
+    days = np.arange(start, end + 1, dtype=np.int64)
+
+    aligned = {}
+    for chart, (chart_days, values) in raw.items():
+        column = np.full(len(days), np.nan)
+        column[chart_days - start] = values
+        aligned[chart] = _forward_fill(column)
+    return days, aligned
+
+
+def history_columns(series):
+    """Derive the registry's metric columns from aligned daily history"""
+    length = len(next(iter(series.values()))) if series else 0
+    columns = {}
+
+    price = series.get("market-price")
+    if price is not None:
+        # Point-in-time ATH: the running maximum, never a future high
+        with np.errstate(invalid="ignore", divide="ignore"):
+            columns["price_to_ath"] = price / np.fmax.accumulate(price)
+        columns["drawdown_from_ath"] = (1 - columns["price_to_ath"]) * 100
+        columns["btc_price"] = price
+
+    # Batched rolling windows for the on-chain metrics
+    on_chain = [name for name in ("trade-volume", "n-transactions", "market-cap", "hash-rate")
+                if name in series]
+    if on_chain:
+        matrix = np.vstack([series[name] for name in on_chain])
+        recent = signal_engine.rolling_mean(matrix, signal_engine.RECENT_WINDOW)
+        baseline = signal_engine.shift(
+            signal_engine.rolling_mean(matrix, signal_engine.BASELINE_WINDOW),
+            signal_engine.RECENT_WINDOW)
+        change = signal_engine.pct_change(matrix, signal_engine.TREND_LAG)
+        rows = {name: i for i, name in enumerate(on_chain)}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if "trade-volume" in rows:
+                i = rows["trade-volume"]
+                columns["trade_volume.ratio"] = recent[i] / baseline[i]
+            if "n-transactions" in rows:
+                i = rows["n-transactions"]
+                columns["transaction_count.ratio"] = recent[i] / baseline[i]
+            if "market-cap" in rows:
+                columns["market_cap_trend.change_pct"] = change[rows["market-cap"]]
+            if "hash-rate" in rows:
+                columns["hash_rate_trend.change_pct"] = change[rows["hash-rate"]]
+
+    spx, ma200 = series.get(spx_provider.SPX_METRIC), series.get(SPX_MA_SERIES)
+    if spx is not None and ma200 is not None:
+        columns["spx_price"] = spx
+        columns["spx_rollover"] = np.where(np.isnan(ma200), np.nan, spx < ma200)
+
+    # Puell multiple, ribbons, NVT and mempool for every day
+    columns.update(onchain.columns(series))
+
+    return {name: column for name, column in columns.items() if len(column) == length}
+
+
+def evaluate(series, registry=None):
+    """
+    Score every day at once. Returns a dict of arrays:
+    triggers (signals x days, NaN = unavailable), composite, smart_money, alert.
+    """
+    registry = registry or calculate_score.get_registry()
+    length = len(next(iter(series.values()))) if series else 0
+
+    triggers = registry.triggers(history_columns(series), length)
+    composite, by_category, _ = registry.score(triggers)
+    smart_money = by_category.get("Smart Money", np.full(length, np.nan))
+
+    return {
+        "triggers": triggers,
+        "composite": composite,
+        "smart_money": smart_money,
+        "alert": alert_codes(composite),
+    }
+
+
+def alert_codes(composite):
+    """Index into calculate_score.ALERT_LEVELS (0 = RED ALERT ... 3 = SAFE), any shape"""
+    cutoffs = np.array([level[0] for level in reversed(calculate_score.ALERT_LEVELS[:-1])])
+    return len(cutoffs) - np.searchsorted(cutoffs, composite, side="right")
+
+
+def lead_times(days, alert, min_level="ORANGE"):
+    """Days of warning before each known top (None = no warning in window)"""
+    names = [level[1] for level in calculate_score.ALERT_LEVELS]
+    worst = names.index(min_level)
+    leads = {}
+    for top in KNOWN_TOPS:
+        top_day = int(datetime.strptime(top, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()) // DAY
+        in_window = (days >= top_day - LEAD_WINDOW_DAYS) & (days <= top_day)
+        if days[0] > top_day - LEAD_WINDOW_DAYS or days[-1] < top_day:
+            continue
+        warned = in_window & (alert <= worst)
+        leads[top] = int(top_day - days[np.argmax(warned)]) if np.any(warned) else None
+    return leads
+
+
+def write_csv(path, days, series, result):
+    names = [level[1] for level in calculate_score.ALERT_LEVELS]
+    price = series.get("market-price")
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "btc_price", "composite_score", "smart_money_score", "alert_level"])
+        for i, day in enumerate(days):
+            date = datetime.fromtimestamp(int(day) * DAY, tz=timezone.utc).strftime("%Y-%m-%d")
+            smart = result["smart_money"][i]
+            writer.writerow([
+                date,
+                "" if price is None or np.isnan(price[i]) else f"{price[i]:.2f}",
+                f"{result['composite'][i]:.1f}",
+                "" if np.isnan(smart) else f"{smart:.1f}",
+                names[result["alert"][i]],
+            ])
+
+
+def parse_overrides(pairs, registry, parser):
+    overrides = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        if key not in registry.keys:
+            parser.error(f"unknown signal key: {key} (see signals.yaml)")
+        overrides[key] = float(value)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the composite score over stored history")
+    parser.add_argument("--backfill", metavar="TIMESPAN", help="download history first, e.g. 8years")
+    parser.add_argument("--ath-ratio", type=float, help="shortcut for --threshold ath=VALUE")
+    parser.add_argument("--volume-spike", type=float, help="shortcut for --threshold volume_spike=VALUE")
+    parser.add_argument("--cap-decline", type=float, help="shortcut for --threshold cap_decline=VALUE")
+    parser.add_argument("--hash-decline", type=float, help="shortcut for --threshold hash_decline=VALUE")
+    parser.add_argument("--threshold", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a signal threshold, e.g. cap_decline=-8")
+    parser.add_argument("--weight", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a signal weight, e.g. volume_spike=0.3")
+    parser.add_argument("--output", help="write the per-day scores to this CSV")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🧪 BACKTEST - Composite Score Replay")
+    print("=" * 70)
+
+    if args.backfill:
+        print(f"🔄 Backfilling {args.backfill} of history...")
+        backfill(args.backfill)
+
+    registry = calculate_score.get_registry()
+    thresholds = parse_overrides(args.threshold, registry, parser)
+    for key, value in (("ath", args.ath_ratio), ("volume_spike", args.volume_spike),
+                       ("cap_decline", args.cap_decline), ("hash_decline", args.hash_decline)):
+        if value is not None:
+            thresholds[key] = value
+    registry = registry.with_overrides(parse_overrides(args.weight, registry, parser), thresholds)
+
+    days, series = load_history()
+    if len(days) == 0:
+        print("❌ No stored history - run fetch_data.py or use --backfill")
+        exit(1)
+
+    result = evaluate(series, registry)
+
+    names = [level[1] for level in calculate_score.ALERT_LEVELS]
+    first = datetime.fromtimestamp(int(days[0]) * DAY, tz=timezone.utc)
+    last = datetime.fromtimestamp(int(days[-1]) * DAY, tz=timezone.utc)
+    print(f"✅ Replayed {len(days):,} days ({first:%Y-%m-%d} → {last:%Y-%m-%d})")
+    counts = np.bincount(result["alert"], minlength=len(names))
+    for (_, level, color, _), count in zip(calculate_score.ALERT_LEVELS, counts):
+        print(f"   {color} {level}: {count:,} days ({count / len(days) * 100:.1f}%)")
+    print(f"   Peak score: {np.max(result['composite']):.1f}")
+
+    leads = lead_times(days, result["alert"])
+    if leads:
+        print("📅 Warning lead time before known tops (ORANGE or worse):")
+        for top, lead in leads.items():
+            print(f"   {top}: {'no warning' if lead is None else f'{lead} days'}")
+
+    if args.output:
+        write_csv(args.output, days, series, result)
+        print(f"✅ Per-day scores saved to {args.output}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
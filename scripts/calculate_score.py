@@ -6,147 +6,93 @@ Calculate composite score - FREE SMART MONEY EDITION
 import json
 from datetime import datetime
 
-def calculate_score():
-    """Calculate weighted composite score with FREE smart money signals"""
-    
-    # Load latest data
-    with open('data/latest_data.json', 'r') as f:
-        data = json.load(f)
-    
-    # ✅ CALCULATE THESE FIRST (before using in signals)
-       ath_price = 126280
-    current_price = data.get('btc_price', 0)
-    price_ratio = current_price / ath_price if ath_price > 0 else 0
-    
-    # Define signals with weights
-    signals = [
-        # TIER 1: Price & Market (25%)
-        {
-            "name": "BTC Price vs ATH",
-            "weight": 0.20,
-            "trigger": price_ratio >= 0.80,
-            "current_value": f"${current_price:,.0f}",
-            "target": "> $126K (Oct 6 ATH)",
-            "triggered": price_ratio >= 0.80,
-            "category": "Market"
-        },
-        {
-            "name": "BTC Dominance Low",
-            "weight": 0.05,
-            "trigger": data.get("btc_dominance", 100) < 45,
-            "current_value": f"{data.get('btc_dominance', 0):.1f}%",
-            "target": "< 45% (Alt euphoria)",
-            "triggered": data.get("btc_dominance", 100) < 45,
-            "category": "Market"
-        },
-        
-        # TIER 2: FREE SMART MONEY SIGNALS (50%)
-        {
-            "name": "🔥 Volume Spike Alert",
-            "weight": 0.25,
-            "trigger": data.get("volume_spike_alert", False),
-            "current_value": f"${data.get('trade_volume', {}).get('current', 0)/1e9:.2f}B/day" if data.get('trade_volume') else "N/A",
-            "target": "> 50% above baseline (Distribution)",
-            "triggered": data.get("volume_spike_alert") if data.get("volume_spike_alert") is not None else None,
-            "category": "Smart Money"
-        },
-        {
-            "name": "📉 Market Cap Declining",
-            "weight": 0.15,
-            "trigger": data.get("market_cap_trend", {}).get("declining", False),
-            "current_value": f"{data.get('market_cap_trend', {}).get('change_pct', 0):+.1f}%" if data.get('market_cap_trend') else "N/A",
-            "target": "< -5% (Smart money exiting)",
-            "triggered": data.get("market_cap_trend", {}).get("declining") if data.get('market_cap_trend', {}).get("declining") is not None else None,
-            "category": "Smart Money"
-        },
-        {
-            "name": "⛏️ Hash Rate Falling",
-            "weight": 0.10,
-            "trigger": data.get("hash_rate_trend", {}).get("declining", False),
-            "current_value": f"{data.get('hash_rate_trend', {}).get('change_pct', 0):+.1f}%" if data.get('hash_rate_trend') else "N/A",
-            "target": "< -10% (Miner capitulation)",
-            "triggered": data.get("hash_rate_trend", {}).get("declining") if data.get('hash_rate_trend', {}).get("declining") is not None else None,
-            "category": "Smart Money"
-        },
-        
-        # TIER 3: Macro Context (25%)
-        {
-            "name": "SPX Rollover",
-            "weight": 0.15,
-            "trigger": data.get("spx_rollover", False),
-            "current_value": f"${data.get('spx_price', 0):,.0f}" if data.get('spx_price') else "N/A",
-            "target": "< 200-day MA (Risk-off)",
-            "triggered": data.get("spx_rollover") if data.get("spx_rollover") is not None else None,
-            "category": "Macro"
-        },
-        {
-            "name": "USDT Dominance Low",
-            "weight": 0.05,
-            "trigger": data.get("usdt_dominance", 100) < 3,
-            "current_value": f"{data.get('usdt_dominance', 0):.1f}%",
-            "target": "< 3% (Liquidity exhaustion)",
-            "triggered": data.get("usdt_dominance", 100) < 3,
-            "category": "Macro"
-        },
-        {
-            "name": "TOTAL2 Peak",
-            "weight": 0.05,
-            "trigger": data.get("total2", 0) > 2_000_000_000_000,
-            "current_value": f"${data.get('total2', 0) / 1e12:.2f}T",
-            "target": "> $2T (Altcoin mania)",
-            "triggered": data.get("total2", 0) > 2_000_000_000_000,
-            "category": "Macro"
-        }
-    ]
-    
-    # Calculate scores
-    composite_score = 0
-    triggered_weight = 0
-    available_weight = 0
+import alerts
+import ath_tracker
+import metrics
+import score_history
+import snapshot_store
+from signal_registry import load_registry
+
+# Signal definitions, weights and thresholds live in signals.yaml
+
+# Score cut-offs, highest first: (min score, level, color, message)
+ALERT_LEVELS = [
+    (70, "RED ALERT", "🔴", "FREE Smart Money signals showing DISTRIBUTION - High risk"),
+    (50, "ORANGE", "🟠", "Distribution Phase - FREE signals warning"),
+    (30, "YELLOW", "🟡", "Early Warning - Monitor FREE signals"),
+    (0, "SAFE", "🟢", "Accumulation/Hold - No major alerts (FREE Edition)"),
+]
+
+_REGISTRY = None
+
+def get_registry():
+    """Compiled signals.yaml, loaded on first use"""
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = load_registry()
+    return _REGISTRY
+
+def alert_for(score):
+    """Return (level, color, message) for a composite score"""
+    for cutoff, level, color, message in ALERT_LEVELS:
+        if score >= cutoff:
+            return level, color, message
+    return ALERT_LEVELS[-1][1:]
+
+def derive_metrics(data):
+    """Add derived fields that signals.yaml refers to"""
+    data = dict(data)
+    # Multi-asset snapshots carry their own price; BTC falls back to btc_price
+    current_price = data.get('price', data.get('btc_price', 0))
+    data["price"] = current_price
+    if not data.get('ath_price'):
+        # Snapshot predates ATH tracking: read the running ATH (not saved here)
+        data.update(ath_tracker.AthTracker().metrics(data.get('asset', {}).get('id', 'bitcoin'), current_price))
+    ath_price = data['ath_price']
+    data["price_to_ath"] = current_price / ath_price if ath_price > 0 else 0
+    if data.get("drawdown_from_ath") is None:
+        data["drawdown_from_ath"] = ath_tracker.drawdown_pct(current_price, ath_price)
     
-    smart_money_score = 0
-    smart_money_available = 0
+    # Fields derived from a stale price are stale too
+    if "btc_price" in data.get("stale", ()):
+        data["stale"] = sorted(set(data["stale"]) | {"price", "price_to_ath", "drawdown_from_ath"})
     
-    for signal in signals:
-        if signal["triggered"] is not None:
-            available_weight += signal["weight"]
-            
-            if signal["category"] == "Smart Money":
-                smart_money_available += signal["weight"]
-            
-            if signal["triggered"]:
-                triggered_weight += signal["weight"]
-                
-                if signal["category"] == "Smart Money":
-                    smart_money_score += signal["weight"]
+    for field in ("trade_volume", "transaction_count"):
+        volume = data.get(field)
+        if volume and "ratio" not in volume and volume.get("baseline"):
+            data[field] = dict(volume, ratio=volume["current"] / volume["baseline"])
+    return data
+
+@metrics.timed("score.compute")
+def score_snapshot(data, registry=None):
+    """Score one latest_data.json-style dict (no file I/O)"""
+    registry = registry or get_registry()
+    data = derive_metrics(data)
     
-    if available_weight > 0:
-        composite_score = (triggered_weight / available_weight) * 100
-    else:
-        composite_score = 0
+    triggers = registry.triggers(registry.snapshot_columns(data), rows=1)[:, 0]
+    composite, by_category, available = registry.score(triggers[:, None])
+    composite_score = float(composite[0])
+    smart_money_pct = by_category.get("Smart Money", [float("nan")])[0]
+    smart_money_pct = None if smart_money_pct != smart_money_pct else float(smart_money_pct)
+    available_weight = float(available[0])
     
-    if smart_money_available > 0:
-        smart_money_pct = (smart_money_score / smart_money_available) * 100
-    else:
-        smart_money_pct = None
+    stale = set(data.get("stale", ()))
+    signals = []
+    for signal, fired in zip(registry.signals, triggers):
+        triggered = None if fired != fired else bool(fired)
+        signals.append({
+            "key": signal.key,
+            "name": signal.name,
+            "weight": signal.weight,
+            "current_value": registry.display_value(signal, data),
+            "target": registry.display_target(signal, data),
+            "triggered": triggered,
+            "category": signal.category,
+            "stale": signal.metric.split(".")[0] in stale
+        })
     
     # Alert levels
-    if composite_score >= 70:
-        alert_level = "RED ALERT"
-        alert_color = "🔴"
-        alert_message = "FREE Smart Money signals showing DISTRIBUTION - High risk"
-    elif composite_score >= 50:
-        alert_level = "ORANGE"
-        alert_color = "🟠"
-        alert_message = "Distribution Phase - FREE signals warning"
-    elif composite_score >= 30:
-        alert_level = "YELLOW"
-        alert_color = "🟡"
-        alert_message = "Early Warning - Monitor FREE signals"
-    else:
-        alert_level = "SAFE"
-        alert_color = "🟢"
-        alert_message = "Accumulation/Hold - No major alerts (FREE Edition)"
+    alert_level, alert_color, alert_message = alert_for(composite_score)
     
     result = {
         "composite_score": round(composite_score, 1),
@@ -156,19 +102,48 @@ def calculate_score():
         "alert_message": alert_message,
         "signals": signals,
         "timestamp": datetime.now().isoformat(),
-        "data_completeness": f"{(available_weight / 1.0) * 100:.0f}%",
+        "data_completeness": f"{available_weight / registry.weights.sum() * 100:.0f}%",
+        "stale_inputs": sorted(data.get("stale", ())),
         "tracker_version": "FREE EDITION"
     }
-    
-    # Save
-    with open('data/current_signals.json', 'w') as f:
+    return result
+
+@metrics.timed("score.save")
+def save_result(result, output_path='data/current_signals.json'):
+    with open(output_path, 'w') as f:
         json.dump(result, f, indent=2)
     
+    # Every scoring run also lands in the binary score history and the
+    # snapshot store
+    score_history.append(result)
+    snapshot_store.put("signals", result)
+    
+    # Level transitions / signal flips go out to the alert sinks
+    alerts.process(result)
+
+def calculate_score(data=None):
+    """Calculate weighted composite score with FREE smart money signals"""
+    
+    # Load latest data (unless the caller already has it in memory)
+    if data is None:
+        with open('data/latest_data.json', 'r') as f:
+            data = json.load(f)
+    
+    result = score_snapshot(data)
+    composite_score = result["composite_score"]
+    smart_money_pct = result["smart_money_score"]
+    alert_level = result["alert_level"]
+    alert_color = result["alert_color"]
+    
+    save_result(result)
+    
     print(f"✅ Composite Score: {composite_score:.1f}/100")
     if smart_money_pct is not None:
         print(f"   Smart Money Score: {smart_money_pct:.1f}/100 (FREE)")
     print(f"   Alert Level: {alert_color} {alert_level}")
     print(f"   Data Completeness: {result['data_completeness']}")
+    if result["stale_inputs"]:
+        print(f"   ⚠️ Stale inputs: {', '.join(result['stale_inputs'])}")
     print(f"   Tracker: 🆓 FREE EDITION ($0/month)")
     
     return result
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for Blockchain.com chart payloads
+
+Decodes the `values` array of {"x": ts, "y": value} points chunk by chunk
+straight into a compact array('q') / array('d') pair. Only the current
+partial point is buffered, so peak memory does not grow with the
+requested timespan beyond the 16 bytes per point of the result.
+"""
+
+import re
+from array import array
+
+VALUES_START = re.compile(rb'"values"\s*:\s*\[')
+SEPARATORS = re.compile(rb'[\s,]*')
+FIELD = re.compile(rb'"([xy])"\s*:\s*(-?[0-9][0-9.eE+-]*|null)')
+
+# Keep this much of an unmatched buffer in case the "values" key is split
+MARKER_TAIL = 32
+
+
+def _parse_point(body):
+    point = {}
+    for key, raw in FIELD.findall(body):
+        point[key] = None if raw == b"null" else raw
+    if point.get(b"x") is None or point.get(b"y") is None:
+        return None
+    return int(float(point[b"x"])), float(point[b"y"])
+
+
+def parse_chart_stream(chunks):
+    """
+    Consume an iterable of byte chunks and return (timestamps, values)
+    as array('q') and array('d'). Points with a null x/y are skipped;
+    a payload that ends before the closing `]` raises ValueError.
+    """
+    timestamps, values = array("q"), array("d")
+    buffer = b""
+    in_values = False
+    finished = False
+
+    for chunk in chunks:
+        if finished:
+            continue  # drain the rest so the source (e.g. a cache write-through) completes
+        buffer += chunk
+        if not in_values:
+            match = VALUES_START.search(buffer)
+            if match is None:
+                buffer = buffer[-MARKER_TAIL:]
+                continue
+            in_values = True
+            buffer = buffer[match.end():]
+
+        pos = 0
+        while True:
+            pos = SEPARATORS.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+            if buffer[pos:pos + 1] == b"]":
+                finished = True
+                break
+            if buffer[pos:pos + 1] != b"{":
+                raise ValueError(f"unexpected byte in chart values: {buffer[pos:pos + 20]!r}")
+            end = buffer.find(b"}", pos)
+            if end == -1:
+                break  # partial point, wait for the next chunk
+            point = _parse_point(buffer[pos + 1:end])
+            if point is not None:
+                timestamps.append(point[0])
+                values.append(point[1])
+            pos = end + 1
+        buffer = b"" if finished else buffer[pos:]
+
+    if not in_values:
+        raise ValueError("no values array in chart payload")
+    if not finished:
+        raise ValueError(f"chart payload truncated after {len(values)} points")
+    return timestamps, values
+
+
+def parse_chart_bytes(data, chunk_size=65536):
+    """Convenience wrapper for an already-downloaded payload"""
+    return parse_chart_stream(data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Long-running tracker daemon - tiered polling, rescore only on change
+
+Keeps one pooled FetchEngine session and the parsed state in memory and
+polls each source on its own interval. After every poll the combined
+inputs are compared with the last scored inputs; only a real change
+triggers rescoring and rewriting latest_data.json, current_signals.json
+and README.md.
+
+Usage:
+    python scripts/daemon.py
+    python scripts/daemon.py --coingecko 120 --blockchain 3600 --spx 86400 --no-readme
+    python scripts/daemon.py --serve 8080    # + read-only HTTP API (api_server.py)
+"""
+
+import argparse
+import signal
+import time
+from datetime import datetime
+
+import metrics
+from ath_tracker import AthTracker
+from http_engine import FetchEngine
+from spx_provider import SPXProvider, default_source
+from fetch_data import (fetch_coingecko_data, fetch_blockchain_smart_money,
+                        fetch_spx_data, save_data, load_previous, fill_from_previous,
+                        SOURCE_FIELDS)
+from calculate_score import score_snapshot, save_result
+from update_readme import update_readme
+
+# Default polling intervals (seconds)
+POLL_INTERVALS = {
+    "CoinGecko": 60,
+    "Blockchain.com": 3600,
+    "SPX": 86400,
+}
+
+
+class TrackerDaemon:
+    """Polls sources on their own schedule and rescores on input changes"""
+
+    def __init__(self, intervals=None, write_readme=True, serve=None):
+        self.intervals = dict(POLL_INTERVALS, **(intervals or {}))
+        self.write_readme = write_readme
+        self.engine = FetchEngine()
+        # Long-lived so the 200-day MA advances in O(1) per new bar
+        self.spx = SPXProvider(default_source(self.engine))
+        # Likewise the running ATH is only read from disk once
+        self.ath = AthTracker()
+        self.fetchers = {
+            "CoinGecko": lambda: fetch_coingecko_data(self.engine, self.ath),
+            "Blockchain.com": lambda: fetch_blockchain_smart_money(self.engine) or None,
+            "SPX": lambda: fetch_spx_data(self.engine, self.spx),
+        }
+        self.next_due = {name: 0.0 for name in self.fetchers}
+        self.inputs = {}
+        # Last saved snapshot: source of last-known-good values for failed fields
+        self.previous = load_previous()
+        self.scored_inputs = None
+        self.result = None
+        self.running = True
+        # Optional read-only API, hot-swapped after every rescore
+        self.api = None
+        if serve is not None:
+            from api_server import ApiServer, load_snapshot
+            snapshot = None
+            try:
+                snapshot = load_snapshot()
+            except (FileNotFoundError, ValueError):
+                pass
+            self.api = ApiServer(port=serve, snapshot=snapshot).start_in_thread()
+
+    def poll(self, now):
+        """Fetch every due source concurrently; returns the names that updated"""
+        due = [name for name, when in self.next_due.items() if when <= now]
+        if not due:
+            return []
+        self.engine.reset_deadline()
+        fetched = self.engine.run({name: self.fetchers[name] for name in due})
+        updated = []
+        for name in due:
+            self.next_due[name] = now + self.intervals[name]
+            # Fields this poll didn't produce fall back to the last snapshot (stale)
+            for field in SOURCE_FIELDS[name]:
+                self.inputs.pop(field, None)
+            if fetched[name]:
+                self.inputs.update(fetched[name])
+                updated.append(name)
+        return updated
+
+    def rescore_if_changed(self):
+        """Rescore and write outputs only when an input value changed"""
+        if self.inputs == self.scored_inputs:
+            return False
+        snapshot = dict(self.inputs, timestamp=datetime.now().isoformat())
+        fill_from_previous(snapshot, self.previous)
+        if snapshot.get("btc_price") is None:
+            return False
+        save_data(snapshot)
+        self.previous = snapshot
+        self.result = score_snapshot(snapshot)
+        save_result(self.result)
+        if self.api is not None:
+            self.api.publish(self.result)
+        if self.write_readme:
+            update_readme(self.result)
+        self.scored_inputs = dict(self.inputs)
+        print(f"✅ Rescored: {self.result['composite_score']:.1f}/100 "
+              f"({self.result['alert_color']} {self.result['alert_level']})")
+        return True
+
+    def step(self):
+        metrics.reset()
+        updated = self.poll(time.monotonic())
+        if updated:
+            print(f"🔄 Updated: {', '.join(updated)}")
+            self.rescore_if_changed()
+            metrics.emit(verbose=False)
+
+    def stop(self, *_):
+        self.running = False
+
+    def run(self):
+        print("=" * 70)
+        print("🛰️ TRACKER DAEMON - " + ", ".join(
+            f"{name} every {seconds}s" for name, seconds in self.intervals.items()))
+        print("=" * 70)
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        try:
+            while self.running:
+                self.step()
+                wake = min(self.next_due.values())
+                while self.running and time.monotonic() < wake:
+                    time.sleep(min(1.0, max(0.0, wake - time.monotonic())))
+        finally:
+            self.engine.close()
+            if self.api is not None:
+                self.api.stop()
+            print("👋 Daemon stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the tracker as a resident daemon")
+    parser.add_argument("--coingecko", type=int, default=POLL_INTERVALS["CoinGecko"],
+                        help="CoinGecko poll interval in seconds")
+    parser.add_argument("--blockchain", type=int, default=POLL_INTERVALS["Blockchain.com"],
+                        help="Blockchain.com poll interval in seconds")
+    parser.add_argument("--spx", type=int, default=POLL_INTERVALS["SPX"],
+                        help="SPX poll interval in seconds")
+    parser.add_argument("--no-readme", action="store_true", help="don't rewrite README.md")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="also serve the read-only HTTP API")
+    args = parser.parse_args()
+
+    TrackerDaemon(
+        intervals={"CoinGecko": args.coingecko, "Blockchain.com": args.blockchain, "SPX": args.spx},
+        write_readme=not args.no_readme,
+        serve=args.serve,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
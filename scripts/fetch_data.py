@@ -1,227 +1,326 @@
 #!/usr/bin/env python3
 """
 FREE Smart Money Tracker - No Paid APIs Required
-Uses: Blockchain.com (FREE), CoinGecko (FREE), Yahoo Finance (FREE)
+Uses: Blockchain.com (FREE), CoinGecko (FREE), Yahoo Finance chart API (FREE)
+
+Failures are isolated per metric. Any field a run could not fetch is
+carried over from the previous latest_data.json (for up to STALE_MAX_AGE)
+and listed under "stale", with its original fetch time in "fetched_at".
 """
 
-import requests
 import json
 import os
-import time
-from datetime import datetime, timedelta
-from statistics import mean
+from contextlib import contextmanager
+from datetime import datetime
+
+import requests
+
+from http_engine import (FetchEngine, CircuitOpen, DeadlineExceeded,
+                         COINGECKO_API_URL, BLOCKCHAIN_API_URL)
+import ath_tracker
+import chart_stream
+import metrics
+import onchain
+import snapshot_store
+import timeseries_store
+import spx_provider
+
+# numpy (via signal_engine and onchain's computations) is imported inside
+# the fetcher that needs it so a run only pays for what it uses.
 
-try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
-except ImportError:
-    YFINANCE_AVAILABLE = False
-    print("⚠️ yfinance not available")
+LATEST_PATH = "data/latest_data.json"
 
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-    'Accept': 'application/json'
+# Blockchain.com charts behind the smart money signals (onchain.py adds more)
+CORE_CHARTS = ("trade-volume", "n-transactions", "market-cap", "hash-rate")
+
+# Snapshot fields produced by each source (used for the stale fallback)
+SOURCE_FIELDS = {
+    "CoinGecko": ("btc_price", "ath_price", "ath_date", "drawdown_from_ath",
+                  "btc_dominance", "usdt_dominance", "total2"),
+    "Blockchain.com": ("trade_volume", "transaction_count", "market_cap_trend",
+                       "hash_rate_trend", "volume_spike_alert") + onchain.FIELDS,
+    "SPX": ("spx_price", "spx_ma200", "spx_rollover"),
 }
 
-def fetch_coingecko_data():
-    """Fetch BTC price, dominance from CoinGecko (FREE)"""
+# Last-known-good values older than this (seconds) are dropped, not reused
+STALE_MAX_AGE = float(os.environ.get("STALE_MAX_AGE", str(7 * 86400)))
+
+@contextmanager
+def isolated(label):
+    """A failure inside the block costs this metric only"""
     try:
-        print("🔄 Fetching CoinGecko data...")
-        
-        url = "https://api.coingecko.com/api/v3/simple/price"
-        params = {
-            "ids": "bitcoin,tether",
-            "vs_currencies": "usd",
-            "include_market_cap": "true"
-        }
-        
-        response = requests.get(url, params=params, headers=HEADERS, timeout=15)
-        response.raise_for_status()
-        price_data = response.json()
-        
-        btc_price = price_data["bitcoin"]["usd"]
-        btc_market_cap = price_data["bitcoin"]["usd_market_cap"]
-        usdt_market_cap = price_data.get("tether", {}).get("usd_market_cap", 120000000000)
-        
-        time.sleep(1)
-        
-        # Global data
-        global_url = "https://api.coingecko.com/api/v3/global"
-        global_response = requests.get(global_url, headers=HEADERS, timeout=15)
-        global_response.raise_for_status()
-        global_data = global_response.json()["data"]
-        
-        total_market_cap = global_data["total_market_cap"]["usd"]
-        btc_dominance = global_data["market_cap_percentage"]["btc"]
-        usdt_dominance = (usdt_market_cap / total_market_cap) * 100
-        total2 = total_market_cap - btc_market_cap
-        
-        print(f"✅ CoinGecko: BTC ${btc_price:,.0f} | Dom {btc_dominance:.1f}%")
-        
-        return {
-            "btc_price": btc_price,
-            "btc_dominance": btc_dominance,
-            "usdt_dominance": usdt_dominance,
-            "total2": total2
-        }
+        yield
     except Exception as e:
-        print(f"❌ CoinGecko failed: {e}")
-        return None
+        print(f"      ❌ {label} failed: {type(e).__name__}: {e}")
+        metrics.current().count(f"metric_failed.{label}")
 
-def fetch_blockchain_smart_money():
-    """Fetch FREE smart money proxies from Blockchain.com"""
+def load_previous(path=LATEST_PATH):
+    """The last saved snapshot, or {} if there is none"""
     try:
-        print("🔄 Fetching FREE smart money data (Blockchain.com)...")
-        
-        results = {}
-        
-        # 1. Trade Volume (proxy for institutional activity)
-        print("   📊 Trade Volume...")
-        vol_url = "https://api.blockchain.info/charts/trade-volume"
-        vol_params = {"timespan": "90days", "format": "json", "sampled": "false"}
-        vol_response = requests.get(vol_url, params=vol_params, timeout=15)
-        
-        if vol_response.status_code == 200:
-            vol_data = vol_response.json()
-            if vol_data.get("values") and len(vol_data["values"]) > 0:
-                recent_vol = [v["y"] for v in vol_data["values"][-7:]]  # Last 7 days
-                baseline_vol = [v["y"] for v in vol_data["values"][-30:-7]]  # Previous 23 days
-                
-                current_vol = mean(recent_vol)
-                baseline_vol_avg = mean(baseline_vol) if baseline_vol else current_vol
-                
-                vol_spike = current_vol > (baseline_vol_avg * 1.5)  # 50% above baseline
-                
-                results["trade_volume"] = {
-                    "current": current_vol,
-                    "baseline": baseline_vol_avg,
-                    "spike": vol_spike
-                }
-                print(f"      ✅ Current: ${current_vol/1e9:.2f}B | Baseline: ${baseline_vol_avg/1e9:.2f}B")
-        
-        time.sleep(1)
-        
-        # 2. Transaction Count (network activity)
-        print("   📈 Transaction Count...")
-        tx_url = "https://api.blockchain.info/charts/n-transactions"
-        tx_params = {"timespan": "90days", "format": "json", "sampled": "false"}
-        tx_response = requests.get(tx_url, params=tx_params, timeout=15)
-        
-        if tx_response.status_code == 200:
-            tx_data = tx_response.json()
-            if tx_data.get("values") and len(tx_data["values"]) > 0:
-                recent_tx = [v["y"] for v in tx_data["values"][-7:]]
-                baseline_tx = [v["y"] for v in tx_data["values"][-30:-7]]
-                
-                current_tx = mean(recent_tx)
-                baseline_tx_avg = mean(baseline_tx) if baseline_tx else current_tx
-                
-                tx_elevated = current_tx > (baseline_tx_avg * 1.3)
-                
-                results["transaction_count"] = {
-                    "current": current_tx,
-                    "baseline": baseline_tx_avg,
-                    "elevated": tx_elevated
-                }
-                print(f"      ✅ Current: {current_tx:,.0f}/day | Baseline: {baseline_tx_avg:,.0f}/day")
-        
-        time.sleep(1)
-        
-        # 3. Market Cap Changes (smart money entering/exiting)
-        print("   💰 Market Cap Trend...")
-        cap_url = "https://api.blockchain.info/charts/market-cap"
-        cap_params = {"timespan": "90days", "format": "json", "sampled": "false"}
-        cap_response = requests.get(cap_url, params=cap_params, timeout=15)
-        
-        if cap_response.status_code == 200:
-            cap_data = cap_response.json()
-            if cap_data.get("values") and len(cap_data["values"]) > 30:
-                recent_cap = cap_data["values"][-1]["y"]
-                month_ago_cap = cap_data["values"][-30]["y"]
-                
-                cap_change_pct = ((recent_cap - month_ago_cap) / month_ago_cap) * 100
-                cap_declining = cap_change_pct < -5  # Down more than 5%
-                
-                results["market_cap_trend"] = {
-                    "current": recent_cap,
-                    "month_ago": month_ago_cap,
-                    "change_pct": cap_change_pct,
-                    "declining": cap_declining
-                }
-                print(f"      ✅ 30-day change: {cap_change_pct:+.1f}%")
-        
-        time.sleep(1)
-        
-        # 4. Hash Rate (miner confidence)
-        print("   ⛏️  Hash Rate...")
-        hash_url = "https://api.blockchain.info/charts/hash-rate"
-        hash_params = {"timespan": "90days", "format": "json", "sampled": "false"}
-        hash_response = requests.get(hash_url, params=hash_params, timeout=15)
-        
-        if hash_response.status_code == 200:
-            hash_data = hash_response.json()
-            if hash_data.get("values") and len(hash_data["values"]) > 30:
-                recent_hash = hash_data["values"][-1]["y"]
-                month_ago_hash = hash_data["values"][-30]["y"]
-                
-                hash_change_pct = ((recent_hash - month_ago_hash) / month_ago_hash) * 100
-                hash_declining = hash_change_pct < -10  # Down more than 10%
-                
-                results["hash_rate_trend"] = {
-                    "current": recent_hash,
-                    "change_pct": hash_change_pct,
-                    "declining": hash_declining
-                }
-                print(f"      ✅ 30-day change: {hash_change_pct:+.1f}%")
-        
-        # 5. Exchange Trade Volume Spike Detection
-        print("   🚨 Volume Spike Analysis...")
-        if results.get("trade_volume"):
-            vol_spike_detected = results["trade_volume"]["spike"]
-            results["volume_spike_alert"] = vol_spike_detected
-            print(f"      {'🔴 SPIKE DETECTED' if vol_spike_detected else '🟢 Normal'}")
-        
-        print(f"✅ FREE Smart Money Data: {len(results)} metrics fetched")
-        
-        return results
-        
-    except Exception as e:
-        print(f"❌ Blockchain.com failed: {e}")
-        import traceback
-        traceback.print_exc()
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
         return {}
 
-def fetch_spx_data():
-    """Fetch S&P 500 data"""
-    if not YFINANCE_AVAILABLE:
-        return {"spx_price": None, "spx_rollover": None}
+def fill_from_previous(combined, previous, now=None):
+    """
+    Carry last-known-good values into `combined` for every source field
+    this run could not fetch; returns the list of stale fields.
+    """
+    now = datetime.now() if now is None else now
+    previous_fetched = previous.get("fetched_at", {})
+    fetched_at, stale = {}, []
+    for fields in SOURCE_FIELDS.values():
+        for field in fields:
+            if combined.get(field) is not None:
+                fetched_at[field] = combined["timestamp"]
+                continue
+            when = previous_fetched.get(field, previous.get("timestamp"))
+            if previous.get(field) is None or when is None:
+                continue
+            if (now - datetime.fromisoformat(when)).total_seconds() > STALE_MAX_AGE:
+                continue
+            combined[field] = previous[field]
+            fetched_at[field] = when
+            stale.append(field)
+    combined["fetched_at"] = fetched_at
+    combined["stale"] = stale
+    return stale
+
+@metrics.timed("fetch.coingecko")
+def fetch_coingecko_data(engine=None, tracker=None):
+    """Fetch BTC price, dominance from CoinGecko (FREE)"""
+    engine = engine or FetchEngine()
+    tracker = tracker or ath_tracker.AthTracker()
+    print("🔄 Fetching CoinGecko data...")
+    
+    params = {
+        "ids": "bitcoin,tether",
+        "vs_currencies": "usd",
+        "include_market_cap": "true"
+    }
     
+    # Price and global data in parallel (rate limiter spaces them if needed);
+    # either one failing only costs the fields derived from it
+    responses = engine.run({
+        "CoinGecko price": lambda: engine.get_json(f"{COINGECKO_API_URL}/simple/price", params=params),
+        "CoinGecko global": lambda: engine.get_json(f"{COINGECKO_API_URL}/global"),
+    })
+    price_data = responses["CoinGecko price"]
+    global_data = (responses["CoinGecko global"] or {}).get("data")
+    if price_data is None and global_data is None:
+        print("❌ CoinGecko failed: no response")
+        return None
+    results = {}
+    
+    with isolated("btc_price"):
+        if price_data is None:
+            raise RuntimeError("no price response")
+        btc_price = price_data["bitcoin"]["usd"]
+        # Running ATH: O(1) compare against the persisted high; the close is
+        # stored too, so a rebuilt state backfills from real history
+        ath = tracker.record("bitcoin", btc_price)
+        if tracker.save():
+            print(f"   🏔️ ATH updated: ${ath['ath_price']:,.0f} ({ath['ath_date']})")
+        results.update(btc_price=btc_price, **ath)
+        print(f"✅ CoinGecko: BTC ${btc_price:,.0f} | {ath['drawdown_from_ath']:.1f}% below ATH")
+    
+    with isolated("btc_dominance"):
+        if global_data is None:
+            raise RuntimeError("no global response")
+        results["btc_dominance"] = global_data["market_cap_percentage"]["btc"]
+        print(f"✅ CoinGecko: Dom {results['btc_dominance']:.1f}%")
+    
+    with isolated("usdt_dominance / total2"):
+        if price_data is None or global_data is None:
+            raise RuntimeError("needs both price and global responses")
+        total_market_cap = global_data["total_market_cap"]["usd"]
+        usdt_market_cap = price_data.get("tether", {}).get("usd_market_cap", 120000000000)
+        results["usdt_dominance"] = (usdt_market_cap / total_market_cap) * 100
+        results["total2"] = total_market_cap - price_data["bitcoin"]["usd_market_cap"]
+    
+    return results or None
+
+@metrics.timed("fetch.charts")  # summed over concurrent charts
+def fetch_chart(engine, chart, timespan="90days"):
+    """
+    Stream one Blockchain.com chart into compact (timestamps, values)
+    arrays without building per-point dicts; None if it can't be fetched
+    """
+    url = f"{BLOCKCHAIN_API_URL}/charts/{chart}"
+    params = {"timespan": timespan, "format": "json", "sampled": "false"}
+    try:
+        return chart_stream.parse_chart_stream(engine.stream(url, params=params))
+    except requests.HTTPError as e:
+        print(f"      ⚠️ {chart}: HTTP {e.response.status_code}")
+    except ValueError as e:
+        # The body was already written through to the cache as it streamed
+        if engine.cache is not None:
+            engine.cache.discard(url, params)
+        print(f"      ⚠️ {chart}: {e}")
+    except (requests.RequestException, CircuitOpen, DeadlineExceeded) as e:
+        print(f"      ⚠️ {chart}: {e}")
+    return None
+
+def sync_chart(engine, chart, bootstrap=None):
+    """
+    Pull only the points newer than the local store, merge them in and
+    return the full stored series; None if the chart could not be fetched
+    (the run then falls back to the last good value, flagged stale).
+    `bootstrap` overrides the first-sync timespan for long-window charts.
+    """
+    timespan = timeseries_store.incremental_timespan(chart, bootstrap=bootstrap)
+    fetched = fetch_chart(engine, chart, timespan)
+    if fetched is None:
+        return None
+    added = timeseries_store.append_points(chart, zip(*fetched))
+    print(f"      💾 {chart}: +{added} points ({timespan})")
+    return timeseries_store.read_series(chart)[1]
+
+@metrics.timed("fetch.blockchain")
+def fetch_blockchain_smart_money(engine=None):
+    """Fetch FREE smart money proxies from Blockchain.com"""
+    engine = engine or FetchEngine()
+    import signal_engine
+    
+    print("🔄 Fetching FREE smart money data (Blockchain.com)...")
+    
+    results = {}
+    
+    # The core charts and the on-chain set in one concurrent sweep,
+    # incremental against the local store; every window comes from
+    # stored history
+    sweep = dict.fromkeys(CORE_CHARTS + onchain.ONCHAIN_CHARTS)
+    charts = engine.run({
+        chart: (lambda c=chart: sync_chart(engine, c, onchain.BOOTSTRAP_TIMESPANS.get(c)))
+        for chart in sweep
+    })
+    series = {k: v for k, v in charts.items() if v and k in CORE_CHARTS}
+    
+    # Every rolling statistic for every metric, over all stored days. If the
+    # batched pass fails, retry per chart so one bad series costs one metric.
+    history = {}
+    with metrics.current().stage("compute.signal_engine"):
+        try:
+            history = signal_engine.compute_history(series)
+        except Exception as e:
+            print(f"   ⚠️ Batched signal history failed ({e}), computing per chart")
+            for chart, values in series.items():
+                with isolated(chart):
+                    history.update(signal_engine.compute_history({chart: values}))
+    
+    # 1. Trade Volume (proxy for institutional activity)
+    print("   📊 Trade Volume...")
+    with isolated("trade_volume"):
+        vol = signal_engine.latest(history, "trade-volume")
+        if vol:
+            current_vol = vol["recent_mean"]  # Last 7 days
+            baseline_vol_avg = vol["baseline_mean"] or current_vol  # Previous 23 days
+            
+            results["trade_volume"] = {
+                "current": current_vol,
+                "baseline": baseline_vol_avg,
+                "zscore": vol["zscore"],
+                "spike": vol["flag"]  # 50% above baseline
+            }
+            print(f"      ✅ Current: ${current_vol/1e9:.2f}B | Baseline: ${baseline_vol_avg/1e9:.2f}B")
+    
+    # 2. Transaction Count (network activity)
+    print("   📈 Transaction Count...")
+    with isolated("transaction_count"):
+        tx = signal_engine.latest(history, "n-transactions")
+        if tx:
+            current_tx = tx["recent_mean"]
+            baseline_tx_avg = tx["baseline_mean"] or current_tx
+            
+            results["transaction_count"] = {
+                "current": current_tx,
+                "baseline": baseline_tx_avg,
+                "ratio": current_tx / baseline_tx_avg if baseline_tx_avg else None,
+                "elevated": tx["flag"]
+            }
+            print(f"      ✅ Current: {current_tx:,.0f}/day | Baseline: {baseline_tx_avg:,.0f}/day")
+    
+    # 3. Market Cap Changes (smart money entering/exiting)
+    print("   💰 Market Cap Trend...")
+    with isolated("market_cap_trend"):
+        cap = signal_engine.latest(history, "market-cap")
+        if cap and cap["change_pct"] is not None:
+            results["market_cap_trend"] = {
+                "current": cap["value"],
+                "month_ago": cap["month_ago"],
+                "change_pct": cap["change_pct"],
+                "declining": cap["flag"]  # Down more than 5%
+            }
+            print(f"      ✅ 30-day change: {cap['change_pct']:+.1f}%")
+    
+    # 4. Hash Rate (miner confidence)
+    print("   ⛏️  Hash Rate...")
+    with isolated("hash_rate_trend"):
+        hr = signal_engine.latest(history, "hash-rate")
+        if hr and hr["change_pct"] is not None:
+            results["hash_rate_trend"] = {
+                "current": hr["value"],
+                "change_pct": hr["change_pct"],
+                "declining": hr["flag"]  # Down more than 10%
+            }
+            print(f"      ✅ 30-day change: {hr['change_pct']:+.1f}%")
+    
+    # 5. On-chain set (Puell multiple, hash/difficulty ribbons, NVT, mempool)
+    print("   🧱 On-chain signals...")
+    with isolated("onchain"), metrics.current().stage("compute.onchain"):
+        synced = [chart for chart in onchain.ONCHAIN_CHARTS + onchain.SHARED_CHARTS
+                  if charts.get(chart) is not None]
+        derived = onchain.summarize(onchain.load_daily(synced))
+        results.update(derived)
+        for field, stats in derived.items():
+            shown = {k: v for k, v in stats.items() if k in ("value", "ratio", "spread_pct")}
+            print(f"      ✅ {field}: " + ", ".join(f"{k} {v:.2f}" for k, v in shown.items()))
+    
+    # 6. Exchange Trade Volume Spike Detection
+    print("   🚨 Volume Spike Analysis...")
+    if results.get("trade_volume"):
+        vol_spike_detected = results["trade_volume"]["spike"]
+        results["volume_spike_alert"] = vol_spike_detected
+        print(f"      {'🔴 SPIKE DETECTED' if vol_spike_detected else '🟢 Normal'}")
+    
+    print(f"✅ FREE Smart Money Data: {len(results)} metrics fetched")
+    
+    return results
+
+@metrics.timed("fetch.spx")
+def fetch_spx_data(engine=None, provider=None):
+    """Fetch S&P 500 close and 200-day MA (incremental, no pandas)"""
+    engine = engine or FetchEngine()
     try:
         print("🔄 Fetching SPX data...")
-        spx = yf.Ticker("^GSPC")
-        hist = spx.history(period="200d")
+        provider = provider or spx_provider.SPXProvider(spx_provider.default_source(engine))
+        spx = provider.update()
         
-        if len(hist) == 0:
+        if spx["spx_price"] is None:
             return {"spx_price": None, "spx_rollover": None}
         
-        current_price = hist['Close'].iloc[-1]
+        if spx["spx_ma200"] is None:
+            print(f"⚠️ SPX: only {len(provider.ma.values)} closes stored, 200-day MA unavailable")
+        print(f"✅ SPX: ${spx['spx_price']:,.0f}")
         
-        if len(hist) >= 200:
-            ma200 = hist['Close'].rolling(window=200).mean().iloc[-1]
-            spx_rollover = current_price < ma200
-        else:
-            spx_rollover = False
-        
-        print(f"✅ SPX: ${current_price:,.0f}")
-        
-        return {
-            "spx_price": float(current_price),
-            "spx_rollover": bool(spx_rollover)
-        }
+        return spx
     except Exception as e:
         print(f"❌ SPX failed: {e}")
         return {"spx_price": None, "spx_rollover": None}
 
+@metrics.timed("fetch.save")
+def save_data(combined_data, output_path=LATEST_PATH):
+    """Write the combined snapshot for calculate_score.py"""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    with open(output_path, "w") as f:
+        json.dump(combined_data, f, indent=2)
+    
+    # Every run is kept in the content-addressed snapshot store
+    snapshot_store.put("latest_data", combined_data)
+    return output_path
+
 def main():
     print("=" * 70)
     print("🆓 FREE SMART MONEY TRACKER - Data Fetch")
@@ -230,50 +329,50 @@ def main():
     
     combined_data = {"timestamp": datetime.now().isoformat()}
     
-    # CoinGecko (required)
-    print("1️⃣ COINGECKO DATA")
-    print("-" * 70)
-    coingecko = fetch_coingecko_data()
-    if coingecko:
-        combined_data.update(coingecko)
-    else:
-        print("❌ CRITICAL: CoinGecko unavailable")
-        exit(1)
+    # All sources run concurrently over one pooled session; wall-clock is
+    # bounded by the slowest source (and the engine deadline), not the sum.
+    with FetchEngine() as engine:
+        sources = engine.run({
+            "CoinGecko": lambda: fetch_coingecko_data(engine),
+            "Blockchain.com": lambda: fetch_blockchain_smart_money(engine),
+            "SPX": lambda: fetch_spx_data(engine),
+        })
     
     print()
+    if engine.cache is not None:
+        engine.cache.report()
+    for name, value in sources.items():
+        if not value:
+            metrics.current().count(f"source_failed.{name}")
     
-    # Blockchain.com Smart Money (FREE)
-    print("2️⃣ BLOCKCHAIN.COM SMART MONEY DATA (FREE)")
-    print("-" * 70)
-    blockchain_data = fetch_blockchain_smart_money()
-    combined_data.update(blockchain_data)
+    for name in ("CoinGecko", "Blockchain.com", "SPX"):
+        combined_data.update(sources[name] or {})
     
-    print()
+    # Whatever failed degrades to the last known good value (flagged stale)
+    stale = fill_from_previous(combined_data, load_previous())
+    if stale:
+        print(f"⚠️ Using last known values (stale): {', '.join(stale)}")
     
-    # SPX
-    print("3️⃣ SPX MARKET DATA")
-    print("-" * 70)
-    spx_data = fetch_spx_data()
-    combined_data.update(spx_data)
+    # A BTC price (fresh or stale) is required
+    if combined_data.get("btc_price") is None:
+        print("❌ CRITICAL: CoinGecko unavailable and no previous snapshot")
+        exit(1)
     
-    print()
     print("=" * 70)
     
-    # Save
-    output_path = "data/latest_data.json"
-    os.makedirs("data", exist_ok=True)
-    
-    with open(output_path, "w") as f:
-        json.dump(combined_data, f, indent=2)
+    output_path = save_data(combined_data)
     
     print(f"✅ Data saved to {output_path}")
     print()
     print("📊 SUMMARY:")
-    print(f"   BTC Price: ${combined_data.get('btc_price', 'N/A'):,.0f}")
-    print(f"   BTC Dominance: {combined_data.get('btc_dominance', 'N/A'):.1f}%")
+    print(f"   BTC Price: ${combined_data['btc_price']:,.0f}")
+    dominance = combined_data.get('btc_dominance')
+    print(f"   BTC Dominance: {'N/A' if dominance is None else f'{dominance:.1f}%'}")
     print(f"   Smart Money Tracking: ✅ FREE EDITION")
     print(f"   Volume Spike: {'🔴 YES' if combined_data.get('volume_spike_alert') else '🟢 NO'}")
     print("=" * 70)
+    
+    return combined_data
 
 if __name__ == "__main__":
     main()
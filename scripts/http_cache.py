@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP response cache - per-endpoint TTL, ETag/Last-Modified revalidation, LRU bound
+
+Bodies are stored as files under the cache directory with a small JSON
+index of validators and access times. A fresh entry is served without
+touching the network; a stale one is revalidated with If-None-Match /
+If-Modified-Since when the server gave us validators, and a 304 reuses
+the stored body.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", os.path.join(".cache", "http"))
+CACHE_MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# TTL in seconds by URL substring, first match wins
+ENDPOINT_TTLS = [
+    ("/simple/price", 60),
+    ("/coins/markets", 60),
+    ("/global", 300),
+    ("/charts/", 3600),
+    ("/finance/chart/", 900),
+]
+DEFAULT_TTL = 0
+
+
+class ResponseCache:
+    """Shared, thread-safe response cache used by FetchEngine.get()"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, ttls=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = ENDPOINT_TTLS if ttls is None else ttls
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(cache_dir, "index.json")
+        try:
+            with open(self._index_path, "r") as f:
+                self.index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.index = {}
+
+    def ttl_for(self, url):
+        for pattern, ttl in self.ttls:
+            if pattern in url:
+                return ttl
+        return DEFAULT_TTL
+
+    @staticmethod
+    def key_for(url, params=None):
+        full = url + ("?" + urlencode(sorted((params or {}).items())) if params else "")
+        return hashlib.sha1(full.encode()).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, key + ".body")
+
+    def _read_body(self, key):
+        try:
+            with open(self._body_path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def lookup(self, url, params=None):
+        """
+        Returns (key, response_or_None, conditional_headers).
+        A response is returned only for fresh entries.
+        """
+        key = self.key_for(url, params)
+        with self._lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return key, None, {}
+            entry["last_access"] = time.time()
+            if time.time() - entry["stored_at"] < self.ttl_for(url):
+                body = self._read_body(key)
+                if body is not None:
+                    self.stats["hits"] += 1
+                    return key, self._response(url, entry, body, from_cache="hit"), {}
+            conditional = {}
+            if entry.get("etag"):
+                conditional["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                conditional["If-Modified-Since"] = entry["last_modified"]
+            return key, None, conditional
+
+    def revalidated(self, key, url):
+        """Server answered 304: refresh the entry and return the stored body"""
+        with self._lock:
+            entry = self.index.get(key)
+            body = self._read_body(key) if entry else None
+            if body is None:
+                return None
+            entry["stored_at"] = entry["last_access"] = time.time()
+            self.stats["revalidated"] += 1
+            return self._response(url, entry, body, from_cache="revalidated")
+
+    def store(self, key, response):
+        """Cache a 200 response and evict least-recently-used entries over the size bound"""
+        with self._lock:
+            self.stats["misses"] += 1
+            if response.status_code != 200:
+                return
+            body = response.content
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._body_path(key), "wb") as f:
+                f.write(body)
+            self.index[key] = self._entry(response, len(body), time.time())
+            self._evict()
+
+    def discard(self, url, params=None):
+        """Drop an entry whose body turned out to be unusable"""
+        key = self.key_for(url, params)
+        with self._lock:
+            if self.index.pop(key, None) is None:
+                return
+            try:
+                os.remove(self._body_path(key))
+            except FileNotFoundError:
+                pass
+
+    def store_stream(self, key, response, chunks):
+        """Write a streamed 200 body to the cache while passing chunks through"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._body_path(key) + f".{threading.get_ident()}.part"
+        size = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+        except BaseException:
+            # Interrupted or abandoned mid-body: never cache a partial payload
+            os.remove(tmp_path)
+            raise
+        with self._lock:
+            self.stats["misses"] += 1
+            os.replace(tmp_path, self._body_path(key))
+            now = time.time()
+            self.index[key] = self._entry(response, size, now)
+            self._evict()
+
+    @staticmethod
+    def _entry(response, size, now):
+        return {
+            "url": response.url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type", "application/json"),
+            "size": size,
+            "stored_at": now,
+            "last_access": now,
+        }
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self.index.values())
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= self.index.pop(key)["size"]
+            try:
+                os.remove(self._body_path(key))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _response(url, entry, body, from_cache):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response._content_consumed = True
+        response.url = entry.get("url", url)
+        response.headers = CaseInsensitiveDict({"Content-Type": entry["content_type"],
+                                                "X-Cache": from_cache})
+        response.encoding = "utf-8"
+        return response
+
+    def save(self):
+        """Persist the index (bodies are already on disk)"""
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._index_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self._index_path)
+
+    def report(self):
+        stats = self.stats
+        total = sum(stats.values())
+        rate = (stats["hits"] + stats["revalidated"]) / total * 100 if total else 0
+        print(f"📦 HTTP cache: {stats['hits']} hits | {stats['revalidated']} revalidated | "
+              f"{stats['misses']} misses ({rate:.0f}% served from cache)")
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Concurrent fetch engine - pooled keep-alive sessions, per-host rate limits, run deadline
+
+Transient failures (connection errors, timeouts, 429 and 5xx) are retried
+with full-jitter exponential backoff; a 429/503 Retry-After header is
+honoured as the minimum wait. Every host has a circuit breaker: after
+BREAKER_THRESHOLD consecutive failed requests it opens and calls to that
+host fail fast for BREAKER_COOLDOWN seconds, then one trial request is
+let through (half-open) before it closes again.
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from http_cache import ResponseCache
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json'
+}
+
+# Base URLs can be pointed at a local stub server for offline runs
+COINGECKO_API_URL = os.environ.get("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
+BLOCKCHAIN_API_URL = os.environ.get("BLOCKCHAIN_API_URL", "https://api.blockchain.info")
+
+# Set HTTP_CACHE=0 to bypass the persistent response cache
+HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE", "1") != "0"
+
+# Whole-run deadline in seconds
+FETCH_DEADLINE = float(os.environ.get("FETCH_DEADLINE", "60"))
+
+# Retries per request after the first attempt, and the backoff envelope (seconds)
+FETCH_RETRIES = int(os.environ.get("FETCH_RETRIES", "3"))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Consecutive failed requests before a host's breaker opens, and how long it stays open
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "300"))
+
+# Per-host token buckets: (requests per second, burst size)
+# Hosts not listed here are not rate limited.
+RATE_LIMITS = {
+    "api.coingecko.com": (0.5, 2),
+    # One sweep per run: 4 core + 4 on-chain charts (fetch_data.CORE_CHARTS,
+    # onchain.ONCHAIN_CHARTS) go out at once; the bucket refills long before the next run
+    "api.blockchain.info": (1.0, 8),
+    "query1.finance.yahoo.com": (1.0, 2),
+}
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request would start after the run deadline"""
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a host whose circuit breaker is open"""
+
+
+class HostRateLimiter:
+    """Token bucket per host - replaces fixed time.sleep() between requests"""
+
+    def __init__(self, limits=None):
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, host):
+        """Take a token for host and return how long the caller must wait"""
+        if host not in self.limits:
+            return 0.0
+        rate, burst = self.limits[host]
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - last) * rate)
+            tokens -= 1.0
+            self._buckets[host] = (tokens, now)
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+    def acquire(self, host, deadline=None):
+        delay = self.reserve(host)
+        if delay <= 0:
+            return
+        if deadline is not None and time.monotonic() + delay > deadline:
+            raise DeadlineExceeded(f"rate limit wait for {host} exceeds deadline")
+        time.sleep(delay)
+
+
+class CircuitBreaker:
+    """Per-host consecutive-failure breaker: closed -> open -> half-open -> closed"""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._hosts = {}  # host -> [consecutive failures, opened at, trial in flight]
+        self._lock = threading.Lock()
+
+    def allow(self, host):
+        """Raise CircuitOpen unless a request to host may proceed"""
+        with self._lock:
+            failures, opened, trial = self._hosts.get(host, (0, None, False))
+            if opened is None:
+                return
+            if time.monotonic() - opened < self.cooldown or trial:
+                raise CircuitOpen(f"circuit open for {host}")
+            self._hosts[host] = [failures, opened, True]  # half-open: one trial
+
+    def success(self, host):
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def release(self, host):
+        """Give back a half-open trial that never reached the host"""
+        with self._lock:
+            if host in self._hosts:
+                self._hosts[host][2] = False
+
+    def failure(self, host):
+        with self._lock:
+            failures, opened, _ = self._hosts.get(host, (0, None, False))
+            failures += 1
+            if opened is not None or failures >= self.threshold:
+                if opened is None:
+                    print(f"🔌 Circuit opened for {host} ({failures} consecutive failures)")
+                opened = time.monotonic()
+            self._hosts[host] = [failures, opened, False]
+
+    def state(self, host):
+        failures, opened, trial = self._hosts.get(host, (0, None, False))
+        if opened is None:
+            return "closed"
+        return "half-open" if trial or time.monotonic() - opened >= self.cooldown else "open"
+
+
+def retry_after(response):
+    """Seconds requested by a Retry-After header (delta or HTTP date), else None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Full jitter: uniform over [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class FetchEngine:
+    """Shared HTTP session + thread pool runner for all data sources"""
+
+    def __init__(self, deadline=None, rate_limits=None, pool_size=10, cache=None, run_metrics=None,
+                 retries=None, breaker=None):
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.limiter = HostRateLimiter(rate_limits)
+        self.retries = FETCH_RETRIES if retries is None else retries
+        self.breaker = breaker or CircuitBreaker()
+        self.budget = FETCH_DEADLINE if deadline is None else deadline
+        self.deadline = time.monotonic() + self.budget
+        if cache is None and HTTP_CACHE_ENABLED:
+            cache = ResponseCache()
+        self.cache = cache or None
+        # None = report to whichever run is current (the daemon resets it per step)
+        self.run_metrics = run_metrics
+
+    def reset_deadline(self, seconds=None):
+        """Start a new run budget (used by long-lived callers like the daemon)"""
+        if seconds is not None:
+            self.budget = seconds
+        self.deadline = time.monotonic() + self.budget
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def _record(self, url, status, start, nbytes=0, cache=None, retries=0):
+        collector = self.run_metrics or metrics.current()
+        collector.request(url, status, time.perf_counter() - start, nbytes, retries, cache)
+
+    def _attempt(self, host, url, params, headers, timeout, stream):
+        self.limiter.acquire(host, self.deadline)
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"deadline passed before {url}")
+        return self.session.get(url, params=params, headers=headers,
+                                timeout=min(timeout, remaining), stream=stream)
+
+    def _send(self, url, params, headers, timeout, stream=False):
+        """
+        One logical request with retries; returns (response, retries).
+        Exceptions carry the retry count as `.retries`.
+        """
+        host = urlsplit(url).netloc
+        self.breaker.allow(host)
+        attempt = 0
+        while True:
+            try:
+                response = self._attempt(host, url, params, headers, timeout, stream)
+                error = None
+            except requests.RequestException as e:
+                response, error = None, e
+            except DeadlineExceeded as e:
+                self.breaker.release(host)
+                e.retries = attempt
+                raise
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                self.breaker.success(host)
+                return response, attempt
+
+            delay = backoff_delay(attempt)
+            if response is not None:
+                delay = max(delay, retry_after(response) or 0.0)
+            if attempt >= self.retries or time.monotonic() + delay >= self.deadline:
+                self.breaker.failure(host)
+                if response is not None:
+                    return response, attempt  # caller sees the final 429/5xx
+                error.retries = attempt
+                raise error
+
+            reason = f"HTTP {response.status_code}" if response is not None else type(error).__name__
+            print(f"      🔁 {host}: {reason}, retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _refetch(self, response, url, params, headers, timeout, start, retries, stream=False):
+        """
+        A 304 arrived but the cached body is gone (evicted or deleted after
+        lookup): drop the entry and ask once more without conditional
+        headers. Returns (response, retries so far).
+        """
+        response.close()
+        self.cache.discard(url, params)
+        try:
+            response, more = self._send(url, params, headers, timeout, stream=stream)
+        except Exception as e:
+            self._record(url, None, start, cache="miss", retries=retries + 1 + getattr(e, "retries", 0))
+            raise
+        return response, retries + 1 + more
+
+    def get(self, url, params=None, headers=None, timeout=15):
+        """
+        GET through the pooled session, honouring the response cache,
+        rate limits and the run deadline
+        """
+        start = time.perf_counter()
+        outcome = None
+        plain_headers = headers
+        if self.cache is not None:
+            key, cached, conditional = self.cache.lookup(url, params)
+            if cached is not None:
+                self._record(url, cached.status_code, start, len(cached.content), "hit")
+                return cached
+            headers = dict(headers or {}, **conditional)
+            outcome = "miss"
+
+        try:
+            response, retries = self._send(url, params, headers, timeout)
+        except Exception as e:
+            self._record(url, None, start, cache=outcome, retries=getattr(e, "retries", 0))
+            raise
+
+        if self.cache is not None:
+            if response.status_code == 304:
+                cached = self.cache.revalidated(key, url)
+                if cached is not None:
+                    self._record(url, 304, start, len(cached.content), "revalidated", retries)
+                    return cached
+                response, retries = self._refetch(response, url, params, plain_headers, timeout, start, retries)
+            self.cache.store(key, response)
+        self._record(url, response.status_code, start, len(response.content), outcome, retries)
+        return response
+
+    def stream(self, url, params=None, chunk_size=65536, timeout=15):
+        """
+        Yield the response body in chunks without holding it in memory.
+        Misses are written through to the cache as they stream; hits are
+        replayed from the cached body. Raises HTTPError on non-2xx.
+        """
+        start = time.perf_counter()
+        headers = outcome = None
+        if self.cache is not None:
+            key, cached, conditional = self.cache.lookup(url, params)
+            if cached is not None:
+                self._record(url, cached.status_code, start, len(cached.content), "hit")
+                yield from cached.iter_content(chunk_size)
+                return
+            headers = conditional
+            outcome = "miss"
+
+        try:
+            response, retries = self._send(url, params, headers, timeout, stream=True)
+        except Exception as e:
+            self._record(url, None, start, cache=outcome, retries=getattr(e, "retries", 0))
+            raise
+        if self.cache is not None and response.status_code == 304:
+            cached = self.cache.revalidated(key, url)
+            if cached is None:
+                response, retries = self._refetch(response, url, params, None, timeout, start, retries, stream=True)
+        status, nbytes = response.status_code, 0
+        try:
+            with response:
+                if self.cache is not None and response.status_code == 304 and cached is not None:
+                    outcome, nbytes = "revalidated", len(cached.content)
+                    yield from cached.iter_content(chunk_size)
+                    return
+                response.raise_for_status()
+                chunks = response.iter_content(chunk_size)
+                if self.cache is not None:
+                    chunks = self.cache.store_stream(key, response, chunks)
+                for chunk in chunks:
+                    nbytes += len(chunk)
+                    yield chunk
+        finally:
+            # Latency of a streamed request includes reading the body
+            self._record(url, status, start, nbytes, outcome, retries)
+
+    def get_json(self, url, params=None, timeout=15):
+        response = self.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def run(self, tasks):
+        """
+        Run {name: callable} concurrently and return {name: result}.
+        Tasks that raise or miss the deadline map to None.
+        """
+        results = {name: None for name in tasks}
+        if not tasks:
+            return results
+        executor = ThreadPoolExecutor(max_workers=len(tasks))
+        futures = {executor.submit(fn): name for name, fn in tasks.items()}
+        done, pending = wait(futures, timeout=max(self.remaining(), 0))
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"❌ {name} failed: {e}")
+        for future in pending:
+            print(f"⏱️ {futures[future]} missed the {self.budget:.0f}s deadline")
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.save()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Run instrumentation - stage timers and per-request HTTP metrics
+
+One RunMetrics collector covers a run (a pipeline invocation or one
+daemon step). Scripts time their stages with
+
+    with metrics.current().stage("score"):
+        ...
+
+(or decorate a function with @metrics.timed("name")), and FetchEngine
+reports every request (latency, payload bytes, retries, cache outcome).
+At the end of the run emit() appends one JSON record to
+.cache/metrics.jsonl (local, not committed by the workflow) and, when METRICS_TEXTFILE is set, rewrites a
+Prometheus textfile (node_exporter textfile collector format).
+
+    METRICS_PATH=.cache/metrics.jsonl   # "" disables the JSON log
+    METRICS_TEXTFILE=/var/lib/node_exporter/btc_tracker.prom
+
+Usage:
+    python scripts/metrics.py --last 10   # latency trend of recent runs
+"""
+
+import argparse
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+METRICS_PATH = os.environ.get("METRICS_PATH", os.path.join(".cache", "metrics.jsonl"))
+METRICS_TEXTFILE = os.environ.get("METRICS_TEXTFILE")
+PROMETHEUS_PREFIX = "btc_tracker"
+
+
+class RunMetrics:
+    """Thread-safe collector for one run (fetchers report from worker threads)"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.requests = []
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block; repeated stages accumulate"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def request(self, url, status, seconds, nbytes=0, retries=0, cache=None):
+        """One HTTP request; cache is None, "hit", "revalidated" or "miss" """
+        parts = urlsplit(url)
+        entry = {
+            "host": parts.netloc,
+            "path": parts.path,
+            "status": status,
+            "ms": round(seconds * 1000, 1),
+            "bytes": nbytes,
+            "retries": retries,
+            "cache": cache,
+        }
+        with self._lock:
+            self.requests.append(entry)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def by_host(self):
+        hosts = {}
+        for entry in self.requests:
+            host = hosts.setdefault(entry["host"], {
+                "requests": 0, "ms_total": 0.0, "ms_max": 0.0, "bytes": 0,
+                "retries": 0, "cache_hits": 0, "errors": 0})
+            host["requests"] += 1
+            host["ms_total"] = round(host["ms_total"] + entry["ms"], 1)
+            host["ms_max"] = max(host["ms_max"], entry["ms"])
+            host["bytes"] += entry["bytes"]
+            host["retries"] += entry["retries"]
+            host["cache_hits"] += entry["cache"] in ("hit", "revalidated")
+            host["errors"] += entry["status"] is None or entry["status"] >= 400
+        return hosts
+
+    def record(self):
+        """The run as one JSON-serialisable dict"""
+        with self._lock:
+            return {
+                "timestamp": datetime.fromtimestamp(self.started).isoformat(),
+                "duration_ms": round((time.perf_counter() - self._t0) * 1000, 1),
+                "stages_ms": {name: round(seconds * 1000, 1) for name, seconds in self.stages.items()},
+                "hosts": self.by_host(),
+                "requests": list(self.requests),
+                "counters": dict(self.counters),
+            }
+
+    def write_jsonl(self, path=METRICS_PATH, record=None):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(record or self.record(), separators=(",", ":")) + "\n")
+
+    def write_prometheus(self, path, record=None):
+        """Rewrite a textfile-collector file atomically"""
+        record = record or self.record()
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f"# TYPE {p}_run_duration_seconds gauge",
+            f"{p}_run_duration_seconds {record['duration_ms'] / 1000:.3f}",
+            f"# TYPE {p}_run_timestamp_seconds gauge",
+            f"{p}_run_timestamp_seconds {self.started:.0f}",
+            f"# TYPE {p}_stage_duration_seconds gauge",
+        ]
+        lines += [f'{p}_stage_duration_seconds{{stage="{name}"}} {ms / 1000:.3f}'
+                  for name, ms in sorted(record["stages_ms"].items())]
+        for field, metric in (("requests", "http_requests"), ("ms_total", "http_request_seconds"),
+                              ("bytes", "http_response_bytes"), ("retries", "http_retries"),
+                              ("cache_hits", "http_cache_hits"), ("errors", "http_errors")):
+            lines.append(f"# TYPE {p}_{metric} gauge")
+            for host, stats in sorted(record["hosts"].items()):
+                value = stats[field] / 1000 if field == "ms_total" else stats[field]
+                lines.append(f'{p}_{metric}{{host="{host}"}} {value:g}')
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def report(self, record=None):
+        record = record or self.record()
+        print(f"📏 Run metrics: {record['duration_ms']:.0f} ms total")
+        for name, ms in record["stages_ms"].items():
+            print(f"   {name:<28} {ms:8.1f} ms")
+        for host, stats in record["hosts"].items():
+            print(f"   {host:<28} {stats['requests']:3d} req  {stats['ms_total']:8.1f} ms  "
+                  f"{stats['bytes'] / 1024:8.1f} KB  {stats['cache_hits']} cached")
+
+
+_current = RunMetrics()
+
+
+def current():
+    """The collector for the run in progress"""
+    return _current
+
+
+def timed(name):
+    """Decorator: time every call of a function as stage `name` of the current run"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with current().stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def reset():
+    """Start a new run (e.g. each daemon step); returns the new collector"""
+    global _current
+    _current = RunMetrics()
+    return _current
+
+
+def emit(path=METRICS_PATH, textfile=METRICS_TEXTFILE, verbose=True):
+    """Write the current run's record to the JSON log (and Prometheus textfile)"""
+    record = _current.record()
+    if path:
+        _current.write_jsonl(path, record)
+    if textfile:
+        _current.write_prometheus(textfile, record)
+    if verbose:
+        _current.report(record)
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show recent run metrics")
+    parser.add_argument("--last", type=int, default=10, help="number of runs to show")
+    parser.add_argument("--path", default=METRICS_PATH)
+    args = parser.parse_args()
+
+    with open(args.path, "r") as f:
+        records = [json.loads(line) for line in f if line.strip()][-args.last:]
+    stages = sorted({name for record in records for name in record["stages_ms"]})
+    print(f"{'run':<20} {'total':>8} " + " ".join(f"{name[:14]:>14}" for name in stages))
+    for record in records:
+        cells = " ".join(f"{record['stages_ms'].get(name, 0):14.0f}" for name in stages)
+        print(f"{record['timestamp'][:19]:<20} {record['duration_ms']:8.0f} {cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Multi-asset mode - score every asset in assets.yaml in parallel
+
+1. One batched CoinGecko /coins/markets request (chunked at
+   MAX_IDS_PER_REQUEST ids) for price, market cap and all-time high,
+   plus one /global request for all assets.
+2. Each asset's daily close is kept in the local time-series store
+   (price-<id>); the first run bootstraps it from /market_chart. The
+   running ATH in data/ath_state.json starts from CoinGecko's reported
+   ATH (/market_chart only reaches back HISTORY_DAYS) and follows the
+   stored closes from there.
+3. Snapshots are scored across a process pool with the same compiled
+   signal registry as calculate_score.py. Market-wide signals (dominance,
+   USDT, TOTAL2, SPX) are shared; Blockchain.com on-chain signals only
+   exist for bitcoin and are unavailable for other assets.
+4. Outputs go to data/assets/<SYMBOL>/current_signals.json (+ a binary
+   score history per asset) and data/assets/summary.json.
+
+Usage:
+    python scripts/multi_asset.py
+    python scripts/multi_asset.py --assets ETH,SOL --workers 4
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import yaml
+
+import ath_tracker
+import onchain
+import score_history
+import timeseries_store
+from http_engine import FetchEngine, COINGECKO_API_URL
+
+ASSETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets.yaml")
+OUTPUT_DIR = os.path.join("data", "assets")
+MAX_IDS_PER_REQUEST = 250
+HISTORY_DAYS = os.environ.get("COINGECKO_HISTORY_DAYS", "365")  # free tier cap
+DAY = 86400
+
+# Fields shared by every asset's snapshot
+SHARED_FIELDS = ("btc_dominance", "usdt_dominance", "total2", "spx_price", "spx_ma200", "spx_rollover")
+# Bitcoin-only fields from latest_data.json (Blockchain.com charts)
+BTC_ONCHAIN_FIELDS = ("trade_volume", "transaction_count", "market_cap_trend",
+                      "hash_rate_trend", "volume_spike_alert") + onchain.FIELDS
+
+
+def load_assets(path=ASSETS_PATH, symbols=None):
+    with open(path, "r") as f:
+        assets = yaml.safe_load(f)["assets"]
+    if symbols:
+        wanted = {symbol.upper() for symbol in symbols}
+        assets = [asset for asset in assets if asset["symbol"].upper() in wanted]
+    return assets
+
+
+def _ath_timestamp(text):
+    try:
+        return int(datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp())
+    except (AttributeError, ValueError):
+        return None
+
+
+def fetch_prices(engine, asset_ids):
+    """
+    Batched price, market cap and ATH lookup for all ids (tether/bitcoin
+    always included). Returns ({id: quote}, global data); quotes use the
+    /simple/price field names plus ath/ath_timestamp.
+    """
+    ids = list(dict.fromkeys(list(asset_ids) + ["bitcoin", "tether"]))
+    batches = [ids[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(ids), MAX_IDS_PER_REQUEST)]
+    tasks = {
+        f"markets {n + 1}/{len(batches)}": (lambda batch=batch: engine.get_json(
+            f"{COINGECKO_API_URL}/coins/markets",
+            params={"vs_currency": "usd", "ids": ",".join(batch), "per_page": len(batch), "page": 1}))
+        for n, batch in enumerate(batches)
+    }
+    tasks["global"] = lambda: engine.get_json(f"{COINGECKO_API_URL}/global")
+    results = engine.run(tasks)
+
+    prices = {}
+    for name, payload in results.items():
+        if name == "global" or not payload:
+            continue
+        for coin in payload:
+            prices[coin["id"]] = {
+                "usd": coin.get("current_price"),
+                "usd_market_cap": coin.get("market_cap"),
+                "ath": coin.get("ath"),
+                "ath_timestamp": _ath_timestamp(coin.get("ath_date")),
+            }
+    return prices, (results["global"] or {}).get("data")
+
+
+def bootstrap_history(engine, asset_id):
+    """One-time daily price history download for a new asset"""
+    payload = engine.get_json(f"{COINGECKO_API_URL}/coins/{asset_id}/market_chart",
+                              params={"vs_currency": "usd", "days": HISTORY_DAYS, "interval": "daily"})
+    points = [(int(ms // 1000) // DAY * DAY, price) for ms, price in payload.get("prices", [])]
+    return timeseries_store.merge_points(ath_tracker.price_metric(asset_id), points)
+
+
+def shared_market_fields(prices, global_data, latest_data):
+    shared = {field: latest_data.get(field) for field in SHARED_FIELDS if field in latest_data}
+    if global_data:
+        total_market_cap = global_data["total_market_cap"]["usd"]
+        btc_market_cap = prices.get("bitcoin", {}).get("usd_market_cap")
+        usdt_market_cap = prices.get("tether", {}).get("usd_market_cap")
+        shared["btc_dominance"] = global_data["market_cap_percentage"]["btc"]
+        if usdt_market_cap:
+            shared["usdt_dominance"] = usdt_market_cap / total_market_cap * 100
+        if btc_market_cap:
+            shared["total2"] = total_market_cap - btc_market_cap
+    return shared
+
+
+def score_asset(snapshot):
+    """Process-pool worker: score one asset snapshot"""
+    from calculate_score import score_snapshot
+    result = score_snapshot(snapshot)
+    symbol = snapshot["asset"]["symbol"]
+    for signal in result["signals"]:
+        if signal["key"] == "ath":
+            # The registry's ATH row is named for BTC; label it per asset
+            signal["name"] = f"{symbol} Price vs ATH"
+    result["asset"] = snapshot["asset"]
+    result["ath_price"] = snapshot["ath_price"]
+    return result
+
+
+def write_outputs(results, output_dir=OUTPUT_DIR):
+    summary = []
+    for result in results:
+        symbol = result["asset"]["symbol"]
+        asset_dir = os.path.join(output_dir, symbol)
+        os.makedirs(asset_dir, exist_ok=True)
+        with open(os.path.join(asset_dir, "current_signals.json"), "w") as f:
+            json.dump(result, f, indent=2)
+        score_history.append(result, path=os.path.join(asset_dir, "score_history.bin"), legacy_csv=None)
+        summary.append({
+            "symbol": symbol,
+            "id": result["asset"]["id"],
+            "composite_score": result["composite_score"],
+            "alert_level": result["alert_level"],
+            "alert_color": result["alert_color"],
+            "ath_price": result["ath_price"],
+        })
+    summary.sort(key=lambda row: row["composite_score"], reverse=True)
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump({"timestamp": datetime.now().isoformat(), "assets": summary}, f, indent=2)
+    return summary
+
+
+def run(assets, workers=None, latest_path="data/latest_data.json"):
+    try:
+        with open(latest_path, "r") as f:
+            latest_data = json.load(f)
+    except FileNotFoundError:
+        latest_data = {}
+
+    with FetchEngine(deadline=300) as engine:
+        print(f"🔄 Fetching prices for {len(assets)} assets (batched)...")
+        prices, global_data = fetch_prices(engine, [asset["id"] for asset in assets])
+
+        new_assets = [asset for asset in assets
+                      if timeseries_store.last_timestamp(ath_tracker.price_metric(asset["id"])) is None]
+        if new_assets:
+            print(f"🔄 Bootstrapping price history for {len(new_assets)} new assets...")
+            engine.run({asset["symbol"]: (lambda a=asset: bootstrap_history(engine, a["id"]))
+                        for asset in new_assets})
+
+    # CoinGecko's ATH and the stored closes seed each asset, then O(1) per price
+    tracker = ath_tracker.AthTracker()
+    shared = shared_market_fields(prices, global_data, latest_data)
+    timestamp = datetime.now().isoformat()
+    snapshots = []
+    for asset in assets:
+        quote = prices.get(asset["id"])
+        if not quote or quote.get("usd") is None:
+            print(f"⚠️ {asset['symbol']}: no price, skipped")
+            continue
+        snapshot = dict(shared, asset=asset, timestamp=timestamp, price=quote["usd"],
+                        market_cap=quote.get("usd_market_cap"))
+        if quote.get("ath"):
+            tracker.seed(asset["id"], quote["ath"], quote.get("ath_timestamp"))
+        snapshot.update(tracker.record(asset["id"], quote["usd"]))
+        if asset["id"] == "bitcoin":
+            snapshot.update({field: latest_data[field] for field in BTC_ONCHAIN_FIELDS
+                             if field in latest_data})
+        snapshots.append(snapshot)
+    tracker.save()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(score_asset, snapshots, chunksize=max(1, len(snapshots) // 16)))
+
+    return write_outputs(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score every asset in assets.yaml")
+    parser.add_argument("--assets", help="comma-separated symbols (default: all in assets.yaml)")
+    parser.add_argument("--workers", type=int, help="process pool size (default: all cores)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🌐 MULTI-ASSET TRACKER")
+    print("=" * 70)
+    assets = load_assets(symbols=args.assets.split(",") if args.assets else None)
+    summary = run(assets, workers=args.workers)
+    from signal_registry import format_price
+    for row in summary:
+        print(f"   {row['alert_color']} {row['symbol']:<6} {row['composite_score']:5.1f}  "
+              f"ATH ${format_price(row['ath_price'])}")
+    print(f"✅ {len(summary)} assets saved to {OUTPUT_DIR}/")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+On-chain signal set - extra Blockchain.com charts, derived in one batch
+
+fetch_blockchain_smart_money() syncs ONCHAIN_CHARTS in the same
+concurrent sweep as its core charts; this module turns the stored daily
+series into signals with the vectorized rolling windows of
+signal_engine, for every day at once (the backtest uses the full
+columns, a live run their last value):
+
+    puell_multiple     miners revenue / its 365-day mean (miner selling pressure)
+    hash_ribbon        30- vs 60-day mean hash rate; inverted = capitulation
+    difficulty_ribbon  the same crossover on mining difficulty
+    nvt_signal         market cap / 90-day mean on-chain USD volume
+    mempool            7-day mean mempool size vs the 23 days before
+
+    ONCHAIN_CHARTS=miners-revenue,difficulty,mempool-size,estimated-transaction-volume-usd
+"""
+
+import os
+
+import timeseries_store
+
+# numpy and signal_engine are imported by the functions that compute, so
+# fetch_data.py and multi_asset.py can read the constants below for free
+
+DAY = 86400
+
+ONCHAIN_CHARTS = tuple(filter(None, (name.strip() for name in os.environ.get(
+    "ONCHAIN_CHARTS",
+    "miners-revenue,difficulty,mempool-size,estimated-transaction-volume-usd").split(","))))
+
+# First-sync history per chart: enough for the longest window that uses it
+BOOTSTRAP_TIMESPANS = {
+    "miners-revenue": "2years",
+    "difficulty": "1year",
+    "estimated-transaction-volume-usd": "1year",
+}
+
+# Charts read from the store besides ONCHAIN_CHARTS (synced as core charts)
+SHARED_CHARTS = ("hash-rate", "market-cap")
+
+PUELL_WINDOW = 365
+RIBBON_FAST, RIBBON_SLOW = 30, 60
+NVT_WINDOW = 90
+
+# Data field -> chart for the ribbon crossovers
+RIBBONS = {"hash_ribbon": "hash-rate", "difficulty_ribbon": "difficulty"}
+
+# Every chart columns() reads
+INPUT_CHARTS = ("miners-revenue", "estimated-transaction-volume-usd", "mempool-size",
+                "market-cap") + tuple(RIBBONS.values())
+
+# Snapshot fields produced here (for the stale fallback)
+FIELDS = ("puell_multiple", "hash_ribbon", "difficulty_ribbon", "nvt_signal", "mempool")
+
+
+def daily(timestamps, values):
+    """Last value of each UTC day (mempool-size is sampled intraday)"""
+    import numpy as np
+    days = np.asarray(timestamps, dtype=np.int64) // DAY
+    values = np.asarray(values, dtype=float)
+    if len(days) == 0:
+        return days, values
+    last = np.append(np.nonzero(np.diff(days))[0], len(days) - 1)
+    return days[last], values[last]
+
+
+def load_daily(charts, store_dir=None):
+    """
+    Stored series for `charts` on one daily grid ending at the newest day,
+    gaps forward-filled. Returns {chart: values}, all the same length.
+    """
+    import numpy as np
+    raw = {}
+    for chart in charts:
+        days, values = daily(*timeseries_store.read_series(chart, store_dir))
+        if len(days):
+            raw[chart] = (days, values)
+    if not raw:
+        return {}
+    start = min(days[0] for days, _ in raw.values())
+    end = max(days[-1] for days, _ in raw.values())
+    aligned = {}
+    for chart, (days, values) in raw.items():
+        column = np.full(end - start + 1, np.nan)
+        column[days - start] = values
+        filled = np.where(np.isnan(column), 0, np.arange(len(column)))
+        np.maximum.accumulate(filled, out=filled)
+        aligned[chart] = np.where(np.arange(len(column)) < days[0] - start, np.nan, column[filled])
+    return aligned
+
+
+def columns(series):
+    """
+    Derive every on-chain metric for every day, each rolling window
+    computed once over only the rows that need it.
+    series: {chart: equal-length daily arrays}; returns {dotted metric: array}.
+    """
+    import numpy as np
+    import signal_engine
+    present = {name: np.asarray(series[name], dtype=float)
+               for name in INPUT_CHARTS if name in series and len(series[name])}
+    mean = signal_engine.rolling_mean
+    out = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if "miners-revenue" in present:
+            revenue = present["miners-revenue"][None, :]
+            ma365 = mean(revenue, PUELL_WINDOW)[0]
+            out["puell_multiple.value"] = revenue[0] / ma365
+            out["puell_multiple.miners_revenue"] = revenue[0]
+            out["puell_multiple.ma365"] = ma365
+        ribbons = [(field, chart) for field, chart in RIBBONS.items() if chart in present]
+        if ribbons:
+            # Both crossovers in one batch
+            matrix = np.vstack([present[chart] for _, chart in ribbons])
+            fast, slow = mean(matrix, RIBBON_FAST), mean(matrix, RIBBON_SLOW)
+            for i, (field, _) in enumerate(ribbons):
+                out[f"{field}.ma30"] = fast[i]
+                out[f"{field}.ma60"] = slow[i]
+                out[f"{field}.spread_pct"] = (fast[i] / slow[i] - 1) * 100
+                out[f"{field}.inverted"] = np.where(np.isnan(slow[i]), np.nan, fast[i] < slow[i])
+        if "market-cap" in present and "estimated-transaction-volume-usd" in present:
+            volume = mean(present["estimated-transaction-volume-usd"][None, :], NVT_WINDOW)[0]
+            out["nvt_signal.value"] = present["market-cap"] / volume
+            out["nvt_signal.tx_volume_ma90"] = volume
+        if "mempool-size" in present:
+            size = present["mempool-size"][None, :]
+            recent = mean(size, signal_engine.RECENT_WINDOW)
+            baseline = signal_engine.shift(mean(size, signal_engine.BASELINE_WINDOW),
+                                           signal_engine.RECENT_WINDOW)
+            out["mempool.size"] = size[0]
+            out["mempool.ratio"] = (recent / baseline)[0]
+    return out
+
+
+def _days_since_cross(inverted):
+    """Days the ribbon has been in its current state (None without history)"""
+    import numpy as np
+    valid = inverted[~np.isnan(inverted)]
+    if len(valid) == 0:
+        return None
+    changes = np.nonzero(valid[1:] != valid[:-1])[0]
+    return int(len(valid) - 1 - changes[-1]) if len(changes) else int(len(valid) - 1)
+
+
+def summarize(series):
+    """Latest-day values as nested latest_data.json fields"""
+    import numpy as np
+    derived = columns(series)
+    results = {}
+    for metric, column in derived.items():
+        field, stat = metric.split(".")
+        if np.isnan(column[-1]):
+            continue
+        results.setdefault(field, {})[stat] = bool(column[-1]) if stat == "inverted" else float(column[-1])
+    for field in RIBBONS:
+        if "inverted" in results.get(field, {}):
+            results[field]["days_since_cross"] = _days_since_cross(derived[f"{field}.inverted"])
+    return results
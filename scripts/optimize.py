@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Weight/threshold optimizer - random search over stored history
+
+Every candidate scales each signal's weight by one of WEIGHT_SCALES and
+its threshold by one of THRESHOLD_SCALES (the unchanged signals.yaml
+config is always candidate 0), is replayed over every stored day and is
+scored on the KNOWN_TOPS the history covers:
+
+    hit_rate    tops warned about (ORANGE or worse) within LEAD_WINDOW_DAYS
+    lead        mean warning lead time / LEAD_WINDOW_DAYS (missed tops count 0)
+    precision   share of warning days that fall inside a pre-top window
+    objective   hit_rate * (0.5 + 0.5 * lead) * precision
+
+A signal's trigger only depends on its own threshold, so the registry
+evaluates every signal once per threshold scale up front. That trigger
+table lives in one shared-memory block which every worker of the
+process pool maps read-only; a candidate is then a weighted gather over
+the table, done for a whole chunk of candidates at once. Ranked
+configurations go to data/optimizer_results.json.
+
+Usage:
+    python scripts/backtest.py --backfill 8years      # history first
+    python scripts/optimize.py --samples 50000
+    python scripts/optimize.py --keys volume_spike,cap_decline,ath --top 10
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import backtest
+import calculate_score
+
+RESULTS_PATH = os.path.join("data", "optimizer_results.json")
+
+WEIGHT_SCALES = (0.0, 0.5, 1.0, 1.5, 2.0)
+THRESHOLD_SCALES = (0.8, 0.9, 1.0, 1.1, 1.25)
+CHUNK_SIZE = 256
+
+# Worker state, set once per process by _attach()
+_shared = {}
+
+
+def _day(date):
+    return int(datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()) // backtest.DAY
+
+
+def _date(day):
+    return datetime.fromtimestamp(int(day) * backtest.DAY, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def top_windows(days):
+    """(top, top day, window mask) for each known top the history fully covers"""
+    windows = []
+    for top in backtest.KNOWN_TOPS:
+        top_day = _day(top)
+        if days[0] > top_day - backtest.LEAD_WINDOW_DAYS or days[-1] < top_day:
+            continue
+        windows.append((top, top_day, (days >= top_day - backtest.LEAD_WINDOW_DAYS) & (days <= top_day)))
+    return windows
+
+
+def trigger_table(registry, columns, length, keys):
+    """Triggers of every signal at every threshold scale: (scales x signals x days)"""
+    base = {key: float(registry.thresholds[registry.keys.index(key), 0]) for key in keys
+            if registry.signals[registry.keys.index(key)].op != "is_true"}
+    return np.stack([
+        registry.with_overrides(thresholds={key: value * scale for key, value in base.items()})
+        .triggers(columns, length)
+        for scale in THRESHOLD_SCALES
+    ])
+
+
+def sample_candidates(registry, keys, samples, seed):
+    """
+    (weights, scale indices), both (candidates x signals); only `keys` vary.
+    Row 0 is the current config.
+    """
+    rng = np.random.default_rng(seed)
+    index = [registry.keys.index(key) for key in keys]
+    unchanged = THRESHOLD_SCALES.index(1.0)
+
+    weights = np.tile(registry.weights, (samples, 1))
+    weights[:, index] *= rng.choice(WEIGHT_SCALES, size=(samples, len(keys)))
+    scales = np.full((samples, len(registry.keys)), unchanged)
+    scales[:, index] = rng.integers(len(THRESHOLD_SCALES), size=(samples, len(keys)))
+    # is_true signals have no threshold to move
+    fixed = [i for i in index if registry.signals[i].op == "is_true"]
+    scales[:, fixed] = unchanged
+    weights[0], scales[0] = registry.weights, unchanged
+    # A candidate with no weight left can't warn at all; give it the base weights
+    weights[weights.sum(axis=1) == 0] = registry.weights
+    return weights, scales
+
+
+def replay(fired, available, weights, scales):
+    """Composite score of each candidate on every day: (candidates x days)"""
+    # Each candidate's weight placed at (its threshold scale, signal) turns
+    # the gather into one matrix product over the flattened table
+    scale_count, signals, days = fired.shape
+    coefficients = np.zeros((len(weights), scale_count, signals))
+    coefficients[np.arange(len(weights))[:, None], scales, np.arange(signals)] = weights
+    fired_weight = coefficients.reshape(len(weights), -1) @ fired.reshape(-1, days)
+    available_weight = weights @ available
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(available_weight > 0, fired_weight / available_weight * 100, 0.0)
+
+
+def judge(days, alert, windows, min_level="ORANGE"):
+    """
+    Lead time and reliability of each replay (rows of `alert`), with the
+    same first-warning rule as backtest.lead_times(). Returns arrays.
+    """
+    names = [level[1] for level in calculate_score.ALERT_LEVELS]
+    warned = alert <= names.index(min_level)
+    leads = np.full((len(alert), len(windows)), np.nan)
+    in_window = np.zeros(len(days), dtype=bool)
+    for i, (_, top_day, mask) in enumerate(windows):
+        hit = warned & mask
+        first = np.argmax(hit, axis=1)
+        leads[:, i] = np.where(hit.any(axis=1), top_day - days[first], np.nan)
+        in_window |= mask
+
+    hits = (~np.isnan(leads)).sum(axis=1)
+    lead_sum = np.nansum(leads, axis=1)
+    warning_days = warned.sum(axis=1)
+    hit_rate = hits / len(windows)
+    precision = np.where(warning_days > 0, (warned & in_window).sum(axis=1) / np.maximum(warning_days, 1), 0.0)
+    lead = lead_sum / (len(windows) * backtest.LEAD_WINDOW_DAYS)
+    return {
+        "objective": hit_rate * (0.5 + 0.5 * lead) * precision,
+        "hit_rate": hit_rate,
+        "mean_lead_days": np.where(hits > 0, lead_sum / np.maximum(hits, 1), np.nan),
+        "precision": precision,
+        "warning_days": warning_days,
+        "leads": leads,
+    }
+
+
+def _attach(name, shape, min_level):
+    """Pool initializer: map the shared trigger table read-only"""
+    block = shared_memory.SharedMemory(name=name)
+    scales, signals, days = shape
+    buffer = np.ndarray((scales * signals + signals + 1, days), dtype=np.float64, buffer=block.buf)
+    buffer.flags.writeable = False
+    day_numbers = buffer[-1].astype(np.int64)
+    _shared.update(
+        block=block,
+        fired=buffer[:scales * signals].reshape(scales, signals, days),
+        available=buffer[scales * signals:-1],
+        days=day_numbers,
+        windows=top_windows(day_numbers),
+        min_level=min_level,
+    )
+
+
+def _evaluate_chunk(task):
+    """Score a block of candidates inside a worker"""
+    weights, scales = task
+    composite = replay(_shared["fired"], _shared["available"], weights, scales)
+    return judge(_shared["days"], backtest.alert_codes(composite), _shared["windows"], _shared["min_level"])
+
+
+def optimize(days, columns, keys, samples=2000, seed=0, workers=None, min_level="ORANGE"):
+    """Evaluate `samples` candidates across a process pool; returns (weights, scales, scores)"""
+    registry = calculate_score.get_registry()
+    weights, scales = sample_candidates(registry, keys, samples, seed)
+    table = trigger_table(registry, columns, len(days), keys)
+
+    # Fired triggers (NaN -> 0), availability and the day axis in one block
+    scale_rows = table.shape[0] * table.shape[1]
+    rows = scale_rows + table.shape[1] + 1
+    block = shared_memory.SharedMemory(create=True, size=rows * len(days) * 8)
+    try:
+        buffer = np.ndarray((rows, len(days)), dtype=np.float64, buffer=block.buf)
+        buffer[:scale_rows] = np.nan_to_num(table, nan=0.0).reshape(scale_rows, len(days))
+        buffer[scale_rows:-1] = ~np.isnan(table[0])
+        buffer[-1] = days
+        del buffer  # the block can't close while a view exists
+        tasks = [(weights[i:i + CHUNK_SIZE], scales[i:i + CHUNK_SIZE]) for i in range(0, samples, CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(block.name, table.shape, min_level)) as pool:
+            chunks = list(pool.map(_evaluate_chunk, tasks))
+    finally:
+        block.close()
+        block.unlink()
+
+    scores = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+    return weights, scales, scores
+
+
+def rank(scores):
+    """Candidate indices, best first (objective, then lead time, then candidate number)"""
+    lead = np.nan_to_num(scores["mean_lead_days"], nan=0.0)
+    return np.lexsort((np.arange(len(lead)), -lead, -scores["objective"]))
+
+
+def describe(registry, keys, weights, scales, scores, windows, candidate, position):
+    """One candidate as a JSON-serialisable dict"""
+    index = [registry.keys.index(key) for key in keys]
+    thresholds = registry.thresholds[index, 0] * np.array(THRESHOLD_SCALES)[scales[candidate, index]]
+    lead = scores["mean_lead_days"][candidate]
+    return {
+        "rank": position,
+        "candidate": int(candidate),
+        "objective": round(float(scores["objective"][candidate]), 6),
+        "hit_rate": round(float(scores["hit_rate"][candidate]), 4),
+        "mean_lead_days": None if np.isnan(lead) else round(float(lead), 1),
+        "precision": round(float(scores["precision"][candidate]), 4),
+        "warning_days": int(scores["warning_days"][candidate]),
+        "leads": {top: None if np.isnan(days) else int(days)
+                  for (top, _, _), days in zip(windows, scores["leads"][candidate])},
+        "weights": {key: round(float(weights[candidate, i]), 4) for key, i in zip(keys, index)},
+        "thresholds": {key: round(float(value), 4) for key, value in zip(keys, thresholds)},
+    }
+
+
+def backtest_command(registry, entry):
+    """The backtest.py invocation that replays one configuration (changed values only)"""
+    parts = ["python scripts/backtest.py"]
+    for key, value in entry["weights"].items():
+        if not np.isclose(value, registry.weights[registry.keys.index(key)]):
+            parts.append(f"--weight {key}={value:g}")
+    for key, value in entry["thresholds"].items():
+        if not np.isclose(value, registry.thresholds[registry.keys.index(key), 0]):
+            parts.append(f"--threshold {key}={value:g}")
+    return " ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search signal weights/thresholds over stored history")
+    parser.add_argument("--samples", type=int, default=5000, help="candidates to evaluate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keys", help="comma-separated signal keys to tune (default: all with history)")
+    parser.add_argument("--workers", type=int, help="process pool size (default: all cores)")
+    parser.add_argument("--min-level", default="ORANGE", choices=["YELLOW", "ORANGE", "RED ALERT"],
+                        help="alert level that counts as a warning")
+    parser.add_argument("--top", type=int, default=25, help="configurations to keep")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    args = parser.parse_args()
+    if args.samples < 1:
+        # Candidate 0 is the current configuration, so there is always one to rank
+        parser.error("--samples must be at least 1")
+
+    print("=" * 70)
+    print("🎛️  OPTIMIZER - Weight/Threshold Search")
+    print("=" * 70)
+
+    registry = calculate_score.get_registry()
+    days, series = backtest.load_history()
+    windows = top_windows(days) if len(days) else []
+    if not windows:
+        print("❌ Stored history covers no known top - run backtest.py --backfill 8years first")
+        exit(1)
+    columns = backtest.history_columns(series)
+
+    # Signals without history are unavailable on every day; tuning them is moot
+    keys = [signal.key for signal in registry.signals if signal.metric in columns]
+    if args.keys:
+        wanted = [key.strip() for key in args.keys.split(",")]
+        unknown = [key for key in wanted if key not in registry.keys]
+        if unknown:
+            parser.error(f"unknown signal keys: {', '.join(unknown)} (see signals.yaml)")
+        keys = [key for key in keys if key in wanted]
+    if not keys:
+        print("❌ None of the selected signals has stored history")
+        exit(1)
+
+    print(f"🔎 {args.samples:,} candidates x {len(days):,} days, tuning {', '.join(keys)}")
+    print(f"   Tops covered: {', '.join(top for top, _, _ in windows)}")
+    start = time.perf_counter()
+    weights, scales, scores = optimize(days, columns, keys, args.samples, args.seed,
+                                       args.workers, args.min_level)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Evaluated in {elapsed:.1f}s ({args.samples / elapsed:,.0f} candidates/s)")
+
+    order = rank(scores)
+    position = {int(candidate): i + 1 for i, candidate in enumerate(order)}
+    ranked = [describe(registry, keys, weights, scales, scores, windows, candidate, i + 1)
+              for i, candidate in enumerate(order[:args.top])]
+    baseline = describe(registry, keys, weights, scales, scores, windows, 0, position[0])
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({
+            "generated": datetime.now().isoformat(),
+            "history": {"start": _date(days[0]), "end": _date(days[-1]), "days": int(len(days))},
+            "tops": [top for top, _, _ in windows],
+            "min_level": args.min_level,
+            "samples": args.samples,
+            "seed": args.seed,
+            "baseline": baseline,
+            "results": ranked,
+        }, f, indent=2)
+
+    print(f"   {'rank':>5} {'objective':>9} {'hit rate':>8} {'lead':>6} {'precision':>9}")
+    for entry in ranked[:10] + ([baseline] if baseline["rank"] > 10 else []):
+        lead = "-" if entry["mean_lead_days"] is None else f"{entry['mean_lead_days']:.0f}d"
+        label = "  (current signals.yaml)" if entry["candidate"] == 0 else ""
+        print(f"   {entry['rank']:>5} {entry['objective']:9.4f} {entry['hit_rate']:8.0%} {lead:>6} "
+              f"{entry['precision']:9.0%}{label}")
+    print(f"✅ Top {len(ranked)} configurations saved to {args.output}")
+    print("   Replay the best one with:")
+    print(f"   {backtest_command(registry, ranked[0])}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Single-process pipeline: fetch -> score -> render
+
+Runs the three stages in one interpreter so CI pays for startup, imports
+and connection setup once instead of three times. Usually started as
+
+    python -m scripts [--profile-startup]
+
+from the repository root.
+"""
+
+import argparse
+import builtins
+import sys
+import threading
+import time
+
+import metrics
+
+
+class ImportProfiler:
+    """Wraps builtins.__import__ and records first-import time per module"""
+
+    def __init__(self):
+        self.inclusive = {}
+        self.self_time = {}
+        self._local = threading.local()  # fetchers import from worker threads
+        self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level != 0 or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+        stack = self._local.__dict__.setdefault("stack", [])
+        start = time.perf_counter()
+        stack.append(0.0)
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.inclusive[name] = self.inclusive.get(name, 0.0) + elapsed
+            self.self_time[name] = self.self_time.get(name, 0.0) + elapsed - children
+
+    def __enter__(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._original
+
+    def report(self, stage_times, top=15):
+        """stage_times: {stage: seconds}"""
+        print("=" * 70)
+        print("⏱️ STARTUP PROFILE")
+        print("=" * 70)
+        for stage, seconds in stage_times.items():
+            print(f"   {stage:<28} {seconds * 1000:8.1f} ms")
+        print()
+        print(f"   {'module':<28} {'self ms':>8} {'total ms':>9}")
+        ranked = sorted(self.self_time.items(), key=lambda item: item[1], reverse=True)
+        for name, seconds in ranked[:top]:
+            print(f"   {name:<28} {seconds * 1000:8.1f} {self.inclusive[name] * 1000:9.1f}")
+        total = sum(self.self_time.values())
+        print(f"   {'(all imports)':<28} {total * 1000:8.1f}")
+        print("=" * 70)
+
+
+def run_pipeline(profiler=None):
+    """Fetch, score and render in-process; returns the scoring result"""
+    run = metrics.current()
+
+    def load(module):
+        # Through builtins.__import__ so the profiler (if any) sees it
+        return builtins.__import__(module)
+
+    def timed(stage, fn, *args):
+        with run.stage(stage):
+            return fn(*args)
+
+    fetch_data = timed("import fetch_data", load, "fetch_data")
+    data = timed("fetch", fetch_data.main)
+    print()
+
+    calculate_score = timed("import calculate_score", load, "calculate_score")
+    result = timed("score", calculate_score.calculate_score, data)
+    print()
+
+    update_readme = timed("import update_readme", load, "update_readme")
+    timed("render", update_readme.update_readme, result)
+
+    if profiler is not None:
+        profiler.report({stage: run.stages[stage] for stage in (
+            "import fetch_data", "fetch", "import calculate_score", "score",
+            "import update_readme", "render")})
+    print()
+    metrics.emit()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scripts",
+                                     description="Run fetch -> score -> render in one process")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report import time per module and time per stage")
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        with ImportProfiler() as profiler:
+            run_pipeline(profiler)
+    else:
+        run_pipeline()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Compact append-only score history with indexed range queries
+
+data/score_history.bin is a fixed 4 KB header followed by fixed-width
+28-byte records, appended in timestamp order by every scoring run:
+
+    float64 timestamp | float32 composite | float32 smart money (NaN = None)
+    uint8 alert level | 3 pad | uint32 triggered bitmask | uint32 available bitmask
+
+Bit i of the masks is signal i of the header's key list; new signal keys
+are appended to that list so old bits keep their meaning. Because records
+are sorted and fixed-width, a time range is found by binary search over
+the memory-mapped file (O(log n)) without reading the rest of it.
+
+Usage:
+    python scripts/score_history.py --days 30
+    python scripts/score_history.py --import-csv data/historical_scores.csv
+"""
+
+import argparse
+import bisect
+import csv
+import json
+import math
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+
+HISTORY_PATH = os.path.join("data", "score_history.bin")
+LEGACY_CSV_PATH = os.path.join("data", "historical_scores.csv")
+
+MAGIC = b"BTCSCORE"
+HEADER_SIZE = 4096
+RECORD = struct.Struct("<dffB3xII")
+MAX_SIGNALS = 32
+
+# Severity order (stored as uint8)
+ALERT_CODES = {"SAFE": 0, "YELLOW": 1, "ORANGE": 2, "RED ALERT": 3}
+ALERT_NAMES = {code: name for name, code in ALERT_CODES.items()}
+
+
+def _read_header(f):
+    f.seek(0)
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE or not raw.startswith(MAGIC):
+        raise ValueError("not a score history file")
+    return json.loads(raw[len(MAGIC):].rstrip(b" \0"))
+
+
+def _write_header(f, meta):
+    body = MAGIC + json.dumps(meta).encode()
+    if len(body) > HEADER_SIZE:
+        raise ValueError("score history header full")
+    f.seek(0)
+    f.write(body.ljust(HEADER_SIZE, b" "))
+
+
+def _timestamp(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+class _TimestampView:
+    """Sequence of record timestamps over the mmap, for bisect"""
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.count = (len(buf) - HEADER_SIZE) // RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return struct.unpack_from("<d", self.buf, HEADER_SIZE + i * RECORD.size)[0]
+
+
+def append(result, path=HISTORY_PATH, legacy_csv=LEGACY_CSV_PATH):
+    """Append one calculate_score() result; returns False if it is out of order"""
+    if not os.path.exists(path):
+        _create(path)
+        if legacy_csv and os.path.exists(legacy_csv):
+            import_csv(legacy_csv, path)
+
+    with open(path, "r+b") as f:
+        meta = _read_header(f)
+        keys = meta["signals"]
+        triggered_mask = available_mask = 0
+        for signal in result.get("signals", []):
+            key = signal.get("key", signal["name"])
+            if key not in keys:
+                if len(keys) >= MAX_SIGNALS:
+                    raise ValueError("too many signals for the history bitmask")
+                keys.append(key)
+                _write_header(f, meta)
+            bit = 1 << keys.index(key)
+            if signal.get("triggered") is not None:
+                available_mask |= bit
+                if signal["triggered"]:
+                    triggered_mask |= bit
+
+        timestamp = _timestamp(result["timestamp"])
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        if end > HEADER_SIZE:
+            f.seek(end - RECORD.size)
+            if RECORD.unpack(f.read(RECORD.size))[0] > timestamp:
+                print("⚠️ Score history: result older than last record, not appended")
+                return False
+        smart = result.get("smart_money_score")
+        f.seek(end)
+        f.write(RECORD.pack(
+            timestamp,
+            result["composite_score"],
+            math.nan if smart is None else smart,
+            ALERT_CODES.get(result["alert_level"], 0),
+            triggered_mask,
+            available_mask,
+        ))
+    return True
+
+
+def _create(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        _write_header(f, {"version": 1, "signals": []})
+
+
+def import_csv(csv_path=LEGACY_CSV_PATH, path=HISTORY_PATH):
+    """Import the legacy timestamp,score,label CSV (no signal detail)"""
+    if not os.path.exists(path):
+        _create(path)
+    rows = []
+    with open(csv_path, newline="") as f:
+        for row in csv.reader(f):
+            if len(row) < 3:
+                continue
+            label = row[2].split(" ", 1)[-1] if " " in row[2] else row[2]
+            rows.append((_timestamp(row[0]), float(row[1]), label))
+    with open(path, "ab") as f:
+        for timestamp, score, label in sorted(rows):
+            f.write(RECORD.pack(timestamp, score, math.nan, ALERT_CODES.get(label, 0), 0, 0))
+    return len(rows)
+
+
+def range_query(start=None, end=None, path=HISTORY_PATH):
+    """
+    Records with start <= timestamp <= end (unix seconds or ISO strings;
+    None = open-ended), found by binary search over the mapped file.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) <= HEADER_SIZE:
+        return []
+    with open(path, "rb") as f:
+        keys = _read_header(f)["signals"]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            view = _TimestampView(buf)
+            lo = 0 if start is None else bisect.bisect_left(view, _timestamp(start))
+            hi = len(view) if end is None else bisect.bisect_right(view, _timestamp(end))
+            records = []
+            for i in range(lo, hi):
+                ts, composite, smart, alert, triggered, available = RECORD.unpack_from(
+                    buf, HEADER_SIZE + i * RECORD.size)
+                records.append({
+                    "timestamp": ts,
+                    "composite_score": round(composite, 1),
+                    "smart_money_score": None if math.isnan(smart) else round(smart, 1),
+                    "alert_level": ALERT_NAMES.get(alert, "SAFE"),
+                    "triggered": [k for b, k in enumerate(keys) if triggered >> b & 1],
+                    "available": [k for b, k in enumerate(keys) if available >> b & 1],
+                })
+    return records
+
+
+def last_days(days, path=HISTORY_PATH, now=None):
+    now = time.time() if now is None else now
+    return range_query(now - days * 86400, None, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the binary score history")
+    parser.add_argument("--days", type=float, default=30, help="show the last N days")
+    parser.add_argument("--import-csv", metavar="PATH", help="import a legacy timestamp,score,label CSV")
+    args = parser.parse_args()
+
+    if args.import_csv:
+        print(f"✅ Imported {import_csv(args.import_csv)} records from {args.import_csv}")
+        return
+
+    for record in last_days(args.days):
+        when = datetime.fromtimestamp(record["timestamp"]).strftime("%Y-%m-%d %H:%M")
+        print(f"{when}  {record['composite_score']:5.1f}  {record['alert_level']:<9}  "
+              f"{', '.join(record['triggered']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
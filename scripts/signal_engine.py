@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Vectorized rolling-window signal engine (NumPy)
+
+All metrics are stacked into one (metrics x days) matrix, right-aligned on
+the most recent day, and every windowed statistic is computed for every
+day of history in a single batched pass. The last column is the current
+run's value; the rest is the per-day signal history.
+"""
+
+import numpy as np
+
+# Window sizes (days)
+RECENT_WINDOW = 7
+BASELINE_WINDOW = 23      # the 23 days before the recent window
+TREND_LAG = 29            # values[-1] vs values[-30]
+
+# Per-metric rules: "spike" compares the recent mean with the baseline mean,
+# "trend" compares the latest value with the value TREND_LAG days earlier.
+METRIC_SPECS = {
+    "trade-volume":   {"kind": "spike", "threshold": 1.5},    # > 50% above baseline
+    "n-transactions": {"kind": "spike", "threshold": 1.3},    # > 30% above baseline
+    "market-cap":     {"kind": "trend", "threshold": -5.0},   # down more than 5%
+    "hash-rate":      {"kind": "trend", "threshold": -10.0},  # down more than 10%
+}
+DEFAULT_SPEC = {"kind": "spike", "threshold": 1.5}
+
+
+def stack_series(series):
+    """
+    Right-align {metric: values} into a float matrix, NaN-padding the front
+    of shorter series. Returns (names, matrix).
+    """
+    names = [name for name, values in series.items() if len(values)]
+    length = max((len(series[name]) for name in names), default=0)
+    matrix = np.full((len(names), length), np.nan)
+    for row, name in enumerate(names):
+        values = np.asarray(series[name], dtype=float)
+        matrix[row, length - len(values):] = values
+    return names, matrix
+
+
+def rolling_mean(matrix, window):
+    """Row-wise trailing mean; NaN until a full window of valid points exists"""
+    valid = ~np.isnan(matrix)
+    zero_pad = np.zeros((matrix.shape[0], 1))
+    sums = np.concatenate([zero_pad, np.cumsum(np.where(valid, matrix, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([zero_pad, np.cumsum(valid, axis=1)], axis=1)
+    out = np.full(matrix.shape, np.nan)
+    if matrix.shape[1] >= window:
+        window_sums = sums[:, window:] - sums[:, :-window]
+        window_counts = counts[:, window:] - counts[:, :-window]
+        full = window_counts == window
+        out[:, window - 1:] = np.where(full, window_sums / window, np.nan)
+    return out
+
+
+def rolling_std(matrix, window):
+    """Row-wise trailing population standard deviation"""
+    mean = rolling_mean(matrix, window)
+    mean_sq = rolling_mean(matrix * matrix, window)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def shift(matrix, periods):
+    """Shift columns right by `periods`, filling with NaN"""
+    out = np.full(matrix.shape, np.nan)
+    if periods < matrix.shape[1]:
+        out[:, periods:] = matrix[:, :matrix.shape[1] - periods]
+    return out
+
+
+def pct_change(matrix, lag):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (matrix / shift(matrix, lag) - 1.0) * 100
+
+
+def compute_history(series):
+    """
+    Compute every windowed statistic for every metric over full history.
+    Returns {metric: {stat: 1-D array}} with one entry per stored day.
+    """
+    names, matrix = stack_series(series)
+    if not names:
+        return {}
+
+    recent = rolling_mean(matrix, RECENT_WINDOW)
+    baseline = shift(rolling_mean(matrix, BASELINE_WINDOW), RECENT_WINDOW)
+    baseline_std = shift(rolling_std(matrix, BASELINE_WINDOW), RECENT_WINDOW)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = recent / baseline
+        zscore = (recent - baseline) / baseline_std
+    change = pct_change(matrix, TREND_LAG)
+
+    history = {}
+    for row, name in enumerate(names):
+        spec = METRIC_SPECS.get(name, DEFAULT_SPEC)
+        valid = ~np.isnan(matrix[row])
+        stats = {
+            "value": matrix[row][valid],
+            "recent_mean": recent[row][valid],
+            "baseline_mean": baseline[row][valid],
+            "ratio": ratio[row][valid],
+            "zscore": zscore[row][valid],
+            "change_pct": change[row][valid],
+        }
+        if spec["kind"] == "spike":
+            stats["flag"] = stats["ratio"] > spec["threshold"]
+        else:
+            stats["flag"] = stats["change_pct"] < spec["threshold"]
+        history[name] = stats
+    return history
+
+
+def _num(value):
+    return None if value is None or np.isnan(value) else float(value)
+
+
+def latest(history, name):
+    """Current-run statistics for one metric as plain Python floats"""
+    stats = history.get(name)
+    if stats is None or len(stats["value"]) == 0:
+        return None
+    current = {stat: values[-1] for stat, values in stats.items()}
+    recent = _num(current["recent_mean"])
+    if recent is None:
+        # Fewer points than a full window - average whatever exists
+        recent = float(np.mean(stats["value"][-RECENT_WINDOW:]))
+    baseline = _num(current["baseline_mean"])
+    if baseline is None and len(stats["value"]) > RECENT_WINDOW:
+        baseline = float(np.mean(stats["value"][-RECENT_WINDOW - BASELINE_WINDOW:-RECENT_WINDOW]))
+    flag = bool(current["flag"])
+    spec = METRIC_SPECS.get(name, DEFAULT_SPEC)
+    if spec["kind"] == "spike" and baseline is not None:
+        flag = recent > baseline * spec["threshold"]
+    value = _num(current["value"])
+    month_ago = stats["value"][-TREND_LAG - 1] if len(stats["value"]) > TREND_LAG else None
+    return {
+        "value": value,
+        "recent_mean": recent,
+        "baseline_mean": baseline,
+        "zscore": _num(current["zscore"]),
+        "change_pct": _num(current["change_pct"]),
+        "month_ago": _num(month_ago),
+        "flag": flag,
+    }
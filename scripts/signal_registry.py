@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Declarative signal registry compiled into a vectorized evaluator
+
+signals.yaml is parsed once into a CompiledRegistry holding array-backed
+weights, thresholds, op codes and precomputed category masks. The same
+evaluator scores a single snapshot (one row) or any number of historical
+rows; a signal's trigger is NaN when its metric is unavailable.
+"""
+
+import math
+import os
+import string
+
+import numpy as np
+import yaml
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "signals.yaml")
+
+OPS = (">", ">=", "<", "<=", "is_true")
+
+
+class Signal:
+    """One registry entry (presentation fields included)"""
+
+    __slots__ = ("key", "name", "category", "weight", "metric", "op", "threshold",
+                 "fill", "display_metric", "display_format", "display_scale", "target")
+
+    def __init__(self, spec):
+        self.key = spec["key"]
+        self.name = spec["name"]
+        self.category = spec["category"]
+        self.weight = float(spec["weight"])
+        self.metric = spec["metric"]
+        self.op = spec["op"]
+        if self.op not in OPS:
+            raise ValueError(f"signal {self.key}: unknown op {self.op!r}")
+        self.threshold = float(spec.get("threshold", 0.5))
+        self.fill = float(spec["fill"]) if "fill" in spec else np.nan
+        display = spec.get("display", {})
+        self.display_metric = display.get("metric", self.metric)
+        self.display_format = display.get("format", "{}")
+        self.display_scale = float(display.get("scale", 1.0))
+        self.target = spec.get("target", "N/A")
+
+
+def format_price(value):
+    """Dollar amount with precision for its magnitude ($101,930, $2.41, $0.1634)"""
+    value = float(value)
+    if value == 0 or abs(value) >= 1000:
+        return f"{value:,.0f}"
+    if abs(value) >= 1:
+        return f"{value:,.2f}"
+    # Four significant digits below $1
+    return f"{value:.{3 - math.floor(math.log10(abs(value)))}f}"
+
+
+class DisplayFormatter(string.Formatter):
+    """str.format plus a `price` spec (e.g. "${:price}", "${ath_price:price}")"""
+
+    def format_field(self, value, format_spec):
+        if format_spec == "price":
+            return format_price(value)
+        return super().format_field(value, format_spec)
+
+
+FORMATTER = DisplayFormatter()
+
+
+def lookup(data, path):
+    """Resolve a dotted path in a nested dict; None if any part is missing"""
+    value = data
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class CompiledRegistry:
+    """Array-backed evaluator for a fixed set of signals"""
+
+    __slots__ = ("signals", "keys", "metrics", "weights", "thresholds", "fills",
+                 "op_masks", "categories", "category_masks")
+
+    def __init__(self, signals):
+        self.signals = tuple(signals)
+        self.keys = tuple(s.key for s in self.signals)
+        self.metrics = tuple(s.metric for s in self.signals)
+        self.weights = np.array([s.weight for s in self.signals])
+        self.thresholds = np.array([s.threshold for s in self.signals])[:, None]
+        self.fills = np.array([s.fill for s in self.signals])[:, None]
+        ops = np.array([OPS.index(s.op) for s in self.signals])
+        self.op_masks = [(ops == i)[:, None] for i in range(len(OPS))]
+        self.categories = tuple(dict.fromkeys(s.category for s in self.signals))
+        self.category_masks = {
+            category: np.array([s.category == category for s in self.signals])
+            for category in self.categories
+        }
+
+    def with_overrides(self, weights=None, thresholds=None):
+        """Copy with some weights/thresholds replaced (keys as in signals.yaml)"""
+        compiled = CompiledRegistry.__new__(CompiledRegistry)
+        for slot in CompiledRegistry.__slots__:
+            setattr(compiled, slot, getattr(self, slot))
+        compiled.weights = self.weights.copy()
+        compiled.thresholds = self.thresholds.copy()
+        for key, value in (weights or {}).items():
+            compiled.weights[self.keys.index(key)] = value
+        for key, value in (thresholds or {}).items():
+            compiled.thresholds[self.keys.index(key)] = value
+        return compiled
+
+    def triggers(self, columns, rows):
+        """
+        Evaluate every signal over `rows` rows.
+        columns: {metric: array of length rows}; metrics absent from
+        columns are unavailable. Returns a (signals x rows) float matrix
+        of 1.0 / 0.0 / NaN.
+        """
+        values = np.full((len(self.signals), rows), np.nan)
+        for i, metric in enumerate(self.metrics):
+            column = columns.get(metric)
+            if column is not None:
+                values[i] = column
+                # Present-but-missing values use the signal's fill (if any)
+                values[i] = np.where(np.isnan(values[i]), self.fills[i], values[i])
+        t = self.thresholds
+        with np.errstate(invalid="ignore"):
+            fired = np.select(
+                self.op_masks,
+                [values > t, values >= t, values < t, values <= t, values > 0.5],
+            )
+        return np.where(np.isnan(values), np.nan, fired)
+
+    def score(self, triggers):
+        """
+        Weighted scores per row: (composite, {category: score}, available_weight).
+        Category scores are NaN where none of that category's signals is available.
+        """
+        available = ~np.isnan(triggers)
+        fired = np.where(available, triggers, 0.0)
+        weighted_available = self.weights[:, None] * available
+        weighted_fired = self.weights[:, None] * fired
+        available_weight = weighted_available.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            composite = np.where(available_weight > 0,
+                                 weighted_fired.sum(axis=0) / available_weight * 100, 0.0)
+            by_category = {}
+            for category, mask in self.category_masks.items():
+                cat_available = weighted_available[mask].sum(axis=0)
+                by_category[category] = np.where(
+                    cat_available > 0, weighted_fired[mask].sum(axis=0) / cat_available * 100, np.nan)
+        return composite, by_category, available_weight
+
+    def snapshot_columns(self, data):
+        """Turn one latest_data.json-style dict into single-row columns"""
+        columns = {}
+        for metric in self.metrics:
+            value = lookup(data, metric)
+            columns[metric] = np.array([np.nan if value is None else float(value)])
+        return columns
+
+    def display_value(self, signal, data):
+        value = lookup(data, signal.display_metric)
+        if value is None:
+            return "N/A"
+        return FORMATTER.format(signal.display_format, float(value) * signal.display_scale)
+
+    def display_target(self, signal, data):
+        """Target text; `{field}` placeholders are filled from the snapshot"""
+        try:
+            return FORMATTER.vformat(signal.target, (), data)
+        except (KeyError, IndexError, ValueError, TypeError):
+            return signal.target
+
+
+def load_registry(path=REGISTRY_PATH):
+    """Parse signals.yaml and compile it"""
+    with open(path, "r") as f:
+        spec = yaml.safe_load(f)
+    signals = [Signal(entry) for entry in spec["signals"]]
+    keys = [s.key for s in signals]
+    if len(set(keys)) != len(keys):
+        raise ValueError("duplicate signal keys in registry")
+    return CompiledRegistry(signals)
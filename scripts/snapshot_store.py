@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, append-only store for every data snapshot
+
+latest_data.json and current_signals.json only hold the latest run; each
+run is also appended here. A snapshot is split into three objects:
+
+    schema    key paths and leaf types                (zlib JSON)
+    values    every numeric leaf, 8 bytes each         (raw, mmap-readable)
+    strings   every text leaf (names, targets, ...)     (zlib JSON)
+
+Floats and bools are stored as float64 and ints as int64, so a snapshot
+loads back equal to what was stored, types included (ints outside the
+int64 range go to the strings object).
+
+Objects are stored once per distinct content (SHA-1 address), so the
+schema and most presentation strings are shared by nearly every run and
+an unchanged snapshot adds no object at all. Strings equal to the
+snapshot's own timestamp are stored as a reference to it, so a re-run
+with the same inputs dedupes too.
+
+data/snapshots/ holds three append-only files:
+
+    objects.pack    object bytes, concatenated
+    objects.idx     36-byte entries: sha1 | uint64 offset | uint32 length | uint8 codec | 3 pad
+    snapshots.idx   24-byte entries: float64 timestamp | uint8 kind | 3 pad | uint32 schema, values, strings
+
+Readers mmap all three, so loading one snapshot, or one numeric column
+across every run, touches only the bytes it needs.
+
+Usage:
+    python scripts/snapshot_store.py --list
+    python scripts/snapshot_store.py --show -1 --kind signals
+    python scripts/snapshot_store.py --column composite_score
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from datetime import datetime
+
+# numpy is imported by column() only, so importing this module and
+# appending (fetch_data.py does both) stays cheap
+
+STORE_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join("data", "snapshots"))
+
+OBJECT = struct.Struct("<20sQIB3x")
+RECORD = struct.Struct("<dB3xIII")
+RAW, ZLIB = 0, 1
+
+KINDS = {"latest_data": 0, "signals": 1}
+
+# Leaf types in a schema: numeric ones take a slot in the values array
+# ("q" as int64, the rest float64; "i" is an int written as float64 by
+# older runs), "s" and "z" (big int) a slot in the strings list, "t" is
+# the snapshot timestamp, the rest are constants
+NUMERIC = {"f": float, "q": int, "b": bool, "i": int}
+CONSTANTS = {"n": None, "{}": {}, "[]": []}
+INT64 = range(-2 ** 63, 2 ** 63)
+
+
+def _leaves(obj, path=()):
+    if isinstance(obj, dict) and obj:
+        for key, value in obj.items():
+            yield from _leaves(value, path + (key,))
+    elif isinstance(obj, list) and obj:
+        for i, value in enumerate(obj):
+            yield from _leaves(value, path + (i,))
+    else:
+        yield path, obj
+
+
+def _timestamp(value):
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def split(snapshot):
+    """Return (timestamp, schema, values, strings) for one snapshot dict"""
+    ts_text = snapshot.get("timestamp")
+    ts = _timestamp(ts_text)
+    if ts is None or datetime.fromtimestamp(ts).isoformat() != ts_text:
+        ts_text = None  # not reproducible from the float, keep it as a string
+    schema, values, strings = [], [], []
+    for path, leaf in _leaves(snapshot):
+        if isinstance(leaf, bool):
+            kind = "b"
+        elif isinstance(leaf, int):
+            kind = "q" if leaf in INT64 else "z"
+        elif isinstance(leaf, float):
+            kind = "f"
+        elif isinstance(leaf, str):
+            kind = "t" if ts_text is not None and leaf == ts_text else "s"
+        elif leaf is None:
+            kind = "n"
+        else:
+            kind = "{}" if isinstance(leaf, dict) else "[]"
+        schema.append([list(path), kind])
+        if kind in NUMERIC:
+            values.append(leaf if kind == "q" else float(leaf))
+        elif kind == "s":
+            strings.append(leaf)
+        elif kind == "z":
+            strings.append(str(leaf))
+    return (ts if ts is not None else float("nan")), schema, values, strings
+
+
+def join(ts, schema, values, strings):
+    """Inverse of split()"""
+    ts_text = datetime.fromtimestamp(ts).isoformat() if ts == ts else None
+    values, strings = iter(values), iter(strings)
+    root = {}
+    for path, kind in schema:
+        if kind in NUMERIC:
+            leaf = NUMERIC[kind](next(values))
+        elif kind == "s":
+            leaf = next(strings)
+        elif kind == "z":
+            leaf = int(next(strings))
+        elif kind == "t":
+            leaf = ts_text
+        else:
+            leaf = type(CONSTANTS[kind])() if CONSTANTS[kind] is not None else None
+        if not path:
+            return leaf
+        node = root
+        for key, child in zip(path, path[1:]):
+            if isinstance(node, list):
+                if key == len(node):
+                    node.append([] if isinstance(child, int) else {})
+                node = node[key]
+            else:
+                node = node.setdefault(key, [] if isinstance(child, int) else {})
+        if isinstance(node, list):
+            node.append(leaf)
+        else:
+            node[path[-1]] = leaf
+    return root
+
+
+def value_format(schema):
+    """struct format of a schema's values object"""
+    return "<" + "".join("q" if kind == "q" else "d" for _, kind in schema if kind in NUMERIC)
+
+
+def _map(path):
+    """Read-only mmap of a file (None while it is missing or empty)"""
+    try:
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+class SnapshotStore:
+    """Append-only snapshot store; reads go through mmap"""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.pack_path = os.path.join(root, "objects.pack")
+        self.objects_path = os.path.join(root, "objects.idx")
+        self.records_path = os.path.join(root, "snapshots.idx")
+        self._addresses = None
+        self._schemas = {}
+        self.refresh()
+
+    def refresh(self):
+        """Re-map the files (after appends by this or another process)"""
+        self.pack = _map(self.pack_path)
+        self.objects = _map(self.objects_path)
+        self.records = _map(self.records_path)
+
+    def __len__(self):
+        return len(self.records) // RECORD.size if self.records else 0
+
+    def object_count(self):
+        return len(self.objects) // OBJECT.size if self.objects else 0
+
+    # -- reading ---------------------------------------------------------
+
+    def _object_bytes(self, number):
+        _, offset, length, codec = OBJECT.unpack_from(self.objects, number * OBJECT.size)
+        raw = self.pack[offset:offset + length]
+        return zlib.decompress(raw) if codec == ZLIB else raw
+
+    def _schema(self, number):
+        schema = self._schemas.get(number)
+        if schema is None:
+            schema = json.loads(self._object_bytes(number))
+            self._schemas[number] = schema
+        return schema
+
+    def record(self, i):
+        """(timestamp, kind, schema_id, values_id, strings_id) of snapshot i"""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return RECORD.unpack_from(self.records, i * RECORD.size)
+
+    def load(self, i):
+        """Rebuild snapshot i as the dict that was stored"""
+        ts, _, schema_id, values_id, strings_id = self.record(i)
+        schema = self._schema(schema_id)
+        values = struct.unpack(value_format(schema), self._object_bytes(values_id))
+        strings = json.loads(self._object_bytes(strings_id))
+        return join(ts, schema, values, strings)
+
+    def indices(self, kind=None):
+        code = None if kind is None else KINDS[kind]
+        return [i for i in range(len(self)) if code is None or self.record(i)[1] == code]
+
+    def latest(self, kind):
+        """Index of the newest snapshot of `kind`, or None"""
+        code = KINDS[kind]
+        for i in range(len(self) - 1, -1, -1):
+            if self.record(i)[1] == code:
+                return i
+        return None
+
+    def column(self, kind, *path):
+        """(timestamps, values) of one numeric leaf across every snapshot of `kind`
+
+        Reads 8 bytes per snapshot straight from the mapped pack; runs
+        whose schema lacks the leaf give NaN. Values come back as float64
+        (an analysis column; load() returns ints exactly).
+        """
+        import numpy as np
+        slots = {}
+        timestamps, values = [], []
+        code, path = KINDS[kind], list(path)
+        for i in range(len(self)):
+            ts, record_kind, schema_id, values_id, _ = self.record(i)
+            if record_kind != code:
+                continue
+            if schema_id not in slots:
+                numeric = [(leaf_path, leaf_kind) for leaf_path, leaf_kind in self._schema(schema_id)
+                           if leaf_kind in NUMERIC]
+                paths = [leaf_path for leaf_path, _ in numeric]
+                slot = paths.index(path) if path in paths else None
+                slots[schema_id] = None if slot is None else (
+                    slot, "<q" if numeric[slot][1] == "q" else "<d")
+            timestamps.append(ts)
+            if slots[schema_id] is None:
+                values.append(float("nan"))
+            else:
+                slot, fmt = slots[schema_id]
+                _, offset, _, _ = OBJECT.unpack_from(self.objects, values_id * OBJECT.size)
+                values.append(struct.unpack_from(fmt, self.pack, offset + slot * 8)[0])
+        return np.asarray(timestamps), np.asarray(values, dtype=float)
+
+    # -- writing ---------------------------------------------------------
+
+    def _address_book(self):
+        """sha1 -> object number, rebuilt when another writer added objects"""
+        if self._addresses is None or len(self._addresses) != self.object_count():
+            self._addresses = {}
+            for number in range(self.object_count()):
+                digest = OBJECT.unpack_from(self.objects, number * OBJECT.size)[0]
+                self._addresses[digest] = number
+        return self._addresses
+
+    def _put_object(self, addresses, pack, index, data, codec):
+        digest = hashlib.sha1(bytes([codec]) + data).digest()
+        if digest in addresses:
+            return addresses[digest]
+        stored = zlib.compress(data, 9) if codec == ZLIB else data
+        offset = pack.seek(0, os.SEEK_END)
+        pack.write(stored)
+        index.write(OBJECT.pack(digest, offset, len(stored), codec))
+        addresses[digest] = len(addresses)
+        return addresses[digest]
+
+    def put(self, kind, snapshot):
+        """Append one snapshot; returns False if it equals the previous one of its kind"""
+        ts, schema, values, strings = split(snapshot)
+        os.makedirs(self.root, exist_ok=True)
+        self.refresh()
+        addresses = self._address_book()
+        with open(self.pack_path, "ab") as pack, open(self.objects_path, "ab") as index:
+            # Objects land before the record that points at them, so a crash
+            # mid-append leaves unreferenced bytes, never a dangling record
+            refs = (
+                self._put_object(addresses, pack, index, json.dumps(schema, separators=(",", ":")).encode(), ZLIB),
+                self._put_object(addresses, pack, index, struct.pack(value_format(schema), *values), RAW),
+                self._put_object(addresses, pack, index, json.dumps(strings, separators=(",", ":")).encode(), ZLIB),
+            )
+        last = self.latest(kind)
+        if last is not None and self.record(last)[2:] == refs:
+            return False
+        with open(self.records_path, "ab") as f:
+            f.write(RECORD.pack(ts, KINDS[kind], *refs))
+        self.refresh()
+        return True
+
+    def stats(self):
+        return {
+            "snapshots": len(self),
+            "objects": self.object_count(),
+            "bytes": sum(len(m) for m in (self.pack, self.objects, self.records) if m),
+        }
+
+
+_store = None
+
+
+def put(kind, snapshot, root=STORE_DIR):
+    """Append to the default store (kept open across daemon steps)"""
+    global _store
+    if _store is None or _store.root != root:
+        _store = SnapshotStore(root)
+    return _store.put(kind, snapshot)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the snapshot store")
+    parser.add_argument("--root", default=STORE_DIR)
+    parser.add_argument("--kind", choices=sorted(KINDS), default="signals")
+    parser.add_argument("--list", action="store_true", help="list stored snapshots")
+    parser.add_argument("--show", type=int, metavar="N", help="print snapshot N of --kind (-1 = latest)")
+    parser.add_argument("--column", metavar="PATH", help="numeric leaf across runs, e.g. btc_price or signals.0.weight")
+    parser.add_argument("--import-json", metavar="PATH", help="append an existing JSON snapshot as --kind")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.root)
+    if args.import_json:
+        with open(args.import_json, "r") as f:
+            added = store.put(args.kind, json.load(f))
+        print("✅ Snapshot stored" if added else "⚪ Unchanged since the last snapshot, not stored")
+    if args.show is not None:
+        indices = store.indices(args.kind)
+        print(json.dumps(store.load(indices[args.show]), indent=2))
+    elif args.column:
+        path = [int(part) if part.isdigit() else part for part in args.column.split(".")]
+        timestamps, values = store.column(args.kind, *path)
+        for ts, value in zip(timestamps, values):
+            print(f"{datetime.fromtimestamp(ts).isoformat(timespec='seconds')}  {value:g}")
+    elif args.list:
+        for i in store.indices(args.kind):
+            ts, _, schema_id, values_id, strings_id = store.record(i)
+            print(f"{i:6d}  {datetime.fromtimestamp(ts).isoformat(timespec='seconds')}  "
+                  f"schema={schema_id} values={values_id} strings={strings_id}")
+    stats = store.stats()
+    print(f"📦 {stats['snapshots']} snapshots, {stats['objects']} objects, {stats['bytes'] / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Lean SPX 200-day MA provider - no yfinance/pandas
+
+Daily closes are kept in the local time-series store ("spx-close") and
+updated incrementally. The 200-day moving average is a running sum over
+the last 200 closes: seeded once from the stored tail, then O(1) per new
+bar. Sources are swappable so the provider can run offline from a CSV.
+
+    SPX_SOURCE=csv:path/to/closes.csv   # date,close rows (YYYY-MM-DD)
+"""
+
+import csv
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import timeseries_store
+
+YAHOO_CHART_URL = os.environ.get("YAHOO_CHART_URL", "https://query1.finance.yahoo.com/v8/finance/chart")
+SPX_SYMBOL = "^GSPC"
+SPX_METRIC = "spx-close"
+MA_WINDOW = 200
+# ~200 trading days need ~290 calendar days; ask for more to survive holidays
+BOOTSTRAP_DAYS = 400
+DAY = 86400
+
+
+class RunningMean:
+    """Fixed-window mean with O(1) push / replace of the newest value"""
+
+    __slots__ = ("window", "values", "total")
+
+    def __init__(self, window, values=()):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        for value in values:
+            self.push(value)
+
+    def push(self, value):
+        self.values.append(value)
+        self.total += value
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+
+    def replace_last(self, value):
+        self.total += value - self.values[-1]
+        self.values[-1] = value
+
+    @property
+    def mean(self):
+        if len(self.values) < self.window:
+            return None
+        return self.total / self.window
+
+
+class YahooChartSource:
+    """Daily closes from Yahoo's chart endpoint (the JSON yfinance wraps)"""
+
+    def __init__(self, engine, symbol=SPX_SYMBOL):
+        self.engine = engine
+        self.symbol = symbol
+
+    def closes_since(self, since):
+        # Day-aligned bounds (stored bars already are), so the request -
+        # and its HTTP cache key - is the same for every run in one UTC day
+        today = int(time.time()) // DAY * DAY
+        params = {
+            "period1": since if since is not None else today - BOOTSTRAP_DAYS * DAY,
+            "period2": today + DAY,
+            "interval": "1d",
+        }
+        payload = self.engine.get_json(f"{YAHOO_CHART_URL}/{self.symbol}", params=params)
+        result = payload["chart"]["result"][0]
+        closes = result["indicators"]["quote"][0]["close"]
+        return [(ts, close) for ts, close in zip(result.get("timestamp", []), closes)
+                if close is not None]
+
+
+class CsvSource:
+    """Offline source: a date,close CSV (header optional)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def closes_since(self, since):
+        bars = []
+        with open(self.path, newline="") as f:
+            for row in csv.reader(f):
+                try:
+                    day = datetime.strptime(row[0], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+                    bars.append((int(day.timestamp()), float(row[1])))
+                except (ValueError, IndexError):
+                    continue  # header / blank lines
+        return [bar for bar in bars if since is None or bar[0] >= since]
+
+
+def default_source(engine):
+    spec = os.environ.get("SPX_SOURCE", "")
+    if spec.startswith("csv:"):
+        return CsvSource(spec[4:])
+    return YahooChartSource(engine)
+
+
+class SPXProvider:
+    """Incrementally updated close history + running 200-day MA"""
+
+    def __init__(self, source, metric=SPX_METRIC, store_dir=None, window=MA_WINDOW):
+        self.source = source
+        self.metric = metric
+        self.store_dir = store_dir
+        _, tail = timeseries_store.read_series(metric, store_dir, tail=window)
+        self.ma = RunningMean(window, tail)
+        self.last = timeseries_store.last_timestamp(metric, store_dir)
+
+    def update(self):
+        """Pull new bars, advance the running MA and return the SPX signal fields"""
+        new_bars = []
+        for ts, close in sorted(self.source.closes_since(self.last)):
+            ts = ts // DAY * DAY  # one bar per UTC day
+            if self.last is not None and ts < self.last:
+                continue
+            if ts == self.last and self.ma.values:
+                self.ma.replace_last(close)  # today's bar revised intraday
+            else:
+                self.ma.push(close)
+            self.last = ts
+            new_bars.append((ts, close))
+        if new_bars:
+            timeseries_store.append_points(self.metric, new_bars, self.store_dir)
+        return self.current()
+
+    def current(self):
+        if not self.ma.values:
+            return {"spx_price": None, "spx_ma200": None, "spx_rollover": None}
+        price = self.ma.values[-1]
+        ma200 = self.ma.mean
+        return {
+            "spx_price": price,
+            "spx_ma200": ma200,
+            # Unavailable (not False) until a full 200-day window exists
+            "spx_rollover": (price < ma200) if ma200 is not None else None,
+        }
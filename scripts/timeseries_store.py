@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Incremental on-disk time-series store - one append-only binary file per metric
+
+Each record is a fixed 16 bytes: int64 unix timestamp + float64 value,
+little-endian, sorted by timestamp. The last timestamp is read with a
+single seek, so each run only asks the API for points newer than that.
+"""
+
+import math
+import os
+import struct
+import time
+
+STORE_DIR = os.path.join("data", "timeseries")
+RECORD = struct.Struct("<qd")
+
+# How much history to request the first time a metric is seen
+BOOTSTRAP_TIMESPAN = "90days"
+
+
+def series_path(metric, store_dir=None):
+    return os.path.join(store_dir or STORE_DIR, f"{metric}.bin")
+
+
+def last_timestamp(metric, store_dir=None):
+    """Timestamp of the newest stored point, or None if the metric is empty"""
+    path = series_path(metric, store_dir)
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < RECORD.size:
+                return None
+            f.seek(-RECORD.size, os.SEEK_END)
+            return RECORD.unpack(f.read(RECORD.size))[0]
+    except FileNotFoundError:
+        return None
+
+
+def read_series(metric, store_dir=None, tail=None):
+    """Return (timestamps, values) lists, optionally only the last `tail` points"""
+    path = series_path(metric, store_dir)
+    try:
+        with open(path, "rb") as f:
+            if tail is not None:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - tail * RECORD.size))
+            raw = f.read()
+    except FileNotFoundError:
+        return [], []
+    raw = raw[:len(raw) - len(raw) % RECORD.size]
+    timestamps, values = [], []
+    for ts, value in RECORD.iter_unpack(raw):
+        timestamps.append(ts)
+        values.append(value)
+    return timestamps, values
+
+
+def append_points(metric, points, store_dir=None):
+    """
+    Merge (timestamp, value) points into the store.
+    Points older than the last stored one are ignored; a point with the
+    same timestamp as the last one replaces it (the API revises the
+    current day). Returns the number of new records written.
+    """
+    path = series_path(metric, store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    last = last_timestamp(metric, store_dir)
+
+    written = 0
+    with open(path, "r+b" if last is not None else "wb") as f:
+        f.seek(0, os.SEEK_END)
+        for ts, value in sorted(points):
+            ts = int(ts)
+            if last is not None and ts < last:
+                continue
+            if last is not None and ts == last:
+                f.seek(-RECORD.size, os.SEEK_END)
+                f.write(RECORD.pack(ts, value))
+                continue
+            f.write(RECORD.pack(ts, value))
+            last = ts
+            written += 1
+    return written
+
+
+def incremental_timespan(metric, store_dir=None, now=None, bootstrap=None):
+    """Blockchain.com `timespan` covering everything after the last stored point"""
+    last = last_timestamp(metric, store_dir)
+    if last is None:
+        return bootstrap or BOOTSTRAP_TIMESPAN
+    now = time.time() if now is None else now
+    days = max(1, math.ceil((now - last) / 86400) + 1)
+    return f"{days}days"
+
+
+def merge_points(metric, points, store_dir=None):
+    """
+    Merge points anywhere in the series (used when backfilling older
+    history). Rewrites the file; incoming points win on equal timestamps.
+    Returns the number of stored points.
+    """
+    timestamps, values = read_series(metric, store_dir)
+    merged = dict(zip(timestamps, values))
+    merged.update((int(ts), value) for ts, value in points)
+    path = series_path(metric, store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for ts in sorted(merged):
+            f.write(RECORD.pack(ts, merged[ts]))
+    os.replace(tmp_path, path)
+    return len(merged)
@@ -1,112 +1,173 @@
 #!/usr/bin/env python3
 """
 Update README.md with latest signal data - FREE SMART MONEY EDITION
+
+README.md carries anchor comments around each generated section:
+
+    <!-- tracker:status:start --> ... <!-- tracker:status:end -->
+    <!-- tracker:signals:start --> ... <!-- tracker:signals:end -->
+    <!-- tracker:chart:start --> ... <!-- tracker:chart:end -->
+    <!-- tracker:hash:<sha256> -->
+
+Sections are rendered from templates and hashed (without the timestamp).
+When the hash matches the one stored in the README the file is left
+untouched, so unchanged runs cost no write and no commit.
 """
 
+import hashlib
 import json
 import re
-from datetime import datetime
-
-def update_readme():
-    """Update README.md with latest calculated signals"""
-    
-    # Load current signals
-    with open('data/current_signals.json', 'r') as f:
-        data = json.load(f)
-    
-    # Read current README
-    with open('README.md', 'r') as f:
-        readme = f.read()
-    
-    # Extract values
-    composite_score = data['composite_score']
-    alert_level = data['alert_level']
-    alert_color = data['alert_color']
-    alert_message = data['alert_message']
-    timestamp = data.get('timestamp', datetime.utcnow().isoformat())
-    
+import time
+from datetime import datetime, timezone
+from string import Template
+
+import metrics
+import score_history
+
+README_PATH = 'README.md'
+
+SECTION_PATTERN = re.compile(
+    r'(<!-- tracker:(?P<name>\w+):start -->\n)(?P<body>.*?)(<!-- tracker:(?P=name):end -->)',
+    re.S)
+HASH_PATTERN = re.compile(r'<!-- tracker:hash:(?P<hash>[0-9a-f]*) -->')
+
+STATUS_TEMPLATE = Template(
+    '### **Composite Score:** $score $color\n'
+    '\n'
+    '**Alert Level:** $color $level\n'
+    '\n'
+    '**Last Updated:** $updated (Auto-updates every 6 hours)\n')
+
+TABLE_HEADER = (
+    '| Signal | Weight | Current Value | Target | Status | Last Check |\n'
+    '|--------|--------|---------------|--------|--------|------------|\n')
+ROW_TEMPLATE = Template('| $name | $weight | $value | $target | $status | Auto |\n')
+
+CHART_DAYS = 30
+CHART_MARKERS = {70: ' ← RED ALERT', 50: ' ← ORANGE ALERT', 30: ' ← YELLOW ALERT'}
+
+
+def format_timestamp(timestamp):
     # Format timestamp (convert from ISO to readable)
     try:
         dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        formatted_time = dt.strftime('%Y-%m-%d %H:%M UTC')
-    except:
-        formatted_time = timestamp
-    
-    # Update composite score line (match the markdown heading format)
-    score_pattern = r'(###\s*\*\*)?Composite Score:.*'
-    score_replacement = f'### **Composite Score:** {composite_score:.0f} {alert_color}'
-    readme = re.sub(score_pattern, score_replacement, readme)
-    
-    # Update alert level line
-    alert_pattern = r'\*\*Alert Level:\*\*.*'
-    alert_replacement = f'**Alert Level:** {alert_color} {alert_level}'
-    readme = re.sub(alert_pattern, alert_replacement, readme)
-    
-    # Update timestamp line
-    timestamp_pattern = r'\*\*Last Updated:\*\*.*'
-    timestamp_replacement = f'**Last Updated:** {formatted_time} (Auto-updates every 6 hours)'
-    readme = re.sub(timestamp_pattern, timestamp_replacement, readme)
-    
-    # Update signal table - match the actual section name
-    table_start = readme.find('## Signal Dashboard')
-    if table_start == -1:
-        table_start = readme.find('## 🎯 Signal Dashboard')
-    
-    if table_start != -1:
-        # Find where table ends (next ## section)
-        table_end = readme.find('\n## ', table_start + 10)
-        if table_end == -1:
-            table_end = readme.find('\n---', table_start + 10)
-        if table_end == -1:
-            table_end = len(readme)
-        
-        # Build new table
-        table_lines = [
-            '## 🎯 Signal Dashboard',
-            '',
-            '| Signal | Weight | Current Value | Target | Status | Last Check |',
-            '|--------|--------|---------------|--------|--------|------------|'
-        ]
-        
-        # Add signal rows
-        for signal in data['signals']:
-            # Determine status emoji
-            triggered = signal.get('triggered')
-            if triggered is None:
-                status = '⚪'
-            elif triggered:
-                status = '❌'  # Match your current format
-            else:
-                status = '✅'  # Match your current format
-            
-            # Format weight
-            weight_pct = f"{signal['weight']*100:.0f}%"
-            
-            # Format current value (handle None values)
-            current_val = signal.get('current_value', 'N/A')
-            if current_val is None:
-                current_val = 'N/A'
-            
-            # Get target
-            target = signal.get('target', 'N/A')
-            
-            # Add row (match the 6-column format you have)
-            row = f"| {signal['name']} | {weight_pct} | {current_val} | {target} | {status} | Auto |"
-            table_lines.append(row)
-        
-        table_lines.append('')
-        
-        # Replace table section
-        new_table = '\n'.join(table_lines)
-        readme = readme[:table_start] + new_table + readme[table_end:]
-    
+        return dt.strftime('%Y-%m-%d %H:%M UTC')
+    except (AttributeError, ValueError):
+        return timestamp
+
+
+def render_signals(signals):
+    rows = [TABLE_HEADER]
+    # signals.yaml weights are relative; show each one's share of the total
+    total_weight = sum(signal['weight'] for signal in signals) or 1
+    for signal in signals:
+        # Determine status emoji
+        triggered = signal.get('triggered')
+        if triggered is None:
+            status = '⚪'
+        elif triggered:
+            status = '❌'
+        else:
+            status = '✅'
+        value = signal.get('current_value') or 'N/A'
+        if signal.get('stale'):
+            value += ' (stale)'
+        rows.append(ROW_TEMPLATE.substitute(
+            name=signal['name'],
+            weight=f"{signal['weight'] / total_weight * 100:.0f}%",
+            value=value,
+            target=signal.get('target', 'N/A'),
+            status=status))
+    return ''.join(rows)
+
+
+def render_chart(records, days=CHART_DAYS, now=None):
+    """ASCII chart of the daily peak score over the last `days` days"""
+    now = time.time() if now is None else now
+    today = int(now // 86400)
+    daily = {}
+    for record in records:
+        day = int(record['timestamp'] // 86400)
+        daily[day] = max(daily.get(day, 0), record['composite_score'])
+    columns = [daily.get(day) for day in range(today - days + 1, today + 1)]
+
+    lines = ['```', f'Score Progression (Last {days} Days):']
+    for level in range(100, -1, -10):
+        cells = ''.join(
+            '●' if score is not None and int(round(score / 10)) * 10 == level
+            else ('─' if level == 0 else ' ')
+            for score in columns)
+        axis = '┼' if level == 0 else '┤'
+        lines.append(f'{level:>3}% {axis}{cells}{CHART_MARKERS.get(level, "")}'.rstrip())
+    first, last = (datetime.fromtimestamp(day * 86400, tz=timezone.utc)
+                   for day in (today - days + 1, today))
+    first, last = f'{first:%b} {first.day}', f'{last:%b} {last.day}'
+    lines.append('      ' + first + last.rjust(days - len(first)))
+    lines.append('```')
+    return '\n'.join(lines) + '\n'
+
+
+@metrics.timed("readme.render")
+def render_sections(data, records):
+    """Rendered sections, plus the hash of everything except the timestamp"""
+    status_fields = dict(
+        score=f"{data['composite_score']:.0f}",
+        color=data['alert_color'],
+        level=data['alert_level'])
+    sections = {
+        'signals': render_signals(data['signals']),
+        'chart': render_chart(records),
+    }
+    digest = hashlib.sha256()
+    digest.update(STATUS_TEMPLATE.substitute(status_fields, updated='').encode())
+    for name in sorted(sections):
+        digest.update(sections[name].encode())
+
+    updated = format_timestamp(data.get('timestamp', datetime.utcnow().isoformat()))
+    sections['status'] = STATUS_TEMPLATE.substitute(status_fields, updated=updated)
+    return sections, digest.hexdigest()
+
+
+def update_readme(data=None, path=README_PATH):
+    """Update README.md with latest calculated signals; returns True if it was rewritten"""
+
+    # Load current signals (unless the caller already has them in memory)
+    if data is None:
+        with open('data/current_signals.json', 'r') as f:
+            data = json.load(f)
+
+    # Read current README
+    with open(path, 'r') as f:
+        readme = f.read()
+
+    sections, content_hash = render_sections(data, score_history.last_days(CHART_DAYS))
+
+    stored = HASH_PATTERN.search(readme)
+    if stored and stored.group('hash') == content_hash:
+        print("✅ README.md unchanged (content hash match) - skipped write")
+        return False
+
+    def replace(match):
+        body = sections.get(match.group('name'))
+        if body is None:
+            return match.group(0)
+        return match.group(1) + body + match.group(4)
+
+    readme = SECTION_PATTERN.sub(replace, readme)
+    hash_comment = f'<!-- tracker:hash:{content_hash} -->'
+    if stored:
+        readme = HASH_PATTERN.sub(hash_comment, readme, count=1)
+    else:
+        readme = readme.rstrip('\n') + '\n\n' + hash_comment + '\n'
+
     # Write updated README
-    with open('README.md', 'w') as f:
+    with metrics.current().stage("readme.write"), open(path, 'w') as f:
         f.write(readme)
-    
+
     print(f"✅ README.md updated successfully")
-    print(f"   Score: {composite_score:.0f}/100 ({alert_color} {alert_level})")
-    print(f"   Message: {alert_message}")
+    print(f"   Score: {data['composite_score']:.0f}/100 ({data['alert_color']} {data['alert_level']})")
+    print(f"   Message: {data['alert_message']}")
+    return True
 
 if __name__ == "__main__":
     update_readme()
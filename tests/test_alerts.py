@@ -0,0 +1,54 @@
+"""
+Alert dispatch with a webhook that never answers in time
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import alerts  # noqa: E402
+
+SLOW_SECONDS = 5
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(SLOW_SECONDS)
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class SlowWebhookTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_timeout_bounds_dispatch(self):
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        events = [{"type": "level", "message": "Alert level SAFE -> ORANGE (score 55.0)"}]
+        start = time.monotonic()
+        errors = alerts.dispatch(events, sinks=[alerts.WebhookSink(url)], timeout=1.0)
+        elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 2.5)
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith("webhook: TimeoutError"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Running ATH: new highs move the ATH and its date, and survive a rebuilt state
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import ath_tracker  # noqa: E402
+import timeseries_store  # noqa: E402
+
+DAY = 86400
+NEW_HIGH_AT = 1790000000  # 2026-09-21
+
+
+class AthTrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmp.name, "ath_state.json")
+        self.store_dir = os.path.join(self.tmp.name, "timeseries")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def tracker(self):
+        return ath_tracker.AthTracker(path=self.state_path, store_dir=self.store_dir)
+
+    def test_starts_from_seed(self):
+        seed_price, _ = ath_tracker.SEED_ATHS["bitcoin"]
+        fields = self.tracker().record("bitcoin", 100000.0, NEW_HIGH_AT - DAY)
+        self.assertEqual(fields["ath_price"], seed_price)
+        self.assertEqual(fields["ath_date"], "2025-10-06")
+
+    def test_new_high_moves_ath_and_date(self):
+        tracker = self.tracker()
+        tracker.record("bitcoin", 100000.0, NEW_HIGH_AT - DAY)
+        fields = tracker.record("bitcoin", 140000.0, NEW_HIGH_AT)
+        self.assertEqual(fields["ath_price"], 140000.0)
+        self.assertEqual(fields["ath_date"], "2026-09-21")
+        self.assertEqual(fields["drawdown_from_ath"], 0.0)
+        self.assertTrue(tracker.save())
+
+        # A lower price later keeps the high and reports the drawdown
+        fields = self.tracker().record("bitcoin", 126000.0, NEW_HIGH_AT + DAY)
+        self.assertEqual(fields["ath_price"], 140000.0)
+        self.assertAlmostEqual(fields["drawdown_from_ath"], 10.0)
+
+    def test_lost_state_backfills_from_recorded_closes(self):
+        tracker = self.tracker()
+        tracker.record("bitcoin", 140000.0, NEW_HIGH_AT)
+        self.assertEqual(timeseries_store.read_series("price-bitcoin", self.store_dir),
+                         ([NEW_HIGH_AT // DAY * DAY], [140000.0]))
+
+        # No save(): the state file never saw the high, the stored close did
+        fields = self.tracker().metrics("bitcoin", 120000.0, NEW_HIGH_AT + DAY)
+        self.assertEqual(fields["ath_price"], 140000.0)
+        self.assertEqual(fields["ath_date"], "2026-09-21")
+
+    def test_seed_never_lowers(self):
+        tracker = self.tracker()
+        tracker.record("ethereum", 5000.0, NEW_HIGH_AT)
+        tracker.seed("ethereum", 4878.26, 1636554259)
+        self.assertEqual(tracker.state["ethereum"]["ath_price"], 5000.0)
+        tracker.seed("ethereum", 6000.0, NEW_HIGH_AT + DAY)
+        self.assertEqual(tracker.metrics("ethereum", 5000.0)["ath_price"], 6000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
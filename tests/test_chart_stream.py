@@ -0,0 +1,90 @@
+"""
+Streaming chart parser: chunk boundaries and truncated payloads
+
+    python -m unittest discover tests
+"""
+
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import chart_stream  # noqa: E402
+
+PAYLOAD = json.dumps({
+    "status": "ok",
+    "name": "Hash Rate",
+    "unit": "Hash Rate TH/s",
+    "values": [
+        {"x": 1789948800, "y": 1.0e9},
+        {"x": 1790035200, "y": None},
+        {"x": 1790121600, "y": 1.05e9},
+        {"x": 1790208000, "y": 9.875e8},
+    ],
+}).encode()
+EXPECTED = ([1789948800, 1790121600, 1790208000], [1.0e9, 1.05e9, 9.875e8])
+
+
+def chunked(data, *cuts):
+    bounds = (0,) + cuts + (len(data),)
+    return [data[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+def parse(chunks):
+    timestamps, values = chart_stream.parse_chart_stream(chunks)
+    return list(timestamps), list(values)
+
+
+class ChartStreamTest(unittest.TestCase):
+    def test_whole_payload(self):
+        self.assertEqual(parse([PAYLOAD]), EXPECTED)
+
+    def test_every_chunk_size(self):
+        for size in range(1, 64):
+            with self.subTest(size=size):
+                self.assertEqual(parse(PAYLOAD[i:i + size] for i in range(0, len(PAYLOAD), size)), EXPECTED)
+
+    def test_values_marker_split_across_chunks(self):
+        marker = PAYLOAD.index(b'"values"')
+        for cut in range(marker, marker + len(b'"values": [') + 1):
+            with self.subTest(cut=cut):
+                self.assertEqual(parse(chunked(PAYLOAD, cut)), EXPECTED)
+
+    def test_marker_split_after_long_prefix(self):
+        # More than MARKER_TAIL bytes before the split marker are dropped unseen
+        padded = b'{"description": "' + b"x" * 500 + PAYLOAD[1:].replace(b'"status"', b'", "status"', 1)
+        marker = padded.index(b'"values"')
+        self.assertEqual(parse(chunked(padded, 100, marker + 3)), EXPECTED)
+
+    def test_truncated_inside_values_raises(self):
+        end = PAYLOAD.index(b"]")
+        for cut in (PAYLOAD.index(b'"values"') + len(b'"values": ['),  # no point yet
+                    PAYLOAD.index(b"1790121600"),                      # mid point
+                    end):                                               # before the ]
+            with self.subTest(cut=cut):
+                with self.assertRaisesRegex(ValueError, "truncated"):
+                    parse(chunked(PAYLOAD[:cut], cut // 2))
+
+    def test_missing_values_array_raises(self):
+        with self.assertRaisesRegex(ValueError, "no values array"):
+            parse([b'{"status": "error", "message": "unknown chart"}'])
+
+    def test_garbage_inside_values_raises(self):
+        with self.assertRaisesRegex(ValueError, "unexpected byte"):
+            parse([b'{"values": [{"x": 1, "y": 2}, 42]}'])
+
+    def test_trailing_bytes_are_drained(self):
+        seen = []
+
+        def source():
+            for chunk in chunked(PAYLOAD, len(PAYLOAD) - 5):
+                seen.append(chunk)
+                yield chunk
+        self.assertEqual(parse(source()), EXPECTED)
+        self.assertEqual(b"".join(seen), PAYLOAD)
+
+
+if __name__ == "__main__":
+    unittest.main()
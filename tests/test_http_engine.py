@@ -0,0 +1,200 @@
+"""
+Fetch engine resilience against the offline stub: Retry-After, the
+circuit breaker, cache revalidation and the stale-value fallback
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from collections import deque
+from datetime import datetime, timedelta
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import fetch_data  # noqa: E402
+import http_cache  # noqa: E402
+import http_engine  # noqa: E402
+import stub_server  # noqa: E402
+
+
+class FaultyHandler(stub_server.StubHandler):
+    """Serves the scripted (status, headers) replies first, then the fixtures"""
+
+    plan = deque()
+    hits = []
+    validators = []
+
+    def do_GET(self):
+        self.hits.append(time.monotonic())
+        self.validators.append(self.headers.get("If-None-Match"))
+        if not self.plan:
+            return super().do_GET()
+        status, headers = self.plan.popleft()
+        self.send_response(status)
+        for name, value in dict(headers, **{"Content-Length": "0"}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+
+class StubTestCase(unittest.TestCase):
+    def setUp(self):
+        FaultyHandler.plan = deque()
+        FaultyHandler.hits = []
+        FaultyHandler.validators = []
+        self.server = stub_server.StubServer(("127.0.0.1", 0), FaultyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v3/global"
+        self.host = f"127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def engine(self, **kwargs):
+        return http_engine.FetchEngine(deadline=30, rate_limits={}, cache=False, **kwargs)
+
+
+class RetryAfterTest(StubTestCase):
+    def test_429_waits_for_retry_after(self):
+        FaultyHandler.plan.append((429, {"Retry-After": "1"}))
+        with self.engine(retries=2) as engine:
+            payload = engine.get_json(self.url)
+        self.assertIn("data", payload)
+        first, second = FaultyHandler.hits
+        # Full-jitter backoff for the first retry is at most 0.5 s; the header wins
+        self.assertGreaterEqual(second - first, 1.0)
+
+    def test_retries_exhausted_returns_final_429(self):
+        FaultyHandler.plan.extend([(429, {"Retry-After": "0"})] * 3)
+        with self.engine(retries=2) as engine:
+            response = engine.get(self.url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(len(FaultyHandler.hits), 3)
+
+    def test_retry_after_http_date(self):
+        class Response:
+            headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        self.assertEqual(http_engine.retry_after(Response), 0.0)  # in the past
+        Response.headers = {"Retry-After": "garbage"}
+        self.assertIsNone(http_engine.retry_after(Response))
+
+
+class CircuitBreakerTest(StubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breaker = http_engine.CircuitBreaker(threshold=3, cooldown=0.3)
+
+    def fail_until_open(self, engine):
+        FaultyHandler.plan.extend([(500, {})] * 3)
+        for _ in range(3):
+            self.assertEqual(engine.get(self.url).status_code, 500)
+        self.assertEqual(self.breaker.state(self.host), "open")
+
+    def test_consecutive_failures_open_the_breaker(self):
+        with self.engine(retries=0, breaker=self.breaker) as engine:
+            self.fail_until_open(engine)
+            with self.assertRaises(http_engine.CircuitOpen):
+                engine.get(self.url)
+        self.assertEqual(len(FaultyHandler.hits), 3)  # the open breaker never called the host
+
+    def test_half_open_trial_success_closes(self):
+        with self.engine(retries=0, breaker=self.breaker) as engine:
+            self.fail_until_open(engine)
+            time.sleep(0.35)
+            self.assertEqual(self.breaker.state(self.host), "half-open")
+            self.assertIn("data", engine.get_json(self.url))
+            self.assertEqual(self.breaker.state(self.host), "closed")
+
+    def test_half_open_trial_failure_reopens(self):
+        with self.engine(retries=0, breaker=self.breaker) as engine:
+            self.fail_until_open(engine)
+            time.sleep(0.35)
+            FaultyHandler.plan.append((503, {}))
+            self.assertEqual(engine.get(self.url).status_code, 503)
+            self.assertEqual(self.breaker.state(self.host), "open")
+            with self.assertRaises(http_engine.CircuitOpen):
+                engine.get(self.url)
+
+    def test_success_resets_the_failure_count(self):
+        with self.engine(retries=0, breaker=self.breaker) as engine:
+            FaultyHandler.plan.extend([(500, {}), (500, {}), (200, {}), (500, {}), (500, {})])
+            for _ in range(5):
+                engine.get(self.url)
+        self.assertEqual(self.breaker.state(self.host), "closed")
+
+
+class RevalidationTest(StubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = http_cache.ResponseCache(self.tmp.name, ttls=[])
+        # A stale entry whose body was evicted after the index was read
+        key = self.cache.key_for(self.url)
+        self.cache.index[key] = {"etag": '"v1"', "stored_at": 0, "last_access": 0, "size": 10}
+        FaultyHandler.plan.append((304, {"ETag": '"v1"'}))
+
+    def tearDown(self):
+        super().tearDown()
+        self.tmp.cleanup()
+
+    def assertRefetched(self):
+        # The retry goes out without the validator the 304 answered
+        self.assertEqual(FaultyHandler.validators, ['"v1"', None])
+        self.assertTrue(os.path.exists(self.cache._body_path(self.cache.key_for(self.url))))
+
+    def test_get_refetches_when_the_body_is_gone(self):
+        with http_engine.FetchEngine(deadline=30, rate_limits={}, cache=self.cache) as engine:
+            self.assertIn("data", engine.get_json(self.url))
+        self.assertRefetched()
+
+    def test_stream_refetches_when_the_body_is_gone(self):
+        with http_engine.FetchEngine(deadline=30, rate_limits={}, cache=self.cache) as engine:
+            body = b"".join(engine.stream(self.url))
+        self.assertIn(b'"data"', body)
+        self.assertRefetched()
+
+
+class StaleFallbackTest(unittest.TestCase):
+    NOW = datetime(2026, 10, 18, 12, 0)
+
+    def previous(self, age):
+        when = (self.NOW - age).isoformat()
+        return {
+            "timestamp": when,
+            "btc_dominance": 57.9,
+            "trade_volume": {"current": 3.4e8, "ratio": 1.1},
+            "fetched_at": {"btc_dominance": when, "trade_volume": when},
+        }
+
+    def test_recent_values_are_carried_over(self):
+        combined = {"timestamp": self.NOW.isoformat(), "btc_price": 101930.0}
+        stale = fetch_data.fill_from_previous(combined, self.previous(timedelta(days=1)), now=self.NOW)
+        self.assertEqual(sorted(stale), ["btc_dominance", "trade_volume"])
+        self.assertEqual(combined["btc_dominance"], 57.9)
+        self.assertEqual(combined["fetched_at"]["btc_price"], self.NOW.isoformat())
+        self.assertEqual(combined["fetched_at"]["btc_dominance"], (self.NOW - timedelta(days=1)).isoformat())
+
+    def test_values_older_than_max_age_are_rejected(self):
+        age = timedelta(seconds=fetch_data.STALE_MAX_AGE + 60)
+        combined = {"timestamp": self.NOW.isoformat(), "btc_price": 101930.0}
+        stale = fetch_data.fill_from_previous(combined, self.previous(age), now=self.NOW)
+        self.assertEqual(stale, [])
+        self.assertNotIn("btc_dominance", combined)
+        self.assertNotIn("trade_volume", combined)
+
+    def test_fresh_values_are_not_replaced(self):
+        combined = {"timestamp": self.NOW.isoformat(), "btc_dominance": 58.4}
+        stale = fetch_data.fill_from_previous(combined, self.previous(timedelta(hours=6)), now=self.NOW)
+        self.assertEqual(stale, ["trade_volume"])
+        self.assertEqual(combined["btc_dominance"], 58.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Binary score history: append/range round trips, header growth, ordering
+and the legacy CSV import
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import score_history  # noqa: E402
+
+T0 = 1790000000.0
+HOUR = 3600
+
+
+def result(offset, score, level="SAFE", signals=None, smart=None):
+    return {
+        "timestamp": T0 + offset,
+        "composite_score": score,
+        "smart_money_score": smart,
+        "alert_level": level,
+        "signals": signals if signals is not None else [
+            {"key": "ath", "name": "BTC Price vs ATH", "triggered": True},
+            {"key": "spx", "name": "SPX Rollover", "triggered": False},
+            {"key": "nvt", "name": "NVT Signal High", "triggered": None},
+        ],
+    }
+
+
+class ScoreHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "score_history.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def append(self, record):
+        return score_history.append(record, path=self.path, legacy_csv=None)
+
+    def test_append_and_range_round_trip(self):
+        for i, (score, level) in enumerate(((10.0, "SAFE"), (35.0, "YELLOW"), (72.5, "RED ALERT"))):
+            self.assertTrue(self.append(result(i * HOUR, score, level, smart=score / 2)))
+        self.assertEqual(os.path.getsize(self.path),
+                         score_history.HEADER_SIZE + 3 * score_history.RECORD.size)
+
+        records = score_history.range_query(path=self.path)
+        self.assertEqual([r["composite_score"] for r in records], [10.0, 35.0, 72.5])
+        self.assertEqual([r["alert_level"] for r in records], ["SAFE", "YELLOW", "RED ALERT"])
+        self.assertEqual(records[0]["smart_money_score"], 5.0)
+        self.assertEqual(records[0]["triggered"], ["ath"])
+        self.assertEqual(records[0]["available"], ["ath", "spx"])
+
+        # Inclusive bounds, unix seconds or ISO strings, open ends
+        middle = score_history.range_query(T0 + HOUR, T0 + HOUR, path=self.path)
+        self.assertEqual([r["timestamp"] for r in middle], [T0 + HOUR])
+        tail = score_history.range_query(T0 + 1, None, path=self.path)
+        self.assertEqual(len(tail), 2)
+        iso = datetime.fromtimestamp(T0 + HOUR, tz=timezone.utc).isoformat()
+        self.assertEqual(len(score_history.range_query(None, iso, path=self.path)), 2)
+        self.assertEqual(score_history.range_query(T0 + 10 * HOUR, path=self.path), [])
+
+    def test_none_smart_money_score(self):
+        self.append(result(0, 10.0))
+        self.assertIsNone(score_history.range_query(path=self.path)[0]["smart_money_score"])
+
+    def test_new_signal_key_extends_header(self):
+        self.append(result(0, 10.0))
+        extra = result(HOUR, 20.0)["signals"] + [{"key": "mempool", "name": "Mempool", "triggered": True}]
+        self.append(result(HOUR, 20.0, signals=extra))
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(score_history._read_header(f)["signals"], ["ath", "spx", "nvt", "mempool"])
+        first, second = score_history.range_query(path=self.path)
+        # Old records keep their bits; the new key only shows up where it was set
+        self.assertEqual(first["triggered"], ["ath"])
+        self.assertEqual(second["triggered"], ["ath", "mempool"])
+        self.assertEqual(os.path.getsize(self.path),
+                         score_history.HEADER_SIZE + 2 * score_history.RECORD.size)
+
+    def test_out_of_order_append_is_rejected(self):
+        self.assertTrue(self.append(result(HOUR, 10.0)))
+        self.assertFalse(self.append(result(0, 50.0)))
+        self.assertTrue(self.append(result(HOUR, 20.0)))  # same timestamp is in order
+        self.assertEqual([r["composite_score"] for r in score_history.range_query(path=self.path)],
+                         [10.0, 20.0])
+
+    def test_legacy_csv_import(self):
+        csv_path = os.path.join(self.tmp.name, "historical_scores.csv")
+        with open(csv_path, "w") as f:
+            f.write("2025-11-04T12:00:00,55.0,🟠 ORANGE\n"
+                    "2025-11-03T09:58:17.942207,10.0,🟢 SAFE\n"
+                    "malformed row\n"
+                    "2025-11-05T00:00:00,71.0,🔴 RED ALERT\n")
+
+        # The first append imports the CSV before its own record
+        self.assertTrue(score_history.append(result(0, 30.0, "YELLOW"), path=self.path, legacy_csv=csv_path))
+        records = score_history.range_query(path=self.path)
+        self.assertEqual([r["composite_score"] for r in records], [10.0, 55.0, 71.0, 30.0])
+        self.assertEqual([r["alert_level"] for r in records], ["SAFE", "ORANGE", "RED ALERT", "YELLOW"])
+        self.assertEqual(records[0]["triggered"], [])
+        self.assertEqual(records[0]["timestamp"], score_history._timestamp("2025-11-03T09:58:17.942207"))
+
+        # Later appends do not import it again
+        self.assertTrue(score_history.append(result(HOUR, 31.0), path=self.path, legacy_csv=csv_path))
+        self.assertEqual(len(score_history.range_query(path=self.path)), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Snapshot store: exact round trips, deduplication and numeric columns
+
+    python -m unittest discover tests
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import snapshot_store  # noqa: E402
+
+SNAPSHOT = {
+    "timestamp": "2026-10-18T09:30:00.123456",
+    "btc_price": 101930.5,
+    "block_height": 2 ** 53 + 1,          # not representable as a float64
+    "total_supply_sats": 2 ** 70,         # beyond int64
+    "transaction_count": {"current": 412345, "ratio": 1.07, "flag": False},
+    "stale": [],
+    "spx": {},
+    "ath_date": "2025-10-06",
+    "puell_multiple": None,
+    "signals": [{"key": "ath", "triggered": True, "weight": 0.2}],
+}
+
+
+class SnapshotStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = snapshot_store.SnapshotStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertSame(self, restored, original):
+        # == treats 1 and 1.0 (and True and 1) as equal, so compare types too
+        self.assertEqual(restored, original)
+        for (path, a), (_, b) in zip(snapshot_store._leaves(restored), snapshot_store._leaves(original)):
+            self.assertIs(type(a), type(b), path)
+
+    def test_round_trip_is_exact(self):
+        self.assertTrue(self.store.put("latest_data", SNAPSHOT))
+        restored = self.store.load(-1)
+        self.assertSame(restored, SNAPSHOT)
+        self.assertEqual(restored["block_height"], 2 ** 53 + 1)
+
+    def test_reopened_store_reads_the_same(self):
+        self.store.put("latest_data", SNAPSHOT)
+        reopened = snapshot_store.SnapshotStore(self.tmp.name)
+        self.assertSame(reopened.load(reopened.latest("latest_data")), SNAPSHOT)
+
+    def test_unchanged_snapshot_is_deduplicated(self):
+        self.assertTrue(self.store.put("latest_data", SNAPSHOT))
+        stats = self.store.stats()
+        self.assertFalse(self.store.put("latest_data", dict(SNAPSHOT)))
+        self.assertEqual(self.store.stats(), stats)
+
+        # A new value adds a record and a values object, but shares the
+        # schema and strings objects
+        changed = dict(SNAPSHOT, btc_price=102000.0)
+        self.assertTrue(self.store.put("latest_data", changed))
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.object_count(), stats["objects"] + 1)
+        self.assertSame(self.store.load(-1), changed)
+
+    def test_kinds_are_separate(self):
+        self.store.put("latest_data", SNAPSHOT)
+        self.store.put("signals", {"timestamp": SNAPSHOT["timestamp"], "composite_score": 42.0})
+        self.assertEqual(self.store.indices("signals"), [1])
+        self.assertEqual(self.store.load(self.store.latest("latest_data")), SNAPSHOT)
+
+    def test_column_reads_int_and_float_leaves(self):
+        for price, count in ((100.0, 1), (101.5, 2), (99.25, 3)):
+            self.store.put("latest_data", dict(SNAPSHOT, btc_price=price,
+                                               transaction_count={"current": count}))
+        _, prices = self.store.column("latest_data", "btc_price")
+        _, counts = self.store.column("latest_data", "transaction_count", "current")
+        self.assertEqual(prices.tolist(), [100.0, 101.5, 99.25])
+        self.assertEqual(counts.tolist(), [1.0, 2.0, 3.0])
+
+    def test_legacy_float_encoded_ints_still_load(self):
+        # Runs before int64 slots wrote ints as float64 under kind "i"
+        schema = [[["n"], "i"], [["x"], "f"]]
+        values = struct.pack("<dd", 7.0, 1.5)
+        self.assertEqual(snapshot_store.value_format(schema), "<dd")
+        restored = snapshot_store.join(float("nan"), schema, struct.unpack("<dd", values), [])
+        self.assertEqual(restored, {"n": 7, "x": 1.5})
+        self.assertIs(type(restored["n"]), int)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Time-series store: the append/read primitives the incremental fetch uses
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import timeseries_store  # noqa: E402
+
+DAY = 86400
+T0 = 1790000000 // DAY * DAY
+
+
+class TimeseriesStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_empty_store(self):
+        self.assertIsNone(timeseries_store.last_timestamp("trade-volume", self.dir))
+        self.assertEqual(timeseries_store.read_series("trade-volume", self.dir), ([], []))
+        self.assertEqual(timeseries_store.read_series("trade-volume", self.dir, tail=5), ([], []))
+        self.assertEqual(timeseries_store.incremental_timespan("trade-volume", self.dir), "90days")
+        self.assertEqual(timeseries_store.incremental_timespan("trade-volume", self.dir, bootstrap="2years"),
+                         "2years")
+
+    def test_empty_file_has_no_last_timestamp(self):
+        open(timeseries_store.series_path("trade-volume", self.dir), "wb").close()
+        self.assertIsNone(timeseries_store.last_timestamp("trade-volume", self.dir))
+
+    def test_same_timestamp_replaces_last_point(self):
+        written = timeseries_store.append_points("hash-rate", [(T0, 1.0), (T0 + DAY, 2.0)], self.dir)
+        self.assertEqual(written, 2)
+        # The API revises the current day: same timestamp overwrites, no new record
+        written = timeseries_store.append_points("hash-rate", [(T0 + DAY, 2.5)], self.dir)
+        self.assertEqual(written, 0)
+        self.assertEqual(timeseries_store.read_series("hash-rate", self.dir), ([T0, T0 + DAY], [1.0, 2.5]))
+        self.assertEqual(os.path.getsize(timeseries_store.series_path("hash-rate", self.dir)),
+                         2 * timeseries_store.RECORD.size)
+
+    def test_overlap_skips_older_points(self):
+        timeseries_store.append_points("hash-rate", [(T0, 1.0), (T0 + DAY, 2.0)], self.dir)
+        # An incremental fetch returns the last stored day again plus new days
+        written = timeseries_store.append_points(
+            "hash-rate", [(T0 + 2 * DAY, 3.0), (T0, 9.0), (T0 + DAY, 2.1)], self.dir)
+        self.assertEqual(written, 1)
+        self.assertEqual(timeseries_store.read_series("hash-rate", self.dir),
+                         ([T0, T0 + DAY, T0 + 2 * DAY], [1.0, 2.1, 3.0]))
+        self.assertEqual(timeseries_store.last_timestamp("hash-rate", self.dir), T0 + 2 * DAY)
+
+    def test_read_tail(self):
+        points = [(T0 + i * DAY, float(i)) for i in range(10)]
+        timeseries_store.append_points("market-cap", points, self.dir)
+        self.assertEqual(timeseries_store.read_series("market-cap", self.dir, tail=3),
+                         ([T0 + 7 * DAY, T0 + 8 * DAY, T0 + 9 * DAY], [7.0, 8.0, 9.0]))
+        # A tail longer than the series returns all of it
+        timestamps, values = timeseries_store.read_series("market-cap", self.dir, tail=50)
+        self.assertEqual(values, [float(i) for i in range(10)])
+
+    def test_incremental_timespan_covers_the_gap(self):
+        timeseries_store.append_points("market-cap", [(T0, 1.0)], self.dir)
+        self.assertEqual(timeseries_store.incremental_timespan("market-cap", self.dir, now=T0 + 3 * DAY + 60),
+                         "5days")
+
+
+if __name__ == "__main__":
+    unittest.main()